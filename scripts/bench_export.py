@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark exported policy inference throughput against the eager network.
+
+Compares, per batch size, the eager IMPALA network plus Python action
+decoding, the traced TorchScript artifact and (if onnxruntime is installed)
+the ONNX artifact.
+
+Usage:
+    python scripts/bench_export.py --checkpoint experiments/run/final --role sink_designer
+    python scripts/bench_export.py --obs-dim 250 --role tumor   # random weights
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.export import (
+    DeterministicPolicy,
+    export_policy,
+    load_exported_policy,
+    load_policy_network,
+)
+from redox_balancer.agents.networks import ActorCriticNetwork, SinkDesignerNetwork
+
+
+def time_steps(step_fn, batch_size: int, obs_dim: int, iterations: int) -> float:
+    """Observations per second for repeated single-step calls."""
+    obs = np.random.default_rng(0).normal(size=(batch_size, obs_dim)).astype(np.float32)
+    for _ in range(20):  # Warm-up
+        step_fn(obs)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        step_fn(obs)
+    return batch_size * iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exported policy inference")
+    parser.add_argument("--checkpoint", type=str, help="Checkpoint directory (random weights if omitted)")
+    parser.add_argument("--role", choices=["tumor", "sink_designer"], default="sink_designer")
+    parser.add_argument("--obs-dim", type=int, default=250, help="Observation size for random weights")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--iterations", type=int, default=500, help="Calls per measurement")
+    parser.add_argument("--threads", type=int, default=1, help="Torch intra-op threads")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+
+    if args.checkpoint:
+        network = load_policy_network(Path(args.checkpoint), args.role)
+    elif args.role == "sink_designer":
+        network = SinkDesignerNetwork(obs_dim=args.obs_dim, n_enzymes=8).eval()
+    else:
+        network = ActorCriticNetwork(obs_dim=args.obs_dim).eval()
+
+    eager = DeterministicPolicy(network).eval()
+
+    def eager_step(obs):
+        with torch.no_grad():
+            h, c = network.initial_state(obs.shape[0])
+            return eager(torch.from_numpy(obs), h, c)
+
+    variants = {"eager": eager_step}
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = ["torchscript"]
+        try:
+            import onnxruntime  # noqa: F401
+            formats.append("onnx")
+        except ImportError:
+            print("onnxruntime not installed; skipping ONNX")
+
+        for export_format in formats:
+            path = export_policy(network, args.role, Path(tmp) / "policy", export_format)
+            policy = load_exported_policy(path)
+            variants[export_format] = lambda obs, policy=policy: policy.step(obs)
+
+        print(f"{args.role} policy, obs_dim={network.obs_dim}, threads={args.threads}")
+        header = f"{'batch':>6}" + "".join(f"{name + ' (obs/s)':>20}" for name in variants)
+        print(header)
+        for batch_size in args.batch_sizes:
+            rates = [
+                time_steps(step_fn, batch_size, network.obs_dim, args.iterations)
+                for step_fn in variants.values()
+            ]
+            print(f"{batch_size:>6}" + "".join(f"{rate:>20.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
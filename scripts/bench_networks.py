@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark actor act latency and learner update time for the agent networks.
+
+Compares the sink designer network against a copy of its pre-refactor
+forward pass, which ran the embedding + LSTM trunk a second time for the
+structured heads.
+
+Usage:
+    python scripts/bench_networks.py --steps 2000 --updates 50 --threads 1
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.impala_agent import IMPALAAgent, Trajectory
+from redox_balancer.agents.networks import ActorCriticNetwork, SinkDesignerNetwork
+
+
+class LegacySinkDesignerNetwork(SinkDesignerNetwork):
+    """Sink designer forward as it was before the trunk was shared."""
+
+    def forward(self, obs, hidden_state=None, sequence_length=None):
+        features, new_hidden = self.encode(obs, hidden_state, sequence_length)
+        base_out = ActorCriticNetwork._heads(self, features, new_hidden)
+
+        # Redundant second trunk pass for the structured heads
+        features, _ = self.encode(obs, hidden_state, sequence_length)
+        batch_size = features.shape[0]
+        return {
+            **base_out,
+            'enzyme_logits': self.enzyme_selector(features).view(
+                batch_size, self.max_enzymes, self.n_enzymes
+            ),
+            'copy_numbers': torch.sigmoid(self.copy_number_head(features)) * 8,
+            'compartment_logits': self.compartment_head(features).view(
+                batch_size, self.max_enzymes, self.n_compartments
+            ),
+        }
+
+
+def make_agent(network_cls, obs_dim: int) -> IMPALAAgent:
+    """Sink designer agent on CPU with the given network class."""
+    agent = IMPALAAgent(agent_role="sink_designer", obs_dim=obs_dim, device="cpu")
+    agent.network = network_cls(obs_dim=obs_dim)
+    agent.optimizer = torch.optim.Adam(agent.network.parameters(), lr=3e-4)
+    return agent
+
+
+def bench_act(agent: IMPALAAgent, obs_dim: int, steps: int) -> float:
+    """Mean per-step act latency in milliseconds."""
+    rng = np.random.default_rng(0)
+    observations = rng.normal(size=(steps, obs_dim)).astype(np.float32)
+
+    agent.reset_hidden_state()
+    for obs in observations[:50]:  # Warm-up
+        agent.act(obs)
+
+    start = time.perf_counter()
+    for obs in observations:
+        agent.act(obs)
+    return (time.perf_counter() - start) / steps * 1e3
+
+
+def make_trajectory(agent: IMPALAAgent, obs_dim: int, batch_size: int, length: int) -> Trajectory:
+    """Synthetic trajectory shaped like an actor segment."""
+    action_dim = agent.network.action_dim
+    return Trajectory(
+        observations=torch.randn(batch_size, length, obs_dim),
+        actions=torch.rand(batch_size, length, action_dim) * 3,
+        rewards=torch.randn(batch_size, length),
+        values=torch.randn(batch_size, length),
+        action_log_probs=torch.randn(batch_size, length),
+        hidden_states=None,
+        dones=torch.zeros(batch_size, length),
+        bootstrap_value=torch.zeros(batch_size),
+    )
+
+
+def bench_update(agent: IMPALAAgent, trajectory: Trajectory, updates: int) -> float:
+    """Mean learner update time in milliseconds."""
+    agent.update(trajectory, trajectory.action_log_probs)  # Warm-up
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        agent.update(trajectory, trajectory.action_log_probs)
+    return (time.perf_counter() - start) / updates * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent network forward cost")
+    parser.add_argument("--obs-dim", type=int, default=250, help="Observation size")
+    parser.add_argument("--steps", type=int, default=2000, help="Act calls to time")
+    parser.add_argument("--updates", type=int, default=50, help="Learner updates to time")
+    parser.add_argument("--batch-size", type=int, default=1, help="Trajectories per update")
+    parser.add_argument("--length", type=int, default=80, help="Trajectory length")
+    parser.add_argument("--threads", type=int, default=1, help="Torch intra-op threads")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+
+    print(f"Sink designer network, obs_dim={args.obs_dim}, threads={args.threads}")
+    print(f"{'variant':<14}{'act (ms/step)':>16}{'update (ms)':>16}")
+
+    results = {}
+    for name, network_cls in [("two-pass", LegacySinkDesignerNetwork),
+                              ("single-pass", SinkDesignerNetwork)]:
+        agent = make_agent(network_cls, args.obs_dim)
+        trajectory = make_trajectory(agent, args.obs_dim, args.batch_size, args.length)
+        act_ms = bench_act(agent, args.obs_dim, args.steps)
+        update_ms = bench_update(agent, trajectory, args.updates)
+        results[name] = (act_ms, update_ms)
+        print(f"{name:<14}{act_ms:>16.3f}{update_ms:>16.2f}")
+
+    before, after = results["two-pass"], results["single-pass"]
+    print(f"\nSpeedup: act {before[0] / after[0]:.2f}x, update {before[1] / after[1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark fp32 vs int8 dynamic-quantized actor policies on CPU.
+
+Each variant is measured in a fresh process holding both roles' actor
+networks, so the reported RSS growth is not polluted by the other variant.
+Memory is taken after a learner weight reload, the state actors spend the
+run in, with the learner's fp32 state dict already released.
+
+Usage:
+    python scripts/bench_quantized_actor.py --obs-dim 250 --steps 2000 --threads 1
+"""
+
+import argparse
+import gc
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.impala_agent import IMPALAAgent
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1e6
+
+
+def measure(quantize: bool, args, queue):
+    """Build actor-side agents, time act() and report RSS growth."""
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+    baseline = rss_mb()
+
+    def build(role: str, quantize: bool) -> IMPALAAgent:
+        network_kwargs = {'n_enzymes': args.n_enzymes} if role == "sink_designer" else {}
+        return IMPALAAgent(
+            agent_role=role,
+            obs_dim=args.obs_dim,
+            action_dim=args.action_dim,
+            device="cpu",
+            quantize=quantize,
+            inference_only=True,  # As ActorWorker builds them
+            **network_kwargs,
+        )
+
+    agents = {role: build(role, quantize) for role in ("tumor", "sink_designer")}
+    for role, agent in agents.items():
+        # Same seed in both variants, so their values are comparable
+        torch.manual_seed(1)
+        state_dict = build(role, quantize=False).network.state_dict()
+        agent.load_weights(state_dict)
+        del state_dict
+    gc.collect()
+    rss_after_load = rss_mb()
+
+    rng = np.random.default_rng(0)
+    observations = rng.normal(size=(args.steps, args.obs_dim)).astype(np.float32)
+
+    latency = {}
+    values = {}
+    for role, agent in agents.items():
+        agent.reset_hidden_state()
+        for obs in observations[:50]:  # Warm-up
+            agent.act(obs)
+
+        agent.reset_hidden_state()
+        start = time.perf_counter()
+        role_values = []
+        for obs in observations:
+            _, info = agent.act(obs)
+            role_values.append(info['value'])
+        latency[role] = (time.perf_counter() - start) / args.steps * 1e3
+        values[role] = np.array(role_values)
+
+    queue.put({
+        'network_mb': rss_after_load - baseline,
+        'rss_mb': rss_mb(),
+        'latency_ms': latency,
+        'values': values,
+    })
+
+
+def run(quantize: bool, args) -> dict:
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=measure, args=(quantize, args, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized actor policies")
+    parser.add_argument("--obs-dim", type=int, default=250, help="Observation size")
+    parser.add_argument("--action-dim", type=int, default=10, help="Tumor action size")
+    parser.add_argument("--n-enzymes", type=int, default=8, help="Enzyme library size")
+    parser.add_argument("--steps", type=int, default=2000, help="Act calls to time per agent")
+    parser.add_argument("--threads", type=int, default=1, help="Torch intra-op threads")
+    args = parser.parse_args()
+
+    results = {"fp32": run(False, args), "int8": run(True, args)}
+
+    print(f"Actor policies (tumor + sink designer), obs_dim={args.obs_dim}, threads={args.threads}")
+    print(f"{'variant':<8}{'networks (MB)':>15}{'RSS (MB)':>11}{'tumor act (ms)':>16}{'sink act (ms)':>15}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['network_mb']:>15.1f}{r['rss_mb']:>11.1f}"
+              f"{r['latency_ms']['tumor']:>16.3f}{r['latency_ms']['sink_designer']:>15.3f}")
+
+    fp32, int8 = results["fp32"], results["int8"]
+    print(f"\nRSS reduction: {fp32['rss_mb'] - int8['rss_mb']:.1f} MB")
+    for role in ("tumor", "sink_designer"):
+        speedup = fp32['latency_ms'][role] / int8['latency_ms'][role]
+        value_err = np.abs(fp32['values'][role] - int8['values'][role]).max()
+        print(f"{role}: act speedup {speedup:.2f}x, max |value fp32 - int8| {value_err:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Load-test the local policy server.
+
+Starts a PolicyService in-process (on TCP or a Unix socket), then drives it
+with concurrent client threads that each send single-observation requests
+back to back. Reports client-side throughput and latency percentiles next to
+the server's own batching metrics, so batching windows can be compared.
+
+Usage:
+    python scripts/bench_serving.py --policy experiments/run/final/export/sink_designer_policy.pt \\
+        --model data/models/redox_core_v2.json --clients 32 --max-wait-ms 2
+    python scripts/bench_serving.py --role tumor --obs-dim 250 --unix-socket /tmp/redox.sock   # random weights
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.export import export_policy
+from redox_balancer.agents.networks import ActorCriticNetwork, SinkDesignerNetwork
+from redox_balancer.serving import PolicyClient, PolicyService, create_server
+
+
+def run_clients(args, obs_dim: int, medium):
+    """Fire requests from ``args.clients`` threads; return per-request latencies."""
+    latencies = [[] for _ in range(args.clients)]
+    errors = [0] * args.clients
+
+    def worker(index: int):
+        client = PolicyClient(f"http://{args.host}:{args.port}", unix_socket=args.unix_socket)
+        rng = np.random.default_rng(index)
+        for _ in range(args.requests):
+            request = {'observation': rng.normal(size=obs_dim).tolist()}
+            if medium:
+                request['medium'] = medium
+            start = time.perf_counter()
+            try:
+                client.predict([request])
+            except Exception:
+                errors[index] += 1
+                continue
+            latencies[index].append(time.perf_counter() - start)
+        client.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return np.concatenate([np.asarray(l) for l in latencies]), sum(errors), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the policy server")
+    parser.add_argument("--policy", type=str, help="Exported policy (random weights if omitted)")
+    parser.add_argument("--role", choices=["tumor", "sink_designer"], default="sink_designer")
+    parser.add_argument("--obs-dim", type=int, default=250, help="Observation size for random weights")
+    parser.add_argument("--model", type=str, help="Metabolic model for FBA predictions")
+    parser.add_argument("--enzymes", type=str, default="data/enzyme_library_redox.json")
+    parser.add_argument("--medium", type=str, help="JSON exchange bounds sent with every request")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", type=str, help="Serve on a Unix socket instead of TCP")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    tmp_dir = tempfile.TemporaryDirectory()
+    policy_path = args.policy
+    if policy_path is None:
+        if args.role == "sink_designer":
+            from redox_balancer.data.enzyme_library import EnzymeLibrary
+            library = EnzymeLibrary(args.enzymes)
+            network = SinkDesignerNetwork(
+                obs_dim=args.obs_dim,
+                n_enzymes=len(library),
+                action_mask=torch.from_numpy(library.action_mask()),
+            )
+        else:
+            network = ActorCriticNetwork(obs_dim=args.obs_dim, action_dim=64)
+        policy_path = export_policy(network, args.role, Path(tmp_dir.name) / "policy")
+
+    medium = None
+    if args.medium:
+        with open(args.medium) as f:
+            medium = json.load(f)
+
+    service = PolicyService(
+        policy_path,
+        model_path=args.model,
+        enzyme_library_path=args.enzymes,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    server = create_server(service, args.host, args.port, args.unix_socket)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    print(f"Policy: {service.policy.role}  obs_dim={service.policy.obs_dim}  FBA={service.evaluator is not None}")
+    print(f"Clients: {args.clients} x {args.requests} requests  "
+          f"batching: max {args.max_batch_size} items / {args.max_wait_ms} ms")
+
+    try:
+        latencies, errors, elapsed = run_clients(args, service.policy.obs_dim, medium)
+        metrics = service.metrics.snapshot()
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+        tmp_dir.cleanup()
+
+    ms = latencies * 1000
+    print(f"\n{'throughput':>14}: {len(latencies) / elapsed:,.0f} req/s ({errors} errors)")
+    if len(ms):
+        print(f"{'latency p50':>14}: {np.percentile(ms, 50):.2f} ms")
+        print(f"{'latency p95':>14}: {np.percentile(ms, 95):.2f} ms")
+        print(f"{'latency p99':>14}: {np.percentile(ms, 99):.2f} ms")
+    print("\nServer metrics:")
+    for key, value in metrics.items():
+        print(f"  {key:>20}: {value:.3f}" if isinstance(value, float) else f"  {key:>20}: {value}")
+    if service.evaluator is not None:
+        print(f"  {'fba_solves':>20}: {service.evaluator.solves}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark V-trace target computation: reverse Python loop vs vectorized scan.
+
+Usage:
+    python scripts/bench_vtrace.py --length 80 --batch-sizes 1 8 32 64
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.impala_agent import vtrace_scan
+
+
+def loop_scan(deltas, discounts, cs):
+    """Per-timestep reverse loop the learner used before vtrace_scan."""
+    vs_minus_v = torch.zeros_like(deltas)
+    acc = torch.zeros_like(deltas[:, 0])
+    for t in reversed(range(deltas.shape[1])):
+        acc = deltas[:, t] + discounts[:, t] * cs[:, t] * acc
+        vs_minus_v[:, t] = acc
+    return vs_minus_v
+
+
+def time_fn(fn, args, repeats: int, device: str) -> float:
+    """Mean call time in microseconds."""
+    for _ in range(10):  # Warm-up
+        fn(*args)
+    if device == "cuda":
+        torch.cuda.synchronize()
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(*args)
+    if device == "cuda":
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark V-trace target computation")
+    parser.add_argument("--length", type=int, default=80, help="Trajectory length T")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64],
+                        help="Batch sizes B to time")
+    parser.add_argument("--repeats", type=int, default=500, help="Calls per measurement")
+    parser.add_argument("--device", default="cpu", help="Torch device")
+    parser.add_argument("--threads", type=int, default=1, help="Torch intra-op threads")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    torch.set_num_threads(args.threads)
+
+    print(f"V-trace scan, T={args.length}, device={args.device}, threads={args.threads}")
+    print(f"{'batch':>6}{'loop (us)':>14}{'vectorized (us)':>18}{'speedup':>10}{'max err':>12}")
+
+    for batch_size in args.batch_sizes:
+        shape = (batch_size, args.length)
+        deltas = torch.randn(shape, device=args.device)
+        discounts = 0.99 * (torch.rand(shape, device=args.device) > 0.02).float()
+        cs = torch.rand(shape, device=args.device)
+        inputs = (deltas, discounts, cs)
+
+        error = (loop_scan(*inputs) - vtrace_scan(*inputs)).abs().max().item()
+        loop_us = time_fn(loop_scan, inputs, args.repeats, args.device)
+        scan_us = time_fn(vtrace_scan, inputs, args.repeats, args.device)
+        print(f"{batch_size:>6}{loop_us:>14.1f}{scan_us:>18.1f}{loop_us / scan_us:>9.2f}x{error:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
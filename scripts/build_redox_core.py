@@ -10,12 +10,14 @@ import logging
 from pathlib import Path
 import cobra
 from cobra.io import save_json_model
-from cobra.flux_analysis import single_reaction_deletion, fastcc
+from cobra.flux_analysis import fastcc
 import sys
 import os
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from redox_balancer.analysis.essentiality import essential_reactions, scan_essentiality
+from redox_balancer.analysis.producibility import missing_precursors
 from redox_balancer.utils.medium import HUMAN_MINIMAL_MEDIUM, set_medium
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -65,16 +67,9 @@ def extract_redox_core(model, target_reactions=400):
     if "BIOMASS_reaction" in temp_model.reactions:
         temp_model.objective = "BIOMASS_reaction"
     
-    ess = single_reaction_deletion(temp_model, processes=4)
-    # Get reactions where deletion causes no growth
-    essential_df = ess[ess["growth"] < 1e-6]
-    essential_rxns = set()
-    for idx, row in essential_df.iterrows():
-        # The 'ids' column contains sets of deleted reactions
-        if isinstance(row["ids"], set):
-            essential_rxns.update(row["ids"])
-        else:
-            essential_rxns.add(row["ids"])
+    # Reactions whose deletion causes no growth (cached per model, so rebuilds are fast)
+    ess = scan_essentiality(temp_model, processes=4)
+    essential_rxns = essential_reactions(ess)
     logger.info(f"Found {len(essential_rxns)} essential reactions")
     
     # Key pathways to include
@@ -219,6 +214,10 @@ def extract_redox_core(model, target_reactions=400):
         logger.info(f"Core model grows with rate: {solution.objective_value:.4f}")
     else:
         logger.warning("Core model cannot grow! May need gap-filling.")
+        
+    # Gap check: biomass precursors the medium cannot supply
+    if not missing_precursors(core_model):
+        logger.info("All biomass precursors can be produced from the medium")
     
     return core_model
 
@@ -10,7 +10,12 @@ import logging
 from pathlib import Path
 import cobra
 from cobra.io import save_json_model
+import sys
+import os
 
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from redox_balancer.analysis.producibility import missing_precursors
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -209,6 +214,10 @@ def extract_redox_core(model, target_reactions=400):
             logger.warning("Core model has very low growth! May need gap-filling.")
     else:
         logger.error("Core model cannot be optimized! Needs debugging.")
+        
+    # Gap check: biomass precursors the medium cannot supply
+    if not missing_precursors(core_model):
+        logger.info("All biomass precursors can be produced from the medium")
     
     return core_model
 
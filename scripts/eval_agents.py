@@ -2,16 +2,44 @@
 """
 Evaluation script for trained redox balancer agents.
 Loads checkpoint and runs deterministic evaluation episodes.
+
+Episodes are sharded across a process pool; each worker builds the
+environment and loads the exported policies once. Every episode is seeded
+from its index, so results do not depend on the number of workers.
+
+With --checkpoints, a glob of checkpoints is swept with one model load and
+one worker pool. The sink designer's final constructs are scored with
+exact FBA through a single outcome cache shared by all checkpoints and
+persisted across runs. Per-checkpoint summaries are appended to one table
+as each checkpoint finishes.
+
+Because the policies are greedy, repeated episodes revisit the same
+transitions. Unless --no-dedup is given, the environment is wrapped in a
+DedupEnv, which serves repeated (history, action) steps from a record
+instead of re-solving them.
+
+Episode rows, and per-step traces with --save-steps, stream into a chunked
+results directory (default: <checkpoint>/evaluation) as episodes finish.
+Re-running with the same checkpoint and settings resumes at the first
+episode not yet on disk; a directory written for another checkpoint or
+with other settings is refused. The CSV and summary are written from
+that directory at the end.
 """
 
 import argparse
+import atexit
+import glob
 import json
 import logging
+import multiprocessing as mp
 import os
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cobra
 import numpy as np
@@ -22,8 +50,18 @@ from tqdm import tqdm
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from redox_balancer.agents.net import AgentNet
+from redox_balancer.agents.export import (
+    ROLES,
+    ExportedPolicy,
+    export_checkpoint,
+    find_exported_policy,
+    load_exported_policy,
+)
+from redox_balancer.analysis.top_constructs import score_constructs
 from redox_balancer.env.redox_env import RedoxBalancerEnv
+from redox_balancer.utils.constructs import ConstructEvaluator, decode_sink_action
+from redox_balancer.utils.dedup import DedupEnv
+from redox_balancer.utils.results_store import ChunkedResultsWriter, read_results
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,8 +70,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_checkpoint(checkpoint_path: Path) -> Tuple[Dict, Dict, int]:
-    """Load agent networks and training state from checkpoint."""
+def load_checkpoint(
+    checkpoint_path: Path,
+    enzyme_library_path: Optional[str] = None,
+    export_dir: Optional[Path] = None,
+) -> Tuple[Dict[str, ExportedPolicy], Dict, int]:
+    """Load exported agent policies and training state from checkpoint.
+    
+    Policies are read from checkpoint_path/export (see export_policy.py).
+    Roles not exported there are exported from the raw weights into
+    export_dir first; the checkpoint itself is never written to.
+    """
     if not checkpoint_path.exists():
         raise FileNotFoundError(f"Checkpoint not found: {checkpoint_path}")
     
@@ -42,103 +89,415 @@ def load_checkpoint(checkpoint_path: Path) -> Tuple[Dict, Dict, int]:
     with open(state_path, "r") as f:
         training_state = json.load(f)
     
-    # Load agent networks
+    # Export on first use, outside the checkpoint
+    has_weights = [role for role in ROLES if (checkpoint_path / f"{role}_agent.pt.gz").exists()]
+    exported = {}
+    if any(find_exported_policy(checkpoint_path, role) is None for role in has_weights):
+        if export_dir is None:
+            raise FileNotFoundError(f"{checkpoint_path} has no exported policies and no export_dir was given")
+        exported = export_checkpoint(checkpoint_path, export_dir, enzyme_library_path=enzyme_library_path)
+    
+    # Load agent policies
     agents = {}
-    for role in ["tumor", "sink_designer"]:
-        agent_path = checkpoint_path / f"{role}_agent.pt.gz"
-        if agent_path.exists():
-            agent_state = torch.load(agent_path, map_location="cpu")
-            agents[role] = agent_state
-            logger.info(f"Loaded {role} agent from {agent_path}")
+    for role in has_weights:
+        policy_path = find_exported_policy(checkpoint_path, role) or exported[role]
+        agents[role] = load_exported_policy(policy_path)
+        logger.info(f"Loaded {role} policy from {policy_path}")
     
     timesteps = training_state.get("global_timesteps", 0)
     return agents, training_state, timesteps
 
 
+def load_enzyme_db(enzymes_path: str) -> Dict:
+    with open(enzymes_path, "r") as f:
+        enzyme_data = json.load(f)
+    return enzyme_data.get("enzymes", {})
+
+
+def make_env(model: cobra.Model, enzymes_path: str, dedup: bool = False) -> RedoxBalancerEnv:
+    """Sink designer evaluation environment, optionally reusing repeated transitions."""
+    env = RedoxBalancerEnv(
+        base_model=model,
+        agent_role="sink_designer",  # Evaluate sink designer
+        enzyme_db=load_enzyme_db(enzymes_path),
+        use_cache=False,  # Disable for evaluation
+    )
+    return DedupEnv(env) if dedup else env
+
+
+def run_episode(
+    env: RedoxBalancerEnv,
+    agents: Dict[str, ExportedPolicy],
+    episode: int,
+    seed: int = 42,
+    enzyme_list: Optional[Sequence[str]] = None,
+    record_steps: bool = False,
+) -> Dict:
+    """Run one evaluation episode, seeded only by its index.
+    
+    If enzyme_list is given, the sink designer's final action is recorded
+    as a construct key for FBA scoring. With record_steps the row carries a
+    per-step ``trace`` (reward, growth, sink flux and construct).
+    """
+    # Per-episode seeds keep results independent of sharding
+    episode_seed = seed + episode
+    np.random.seed(episode_seed)
+    torch.manual_seed(episode_seed)
+    env.action_space.seed(episode_seed)
+    dedup_before = env.stats() if isinstance(env, DedupEnv) else None
+    
+    obs, _ = env.reset(seed=episode_seed)
+    for policy in agents.values():
+        policy.reset()
+    done = False
+    episode_return = 0
+    episode_length = 0
+    action = None
+    
+    # Track episode metrics
+    growth_rates = []
+    sink_fluxes = []
+    nadh_levels = []
+    trace = [] if record_steps else None
+    decode = enzyme_list is not None and env.agent_role == "sink_designer"
+    
+    while not done:
+        # Get action from appropriate agent
+        if env.agent_role in agents:
+            action = agents[env.agent_role].act(obs)
+        else:
+            # Random action if agent not found
+            action = env.action_space.sample()
+        
+        # Step environment
+        obs, reward, terminated, truncated, info = env.step(action)
+        done = terminated or truncated
+        
+        episode_return += reward
+        episode_length += 1
+        
+        # Collect metrics
+        growth_rates.append(info.get("growth_rate", 0))
+        
+        # Get sink flux from info if available
+        if "sink_flux" in info:
+            sink_fluxes.append(info["sink_flux"])
+            
+        if trace is not None:
+            step = {
+                "step": episode_length - 1,
+                "reward": float(reward),
+                "growth_rate": float(info.get("growth_rate", 0)),
+                "sink_flux": float(info["sink_flux"]) if "sink_flux" in info else None,
+            }
+            if decode:
+                step["construct"] = decode_sink_action(action, enzyme_list).key
+            trace.append(step)
+        
+    # Record episode results
+    result = {
+        "episode": episode,
+        "return": episode_return,
+        "length": episode_length,
+        "final_growth": growth_rates[-1] if growth_rates else 0,
+        "mean_growth": np.mean(growth_rates) if growth_rates else 0,
+        "max_sink_flux": max(sink_fluxes) if sink_fluxes else 0,
+        "mean_sink_flux": np.mean(sink_fluxes) if sink_fluxes else 0,
+    }
+    if decode and action is not None:
+        result["construct"] = decode_sink_action(action, enzyme_list).key
+    if dedup_before is not None:
+        dedup_after = env.stats()
+        for key in ("env_steps", "reused_steps", "replayed_steps"):
+            result[key] = dedup_after[key] - dedup_before[key]
+    if trace is not None:
+        result["trace"] = trace
+    return result
+
+
+def _pending_episodes(num_episodes: int, writer: Optional[ChunkedResultsWriter]) -> List[int]:
+    """Episode indices still to run; those already in the results directory are skipped."""
+    return [e for e in range(num_episodes) if writer is None or e not in writer.completed]
+
+
+def _record(result: Dict, writer: Optional[ChunkedResultsWriter], results: List[Dict]):
+    steps = result.pop("trace", None)
+    if writer is not None:
+        writer.add_episode(result, steps)
+    else:
+        results.append(result)
+
+
+def _collected(
+    num_episodes: int,
+    writer: Optional[ChunkedResultsWriter],
+    results: List[Dict],
+) -> pd.DataFrame:
+    """Episode rows ordered by index, read back from disk when streaming."""
+    if writer is None:
+        return pd.DataFrame(sorted(results, key=lambda r: r["episode"]))
+    writer.flush()
+    df = read_results(writer.path)
+    if "episode" not in df:  # Nothing recorded yet, e.g. --num-episodes 0
+        return df
+    return df[df["episode"] < num_episodes].reset_index(drop=True)
+
+
 def evaluate_agents(
     env: RedoxBalancerEnv,
-    agents: Dict,
+    agents: Dict[str, ExportedPolicy],
     num_episodes: int = 500,
     deterministic: bool = True,
     seed: int = 42,
+    enzyme_list: Optional[Sequence[str]] = None,
+    writer: Optional[ChunkedResultsWriter] = None,
+    record_steps: bool = False,
 ) -> pd.DataFrame:
-    """Run evaluation episodes and collect metrics."""
+    """Run evaluation episodes in this process and collect metrics.
+    
+    With a writer, rows stream to disk instead of accumulating in memory.
+    Episodes already recorded there are skipped.
+    """
+    if not deterministic:
+        raise ValueError("Exported policies are greedy; stochastic evaluation is not supported")
+        
     results = []
+    for episode in tqdm(_pending_episodes(num_episodes, writer), desc="Evaluating"):
+        _record(run_episode(env, agents, episode, seed, enzyme_list, record_steps), writer, results)
+    return _collected(num_episodes, writer, results)
+
+
+# Per-process state for pool workers, set once by _init_worker
+_worker_env: Optional[RedoxBalancerEnv] = None
+_worker_policies: Dict[str, ExportedPolicy] = {}
+
+
+def _init_worker(model_path: str, enzymes_path: str, dedup: bool):
+    """Load the model once per worker process."""
+    global _worker_env
     
-    # Set seeds for reproducibility
-    np.random.seed(seed)
-    torch.manual_seed(seed)
-    
-    # Create agent networks
-    nets = {}
-    for role, state in agents.items():
-        net = AgentNet(
-            observation_space=env.observation_space,
-            action_space=env.action_space,
-            hidden_dim=state.get("hidden_dim", 512),
-            num_layers=state.get("num_layers", 3),
-        )
-        net.load_state_dict(state["state_dict"])
-        net.eval()
-        nets[role] = net
-    
-    # Run evaluation episodes
-    for episode in tqdm(range(num_episodes), desc="Evaluating"):
-        obs, _ = env.reset(seed=seed + episode)
-        done = False
-        episode_return = 0
-        episode_length = 0
+    # Workers are the parallelism; avoid oversubscribing cores with torch threads
+    torch.set_num_threads(1)
+    _worker_env = make_env(cobra.io.load_json_model(model_path), enzymes_path, dedup)
+
+
+def _evaluate_shard(
+    policy_paths: Dict[str, str],
+    episodes: List[int],
+    seed: int,
+    enzyme_list: Optional[Sequence[str]],
+    record_steps: bool,
+) -> List[Dict]:
+    # Policies stay loaded, so later shards of a checkpoint skip deserialization
+    for path in policy_paths.values():
+        if path not in _worker_policies:
+            _worker_policies[path] = load_exported_policy(path)
+    agents = {role: _worker_policies[path] for role, path in policy_paths.items()}
+    return [
+        run_episode(_worker_env, agents, episode, seed, enzyme_list, record_steps)
+        for episode in episodes
+    ]
+
+
+def make_eval_pool(
+    model_path: str,
+    enzymes_path: str,
+    num_workers: int,
+    dedup: bool = False,
+) -> ProcessPoolExecutor:
+    """Worker pool whose processes each hold one environment, reusable across checkpoints.
+    
+    With dedup, each worker keeps its own transition record; shards are
+    contiguous episode ranges, so repeats within a shard are always reused.
+    """
+    # Spawned workers start clean rather than inheriting solver and torch thread state
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path, enzymes_path, dedup),
+    )
+
+
+def evaluate_agents_parallel(
+    pool: ProcessPoolExecutor,
+    policy_paths: Dict[str, str],
+    num_episodes: int = 500,
+    seed: int = 42,
+    shard_size: int = 8,
+    enzyme_list: Optional[Sequence[str]] = None,
+    writer: Optional[ChunkedResultsWriter] = None,
+    record_steps: bool = False,
+) -> pd.DataFrame:
+    """Shard evaluation episodes across a process pool.
+    
+    Args:
+        pool: Pool from make_eval_pool
+        policy_paths: Exported policy artifact per role
+        num_episodes: Episodes to run in total
+        seed: Base seed; episode i uses seed + i in every configuration
+        shard_size: Episodes per task; small shards keep the workers balanced
+        enzyme_list: Record final sink constructs (see run_episode)
+        writer: Stream finished shards to disk, skipping recorded episodes
+        record_steps: Keep per-step traces (written by the writer)
         
-        # Track episode metrics
-        growth_rates = []
-        sink_fluxes = []
-        nadh_levels = []
+    Returns:
+        One row per episode, ordered by episode index
+    """
+    pending = _pending_episodes(num_episodes, writer)
+    shards = [pending[start:start + shard_size] for start in range(0, len(pending), shard_size)]
+    
+    results = []
+    futures = [
+        pool.submit(_evaluate_shard, policy_paths, shard, seed, enzyme_list, record_steps)
+        for shard in shards
+    ]
+    with tqdm(total=len(pending), desc="Evaluating") as progress:
+        for future in as_completed(futures):
+            shard_results = future.result()
+            for result in shard_results:
+                _record(result, writer, results)
+            progress.update(len(shard_results))
+            
+    return _collected(num_episodes, writer, results)
+
+
+def summarize(results_df: pd.DataFrame) -> Dict:
+    """Headline statistics over evaluation episodes."""
+    summary = {
+        "mean_return": results_df["return"].mean(),
+        "std_return": results_df["return"].std(),
+        "success_rate": (results_df["final_growth"] > 0.9 * 0.67).mean() * 100,
+        "mean_growth": results_df["final_growth"].mean(),
+        "mean_sink_flux": results_df["mean_sink_flux"].mean(),
+    }
+    if "env_steps" in results_df:
+        # Every environment step is an FBA solve; replays are the price of lazy reuse
+        summary["total_steps"] = int(results_df["length"].sum())
+        summary["env_steps"] = int(results_df["env_steps"].sum() + results_df["replayed_steps"].sum())
+        summary["solves_saved"] = int(results_df["reused_steps"].sum() - results_df["replayed_steps"].sum())
+    return summary
+
+
+def checkpoint_order(path: Path) -> float:
+    """Sort key putting step_N checkpoints in training order and anything else last."""
+    try:
+        return int(path.name.split("_")[1])
+    except (IndexError, ValueError):
+        return float("inf")
+
+
+def export_path(args, checkpoint_path: Path) -> Path:
+    """Where a checkpoint's policies are exported when it has no export of its own."""
+    return Path(args.export_dir) / checkpoint_path.resolve().parent.name / checkpoint_path.name
+
+
+def open_results(args, results_dir: Path, checkpoint_path: Path, timesteps: int) -> ChunkedResultsWriter:
+    """Results directory for a run; only resumed for the same checkpoint and settings."""
+    return ChunkedResultsWriter(
+        results_dir,
+        chunk_size=args.chunk_size,
+        metadata={
+            "checkpoint": str(checkpoint_path.resolve()),
+            "timesteps": timesteps,
+            "model": args.model,
+            "enzymes": args.enzymes,
+            "seed": args.seed,
+            "save_steps": args.save_steps,
+            "dedup": args.dedup,
+        },
+    )
+
+
+def sweep_checkpoints(args, checkpoint_paths: List[Path]):
+    """Evaluate many checkpoints with one model load, worker pool and FBA cache."""
+    from redox_balancer.data.enzyme_library import EnzymeLibrary
+    
+    enzyme_list, _ = EnzymeLibrary(args.enzymes).to_action_space()
+    model = cobra.io.load_json_model(args.model)
+    evaluator = ConstructEvaluator(model, load_enzyme_db(args.enzymes), cache_dir=args.fba_cache_dir)
+    logger.info(
+        f"Sweeping {len(checkpoint_paths)} checkpoints; "
+        f"{len(evaluator.outcome_cache)} FBA outcomes already cached"
+    )
+    
+    pool = None
+    env = None
+    if args.num_workers and args.num_workers > 1:
+        pool = make_eval_pool(args.model, args.enzymes, args.num_workers, args.dedup)
+    else:
+        env = make_env(model, args.enzymes, args.dedup)
         
-        while not done:
-            # Get action from appropriate agent
-            obs_tensor = torch.FloatTensor(obs).unsqueeze(0)
+    sweep_path = Path(args.sweep_output)
+    sweep_path.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not sweep_path.exists()
+    
+    try:
+        for checkpoint_path in checkpoint_paths:
+            start = time.time()
+            agents, _, timesteps = load_checkpoint(
+                checkpoint_path, args.enzymes, export_path(args, checkpoint_path)
+            )
             
-            with torch.no_grad():
-                if env.agent_role in nets:
-                    policy, _ = nets[env.agent_role](obs_tensor)
-                    
-                    if deterministic:
-                        # Take mode of distribution
-                        action = policy.mode.squeeze(0).cpu().numpy()
-                    else:
-                        # Sample from distribution
-                        action = policy.sample().squeeze(0).cpu().numpy()
+            with open_results(args, checkpoint_path / "evaluation", checkpoint_path, timesteps) as writer:
+                if pool is not None:
+                    results_df = evaluate_agents_parallel(
+                        pool,
+                        {role: str(policy.path) for role, policy in agents.items()},
+                        num_episodes=args.num_episodes,
+                        seed=args.seed,
+                        enzyme_list=enzyme_list,
+                        writer=writer,
+                        record_steps=args.save_steps,
+                    )
                 else:
-                    # Random action if agent not found
-                    action = env.action_space.sample()
-            
-            # Step environment
-            obs, reward, terminated, truncated, info = env.step(action)
-            done = terminated or truncated
+                    results_df = evaluate_agents(
+                        env,
+                        agents,
+                        num_episodes=args.num_episodes,
+                        seed=args.seed,
+                        enzyme_list=enzyme_list,
+                        writer=writer,
+                        record_steps=args.save_steps,
+                    )
+                
+            if results_df.empty:
+                logger.warning(f"{checkpoint_path.name}: no episodes evaluated, skipping")
+                continue
+                
+            solves_before = evaluator.solves
+            results_df = score_constructs(results_df, evaluator)
+            evaluator.outcome_cache.save_cache()
+            results_df.to_csv(checkpoint_path / "evaluation.csv", index=False)
             
-            episode_return += reward
-            episode_length += 1
+            row = {
+                "checkpoint": str(checkpoint_path),
+                "timesteps": timesteps,
+                "num_episodes": args.num_episodes,
+                **summarize(results_df),
+                "unique_constructs": results_df["construct"].nunique() if "construct" in results_df else 0,
+                "mean_fba_growth": results_df["fba_growth_rate"].mean() if "fba_growth_rate" in results_df else np.nan,
+                "mean_fba_nadh_oxidation": (
+                    results_df["fba_nadh_oxidation"].mean() if "fba_nadh_oxidation" in results_df else np.nan
+                ),
+                "fba_solves": evaluator.solves - solves_before,
+                "fba_cache_hit_rate": evaluator.outcome_cache.stats()["hit_rate"],
+                "eval_seconds": time.time() - start,
+            }
             
-            # Collect metrics
-            growth_rates.append(info.get("growth_rate", 0))
+            # Stream each summary so a partial sweep is already usable
+            pd.DataFrame([row]).to_csv(sweep_path, mode="a", header=write_header, index=False)
+            write_header = False
+            logger.info(
+                f"{checkpoint_path.name}: return {row['mean_return']:.2f} ± {row['std_return']:.2f}, "
+                f"{row['unique_constructs']} constructs, {row['fba_solves']} new FBA solves "
+                f"({row['eval_seconds']:.0f}s)"
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
             
-            # Get sink flux from info if available
-            if "sink_flux" in info:
-                sink_fluxes.append(info["sink_flux"])
-            
-        # Record episode results
-        result = {
-            "episode": episode,
-            "return": episode_return,
-            "length": episode_length,
-            "final_growth": growth_rates[-1] if growth_rates else 0,
-            "mean_growth": np.mean(growth_rates) if growth_rates else 0,
-            "max_sink_flux": max(sink_fluxes) if sink_fluxes else 0,
-            "mean_sink_flux": np.mean(sink_fluxes) if sink_fluxes else 0,
-        }
-        results.append(result)
-    
-    return pd.DataFrame(results)
+    logger.info(f"Sweep results saved to: {sweep_path}")
 
 
 def main():
@@ -148,6 +507,24 @@ def main():
         type=str,
         help="Path to checkpoint directory (defaults to latest)",
     )
+    parser.add_argument(
+        "--checkpoints",
+        type=str,
+        nargs="+",
+        help="Glob(s) of checkpoint directories to sweep, e.g. 'experiments/run/step_*'",
+    )
+    parser.add_argument(
+        "--sweep-output",
+        type=str,
+        default="checkpoint_sweep.csv",
+        help="Table that per-checkpoint summaries are appended to in sweep mode",
+    )
+    parser.add_argument(
+        "--fba-cache-dir",
+        type=str,
+        default="cache/fba_outcomes",
+        help="Persistent FBA outcome cache shared across checkpoints and sweeps",
+    )
     parser.add_argument(
         "--experiment-dir",
         type=str,
@@ -177,6 +554,29 @@ def main():
         type=str,
         help="Output CSV path (defaults to checkpoint_dir/evaluation.csv)",
     )
+    parser.add_argument(
+        "--results-dir",
+        type=str,
+        help="Chunked results directory to stream into and resume from "
+             "(defaults to checkpoint_dir/evaluation)",
+    )
+    parser.add_argument(
+        "--export-dir",
+        type=str,
+        help="Directory for policies exported from checkpoints without an export "
+             "(defaults to a temporary directory removed on exit)",
+    )
+    parser.add_argument(
+        "--save-steps",
+        action="store_true",
+        help="Also stream per-step reward, growth, sink flux and construct traces",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Episodes buffered in memory before a results chunk is written",
+    )
     parser.add_argument(
         "--deterministic",
         action="store_true",
@@ -189,9 +589,40 @@ def main():
         default=42,
         help="Random seed for reproducibility",
     )
+    parser.add_argument(
+        "--no-dedup",
+        dest="dedup",
+        action="store_false",
+        help="Step the environment for every episode instead of reusing repeated transitions",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Evaluation worker processes (1 runs in-process)",
+    )
     
     args = parser.parse_args()
     
+    if not args.deterministic:
+        raise ValueError("Exported policies are greedy; stochastic evaluation is not supported")
+    
+    # Evaluation never writes into checkpoints; on-the-fly exports go to scratch space
+    if args.export_dir is None:
+        scratch = tempfile.TemporaryDirectory(prefix="policy_export_")
+        atexit.register(scratch.cleanup)
+        args.export_dir = scratch.name
+        
+    if args.checkpoints:
+        paths = {Path(p) for pattern in args.checkpoints for p in glob.glob(pattern)}
+        checkpoint_paths = sorted(
+            (p for p in paths if (p / "training_state.json").exists()), key=checkpoint_order
+        )
+        if not checkpoint_paths:
+            raise FileNotFoundError(f"No checkpoints match {args.checkpoints}")
+        sweep_checkpoints(args, checkpoint_paths)
+        return
+        
     # Find checkpoint
     if args.checkpoint:
         checkpoint_path = Path(args.checkpoint)
@@ -207,46 +638,76 @@ def main():
     logger.info(f"Evaluating checkpoint: {checkpoint_path}")
     
     # Load checkpoint
-    agents, training_state, timesteps = load_checkpoint(checkpoint_path)
+    agents, training_state, timesteps = load_checkpoint(
+        checkpoint_path, args.enzymes, export_path(args, checkpoint_path)
+    )
     logger.info(f"Checkpoint at {timesteps:,} timesteps")
     
-    # Load model and enzyme database
-    model = cobra.io.load_json_model(args.model)
-    with open(args.enzymes, "r") as f:
-        enzyme_data = json.load(f)
-    enzyme_db = enzyme_data.get("enzymes", {})
+    from redox_balancer.data.enzyme_library import EnzymeLibrary
     
-    # Create environment
-    env = RedoxBalancerEnv(
-        base_model=model,
-        agent_role="sink_designer",  # Evaluate sink designer
-        enzyme_db=enzyme_db,
-        use_cache=False,  # Disable for evaluation
-    )
+    enzyme_list, _ = EnzymeLibrary(args.enzymes).to_action_space()
+    model = cobra.io.load_json_model(args.model)
+    evaluator = ConstructEvaluator(model, load_enzyme_db(args.enzymes), cache_dir=args.fba_cache_dir)
     
     # Run evaluation
     logger.info(f"Running {args.num_episodes} evaluation episodes...")
-    results_df = evaluate_agents(
-        env,
-        agents,
-        num_episodes=args.num_episodes,
-        deterministic=args.deterministic,
-        seed=args.seed,
-    )
+    results_dir = Path(args.results_dir) if args.results_dir else checkpoint_path / "evaluation"
+    with open_results(args, results_dir, checkpoint_path, timesteps) as writer:
+        if args.num_workers and args.num_workers > 1:
+            with make_eval_pool(args.model, args.enzymes, args.num_workers, args.dedup) as pool:
+                results_df = evaluate_agents_parallel(
+                    pool,
+                    {role: str(policy.path) for role, policy in agents.items()},
+                    num_episodes=args.num_episodes,
+                    seed=args.seed,
+                    enzyme_list=enzyme_list,
+                    writer=writer,
+                    record_steps=args.save_steps,
+                )
+        else:
+            env = make_env(model, args.enzymes, args.dedup)
+            results_df = evaluate_agents(
+                env,
+                agents,
+                num_episodes=args.num_episodes,
+                deterministic=args.deterministic,
+                seed=args.seed,
+                enzyme_list=enzyme_list,
+                writer=writer,
+                record_steps=args.save_steps,
+            )
+    logger.info(f"Episode results streamed to: {results_dir}")
+    if results_df.empty:
+        logger.warning("No episodes evaluated; nothing to summarize")
+        return
+    
+    results_df = score_constructs(results_df, evaluator)
+    evaluator.outcome_cache.save_cache()
     
     # Calculate summary statistics
-    mean_return = results_df["return"].mean()
-    std_return = results_df["return"].std()
-    success_rate = (results_df["final_growth"] > 0.9 * 0.67).mean() * 100
+    stats = summarize(results_df)
+    mean_return = stats["mean_return"]
+    std_return = stats["std_return"]
+    success_rate = stats["success_rate"]
     
     logger.info(f"\n=== EVALUATION RESULTS ===")
     logger.info(f"Mean return: {mean_return:.2f} ± {std_return:.2f}")
     logger.info(f"Success rate (>90% growth): {success_rate:.1f}%")
     logger.info(f"Mean final growth: {results_df['final_growth'].mean():.3f}")
     logger.info(f"Mean sink flux: {results_df['mean_sink_flux'].mean():.3f}")
+    if "fba_nadh_oxidation" in results_df:
+        logger.info(
+            f"Mean exact FBA NADH oxidation: {results_df['fba_nadh_oxidation'].mean():.3f} "
+            f"({evaluator.solves} FBA solves)"
+        )
+    if "solves_saved" in stats:
+        logger.info(
+            f"Environment steps: {stats['env_steps']:,} of {stats['total_steps']:,} "
+            f"({stats['solves_saved']:,} FBA solves saved by deduplication)"
+        )
     
     # Save results
-    output_path = args.output or checkpoint_path / "evaluation.csv"
+    output_path = Path(args.output) if args.output else checkpoint_path / "evaluation.csv"
     results_df.to_csv(output_path, index=False)
     logger.info(f"Results saved to: {output_path}")
     
@@ -255,10 +716,12 @@ def main():
         "checkpoint": str(checkpoint_path),
         "timesteps": timesteps,
         "num_episodes": args.num_episodes,
+        "num_workers": args.num_workers,
         "mean_return": mean_return,
         "std_return": std_return,
         "success_rate": success_rate,
         "mean_growth": results_df["final_growth"].mean(),
+        **{key: stats[key] for key in ("total_steps", "env_steps", "solves_saved") if key in stats},
         "evaluation_date": datetime.now().isoformat(),
     }
     
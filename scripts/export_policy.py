@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Export trained agents from a checkpoint as TorchScript or ONNX policies.
+
+The artifacts carry the deterministic action decoding, so evaluation and
+serving tools can load them without the network classes.
+
+Usage:
+    python scripts/export_policy.py --checkpoint experiments/run/final \
+        --enzymes data/enzyme_library_redox.json --format torchscript
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.agents.export import EXPORT_FORMATS, export_checkpoint, load_exported_policy
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export trained policies for evaluation and serving")
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        required=True,
+        help="Path to checkpoint directory",
+    )
+    parser.add_argument(
+        "--enzymes",
+        type=str,
+        default="data/enzyme_library_redox.json",
+        help="Enzyme library the sink designer was trained with (for its action mask)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(EXPORT_FORMATS),
+        default="torchscript",
+        help="Artifact format",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        help="Output directory (defaults to checkpoint_dir/export)",
+    )
+    
+    args = parser.parse_args()
+    
+    enzymes = args.enzymes if Path(args.enzymes).exists() else None
+    if enzymes is None:
+        logger.warning(f"Enzyme library not found at {args.enzymes}; exporting without an action mask")
+        
+    exported = export_checkpoint(
+        Path(args.checkpoint),
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        export_format=args.format,
+        enzyme_library_path=enzymes,
+    )
+    
+    # Sanity check: each artifact loads and runs on its own
+    for role, path in exported.items():
+        policy = load_exported_policy(path)
+        actions, _, _ = policy.step(np.zeros((1, policy.obs_dim), dtype=np.float32))
+        logger.info(f"{role}: {path} (obs_dim={policy.obs_dim}, action_dim={actions.shape[1]})")
+
+
+if __name__ == "__main__":
+    main()
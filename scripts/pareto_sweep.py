@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Trace growth vs. redox trade-off frontiers for a set of constructs.
+
+Each construct's NADH oxidation is maximized under a sweep of growth
+floors (epsilon constraint), with ATP maintenance and ROS production as
+secondary objectives where the model has them. Frontiers are streamed into a
+resumable chunked results store and flattened to frontiers.csv.
+
+Usage:
+    python scripts/pareto_sweep.py --from-results 'experiments/run/step_*' --top-n 100 \
+        --model data/models/redox_core_v2.json --points 21 --num-workers 8
+    python scripts/pareto_sweep.py --constructs NOX_Ec_m_x2 MDH1_c_x1+NOX_Ec_c_x4
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+
+import cobra
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.analysis.pareto import (
+    OBJECTIVES,
+    default_secondary_objectives,
+    growth_fractions,
+    make_frontier_pool,
+    sweep_frontiers,
+)
+from redox_balancer.analysis.top_constructs import harvest_constructs, rank_candidates
+from redox_balancer.utils.constructs import Construct, ConstructEvaluator
+from redox_balancer.utils.results_store import ChunkedResultsWriter, read_results
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epsilon-constraint growth vs. redox frontiers")
+    parser.add_argument(
+        "--constructs",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Construct keys, e.g. NOX_Ec_m_x2",
+    )
+    parser.add_argument(
+        "--from-results",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Glob(s) of evaluation results to take the top constructs from",
+    )
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=100,
+        help="Constructs taken from --from-results",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="data/models/redox_core_v2.json",
+        help="Path to metabolic model",
+    )
+    parser.add_argument(
+        "--enzymes",
+        type=str,
+        default="data/enzyme_library_redox.json",
+        help="Path to enzyme library",
+    )
+    parser.add_argument(
+        "--objective",
+        choices=OBJECTIVES,
+        default="nadh_oxidation",
+        help="Redox objective maximized at each growth floor",
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=11,
+        help="Growth floors per frontier",
+    )
+    parser.add_argument(
+        "--min-fraction",
+        type=float,
+        default=0.0,
+        help="Lowest growth floor, as a fraction of baseline growth",
+    )
+    parser.add_argument(
+        "--no-secondary",
+        action="store_true",
+        help="Skip ATP maintenance and ROS production at each point",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="Processes computing frontiers",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Frontiers per results chunk",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="reports/pareto",
+        help="Output directory (frontier store and frontiers.csv)",
+    )
+
+    args = parser.parse_args()
+
+    model = cobra.io.load_json_model(args.model)
+    with open(args.enzymes) as f:
+        enzyme_db = json.load(f).get("enzymes", {})
+    evaluator = ConstructEvaluator(model, enzyme_db)
+
+    keys = list(dict.fromkeys(Construct.from_key(key).key for key in args.constructs))
+    sources = sorted({path for pattern in args.from_results for path in glob.glob(pattern)})
+    if sources:
+        ranked = [
+            c for c in rank_candidates(harvest_constructs(sources), evaluator)
+            if c.predicted_from != "invalid"
+        ]
+        keys.extend(c.construct.key for c in ranked[:args.top_n] if c.construct.key not in keys)
+    constructs = [Construct.from_key(key) for key in keys if key]
+    if not constructs:
+        raise SystemExit("No constructs given; use --constructs or --from-results")
+
+    fractions = growth_fractions(args.points, args.min_fraction)
+    secondary = None if args.no_secondary else default_secondary_objectives(evaluator.model)
+    logger.info(
+        f"{len(constructs)} constructs x {len(fractions)} growth floors; "
+        f"secondary objectives: {sorted(secondary or {}) or 'none'}"
+    )
+
+    output_dir = Path(args.output)
+    metadata = {
+        "model": args.model,
+        "enzymes": args.enzymes,
+        "objective": args.objective,
+        "fractions": fractions,
+        "secondary": sorted(secondary or {}),
+        "constructs": hashlib.sha256("\n".join(keys).encode()).hexdigest(),
+    }
+    pool = make_frontier_pool(args.model, enzyme_db, args.num_workers) if args.num_workers > 1 else None
+    try:
+        with ChunkedResultsWriter(output_dir / "frontiers", args.chunk_size, metadata) as writer:
+            computed = sweep_frontiers(
+                evaluator,
+                constructs,
+                fractions,
+                writer,
+                objective=args.objective,
+                secondary=secondary,
+                pool=pool,
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    summary = read_results(output_dir / "frontiers")
+    points = read_results(output_dir / "frontiers", table="steps")
+    points = points.merge(summary[["episode", "construct"]], on="episode", how="left")
+    points.to_csv(output_dir / "frontiers.csv", index=False)
+    logger.info(f"Computed {computed} new frontiers; {len(points)} points saved to {output_dir / 'frontiers.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,7 @@ Tests the downloaded checkpoint on a few episodes to verify it's working.
 
 import os
 import sys
-import json
-import torch
+import tempfile
 import numpy as np
 from pathlib import Path
 
@@ -54,14 +53,29 @@ def quick_eval():
         
         print(f"✅ Environment loaded: {len(env.model.reactions)} reactions")
         
-        # Load checkpoint
+        # Load exported tumor policy, exporting it from the checkpoint if needed
+        from redox_balancer.agents.export import (
+            export_checkpoint,
+            find_exported_policy,
+            load_exported_policy,
+        )
+        
+        policy = None
         tumor_checkpoint = os.path.join(checkpoint_dir, "tumor_agent.pt.gz")
         if os.path.exists(tumor_checkpoint):
-            checkpoint = torch.load(tumor_checkpoint, map_location='cpu')
-            print(f"✅ Checkpoint loaded: {len(checkpoint)} parameters")
+            policy_path = find_exported_policy(checkpoint_dir, "tumor")
+            if policy_path is not None:
+                policy = load_exported_policy(policy_path)
+                print(f"✅ Policy loaded: {policy_path}")
+            else:
+                # Export to scratch space; the checkpoint is left untouched
+                with tempfile.TemporaryDirectory() as export_dir:
+                    policy = load_exported_policy(export_checkpoint(
+                        checkpoint_dir, export_dir, enzyme_library_path="data/enzyme_library_redox.json"
+                    )["tumor"])
+                print("✅ Policy exported from checkpoint weights and loaded")
         else:
             print("⚠️  No tumor agent checkpoint found, using random policy")
-            checkpoint = None
         
         # Run a few episodes
         print("\n🧪 Running evaluation episodes...")
@@ -69,13 +83,17 @@ def quick_eval():
         returns = []
         for episode in range(5):
             obs, _ = env.reset()
+            if policy is not None:
+                policy.reset()
             total_reward = 0
             done = False
             step = 0
             
             while not done and step < 20:  # Max 20 steps per episode
-                # Random action for now (replace with trained policy)
-                action = env.action_space.sample()
+                if policy is not None:
+                    action = policy.act(obs)
+                else:
+                    action = env.action_space.sample()
                 obs, reward, terminated, truncated, info = env.step(action)
                 total_reward += reward
                 done = terminated or truncated
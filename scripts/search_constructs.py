@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Search sink constructs directly with beam search, branch and bound or a MILP.
+
+A non-RL baseline. With --method beam, constructs are grown one part at a
+time, pruned with Vmax capacity bounds and DeltaCache growth predictions,
+and verified with exact FBA across a process pool; the best construct and
+the Pareto front over sink flux and growth are written. With --method milp,
+one mixed-integer solve over the SINK reactions returns the global optimum
+under a growth floor, written as an evaluation.csv-style row.
+
+Usage:
+    python scripts/search_constructs.py --model data/models/redox_core_v2.json \
+        --beam-width 64 --max-parts 4 --num-workers 8
+    python scripts/search_constructs.py --method milp --objective nadh_oxidation
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import cobra
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.cache.delta_cache import DeltaCache
+from redox_balancer.search import ConstructSearch, make_search_pool, solve_construct_milp
+from redox_balancer.search.construct_search import OBJECTIVES
+from redox_balancer.utils.constructs import COMPARTMENTS, ConstructEvaluator
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Beam, branch-and-bound or MILP search over sink constructs")
+    parser.add_argument(
+        "--method",
+        choices=["beam", "milp"],
+        default="beam",
+        help="Enumerative search, or a single MILP solve for the global optimum",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="data/models/redox_core_v2.json",
+        help="Path to metabolic model",
+    )
+    parser.add_argument(
+        "--enzymes",
+        type=str,
+        default="data/enzyme_library_redox.json",
+        help="Path to enzyme library",
+    )
+    parser.add_argument(
+        "--objective",
+        choices=OBJECTIVES,
+        default="sink_flux",
+        help="Quantity to maximize",
+    )
+    parser.add_argument(
+        "--max-parts",
+        type=int,
+        default=4,
+        help="Maximum (enzyme, compartment) pairs per construct",
+    )
+    parser.add_argument(
+        "--max-copies",
+        type=int,
+        default=8,
+        help="Maximum copy number per part",
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        default=32,
+        help="Constructs verified per depth; 0 verifies every unpruned construct (branch and bound)",
+    )
+    parser.add_argument(
+        "--min-relative-growth",
+        type=float,
+        default=None,
+        help="Fraction of baseline growth a construct must keep (default: 0.9 beam, 0.95 milp)",
+    )
+    parser.add_argument(
+        "--delta-cache-dir",
+        type=str,
+        default=None,
+        help="DeltaCache directory for growth predictions (pruning on capacity alone if omitted)",
+    )
+    parser.add_argument(
+        "--fba-cache-dir",
+        type=str,
+        default="cache/fba_outcomes",
+        help="Persistent FBA outcome cache (shared with eval_agents.py)",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="Processes for exact FBA verification",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="MILP solver time limit in seconds",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="reports/construct_search",
+        help="Output directory",
+    )
+
+    args = parser.parse_args()
+    if args.min_relative_growth is None:
+        args.min_relative_growth = 0.95 if args.method == "milp" else 0.9
+
+    model = cobra.io.load_json_model(args.model)
+    with open(args.enzymes) as f:
+        enzyme_db = json.load(f).get("enzymes", {})
+    evaluator = ConstructEvaluator(model, enzyme_db, cache_dir=args.fba_cache_dir)
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.method == "milp":
+        result = solve_construct_milp(
+            evaluator,
+            objective=args.objective,
+            max_parts=args.max_parts,
+            max_copies=args.max_copies,
+            min_relative_growth=args.min_relative_growth,
+            time_limit=args.time_limit,
+        )
+        evaluator.outcome_cache.save_cache()
+        # Same construct/fba_* columns as eval_agents.py's evaluation.csv
+        pd.DataFrame([result.to_row()]).to_csv(output_dir / "milp.csv", index=False)
+        logger.info(
+            f"MILP {result.status}: {result.construct.key or '(none)'} "
+            f"(FBA NADH oxidation {result.outcome['nadh_oxidation']:.4f}, "
+            f"relative growth {result.outcome['relative_growth']:.1%}); results in {output_dir}"
+        )
+        return
+
+    delta_cache = DeltaCache(args.delta_cache_dir) if args.delta_cache_dir else None
+
+    pool = make_search_pool(args.model, enzyme_db, args.num_workers) if args.num_workers > 1 else None
+    start = time.time()
+    try:
+        search = ConstructSearch(
+            evaluator,
+            compartments=COMPARTMENTS,
+            max_parts=args.max_parts,
+            max_copies=args.max_copies,
+            objective=args.objective,
+            min_relative_growth=args.min_relative_growth,
+            delta_cache=delta_cache,
+            pool=pool,
+        )
+        result = search.run(beam_width=args.beam_width or None)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    evaluator.outcome_cache.save_cache()
+
+    pd.DataFrame(result.pareto).to_csv(output_dir / "pareto.csv", index=False)
+    pd.DataFrame(
+        [{'construct': key, **outcome} for key, outcome in result.outcomes.items()]
+    ).to_csv(output_dir / "outcomes.csv", index=False)
+    with open(output_dir / "summary.json", "w") as f:
+        json.dump({
+            'args': vars(args),
+            'baseline_growth': evaluator.baseline_growth,
+            'best': result.best,
+            'pareto_size': len(result.pareto),
+            'stats': result.stats,
+            'search_space_pairs': len(search.pairs),
+            'seconds': time.time() - start,
+        }, f, indent=2)
+
+    if result.best is not None:
+        logger.info(
+            f"Best: {result.best['construct']} ({args.objective} {result.best[args.objective]:.4f}, "
+            f"relative growth {result.best['relative_growth']:.1%})"
+        )
+    else:
+        logger.info("No construct kept the required growth")
+    logger.info(f"{result.stats['solves']} FBA solves in {time.time() - start:.0f}s; results in {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Extract the best sink constructs visited during evaluation.
+
+Harvests every construct in the given evaluation results, ranks them from
+cached FBA outcomes (or Vmax bounds) without solving, then re-verifies only
+the top k with exact FBA and parallel FVA over the redox reactions.
+
+Usage:
+    python scripts/top_constructs.py 'experiments/run/step_*' \
+        --model data/models/redox_core_v2.json --top-k 50 --processes 8
+"""
+
+import argparse
+import glob
+import json
+import logging
+import sys
+from pathlib import Path
+
+import cobra
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from redox_balancer.analysis.top_constructs import (
+    harvest_constructs,
+    rank_candidates,
+    redox_reactions,
+    verify_candidates,
+    write_report,
+)
+from redox_balancer.utils.constructs import ConstructEvaluator
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rank evaluated constructs and re-verify the top k with FBA and FVA"
+    )
+    parser.add_argument(
+        "results",
+        nargs="+",
+        help="Glob(s) of results directories, checkpoint directories or evaluation CSVs",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="data/models/redox_core_v2.json",
+        help="Path to metabolic model",
+    )
+    parser.add_argument(
+        "--enzymes",
+        type=str,
+        default="data/enzyme_library_redox.json",
+        help="Path to enzyme library",
+    )
+    parser.add_argument(
+        "--fba-cache-dir",
+        type=str,
+        default="cache/fba_outcomes",
+        help="Persistent FBA outcome cache (shared with eval_agents.py)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=50,
+        help="Number of constructs to re-verify",
+    )
+    parser.add_argument(
+        "--min-relative-growth",
+        type=float,
+        default=0.9,
+        help="Fraction of baseline growth a construct must keep to score",
+    )
+    parser.add_argument(
+        "--fraction-of-optimum",
+        type=float,
+        default=1.0,
+        help="Fraction of the construct's growth kept during FVA",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="FVA worker processes (defaults to cobra's configuration)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="reports/top_constructs",
+        help="Report directory",
+    )
+
+    args = parser.parse_args()
+
+    sources = sorted({path for pattern in args.results for path in glob.glob(pattern)})
+    if not sources:
+        raise SystemExit(f"No results match {args.results}")
+
+    candidates = harvest_constructs(sources)
+    logger.info(f"Harvested {len(candidates)} unique constructs from {len(sources)} sources")
+
+    model = cobra.io.load_json_model(args.model)
+    with open(args.enzymes) as f:
+        enzyme_db = json.load(f).get("enzymes", {})
+    evaluator = ConstructEvaluator(model, enzyme_db, cache_dir=args.fba_cache_dir)
+
+    ranked = rank_candidates(candidates, evaluator, args.min_relative_growth)
+    top = ranked[:args.top_k]
+    reaction_ids = redox_reactions(evaluator.model)
+    logger.info(f"Re-verifying {len(top)} constructs with FVA over {len(reaction_ids)} redox reactions")
+
+    verified = verify_candidates(
+        top,
+        evaluator,
+        reaction_ids,
+        min_relative_growth=args.min_relative_growth,
+        fraction_of_optimum=args.fraction_of_optimum,
+        processes=args.processes,
+    )
+    evaluator.outcome_cache.save_cache()
+
+    summary = {
+        "sources": sources,
+        "model": args.model,
+        "enzymes": args.enzymes,
+        "harvested": len(candidates),
+        "verified": len(verified),
+        "redox_reactions": len(reaction_ids),
+        "baseline_growth": evaluator.baseline_growth,
+        "min_relative_growth": args.min_relative_growth,
+        "fraction_of_optimum": args.fraction_of_optimum,
+        "predicted_from": pd.Series([c.predicted_from for c in top], dtype=str).value_counts().to_dict(),
+    }
+    paths = write_report(verified, args.output, summary)
+    logger.info(f"Report saved to: {paths['markdown']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -100,6 +100,18 @@ def main():
         choices=["cpu", "cuda"],
         help="Device for learner (cpu or cuda)"
     )
+    parser.add_argument(
+        "--num-learners",
+        type=int,
+        default=1,
+        help="Data-parallel learner processes (gloo all-reduce, requires --learner-device cpu)"
+    )
+    parser.add_argument(
+        "--learner-num-cpus",
+        type=int,
+        default=4,
+        help="Torch threads per learner process when --num-learners > 1"
+    )
     parser.add_argument(
         "--actor-device",
         type=str,
@@ -107,6 +119,11 @@ def main():
         choices=["cpu", "cuda"],
         help="Device for actors (cpu or cuda)"
     )
+    parser.add_argument(
+        "--actor-quantize",
+        action="store_true",
+        help="Run actor policies as int8 dynamic-quantized networks (CPU actors only)"
+    )
     
     # Logging and checkpointing
     parser.add_argument(
@@ -242,9 +259,12 @@ def main():
         # Actor settings
         num_actors=args.num_actors,
         actor_device=args.actor_device,
+        actor_quantize=args.actor_quantize,
         
         # Learner settings
         learner_device=args.learner_device,
+        num_learners=args.num_learners,
+        learner_num_cpus=args.learner_num_cpus,
         batch_size=args.batch_size,
         learning_rate=args.learning_rate,
         
@@ -273,6 +293,8 @@ def main():
     logging.info(f"Timesteps: {args.timesteps:,}")
     logging.info(f"Actors: {args.num_actors}")
     logging.info(f"Learner device: {args.learner_device}")
+    if args.num_learners > 1:
+        logging.info(f"Learners: {args.num_learners} x {args.learner_num_cpus} CPUs")
     logging.info(f"Checkpoint dir: {args.checkpoint_dir}")
     logging.info(f"Biomass penalty: {args.biomass_penalty}")
     logging.info(f"HIF penalty: {args.hif_penalty}")
@@ -1,8 +1,10 @@
 """IMPALA agents for self-play enzyme design."""
 
-from .impala_agent import IMPALAAgent, Trajectory
+from .export import export_policy, load_exported_policy
+from .impala_agent import IMPALAAgent, Trajectory, vtrace_scan
 from .networks import ActorCriticNetwork, SinkDesignerNetwork
 from .trainer import IMPALATrainer, TrainingConfig
+from .trajectory_buffer import TrajectoryBuffer, unpack_trajectory
 
 __all__ = [
     "IMPALAAgent",
@@ -11,4 +13,9 @@ __all__ = [
     "IMPALATrainer",
     "TrainingConfig",
     "Trajectory",
+    "TrajectoryBuffer",
+    "unpack_trajectory",
+    "vtrace_scan",
+    "export_policy",
+    "load_exported_policy",
 ]
\ No newline at end of file
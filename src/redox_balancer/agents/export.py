@@ -0,0 +1,311 @@
+"""Export trained policies as self-contained TorchScript or ONNX artifacts.
+
+An exported policy is a traced module mapping ``(obs, h, c)`` to
+``(action, value, h, c)`` with the deterministic action decoding baked in:
+tanh of the actor head for the tumor agent, and masked argmax enzyme and
+compartment picks plus rounded copy numbers for the sink designer. Loading
+one needs only torch (or onnxruntime), not the network classes, so
+evaluation, screening and serving tools can run checkpoints directly.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .networks import ActorCriticNetwork, SinkDesignerNetwork
+from ..utils.checkpoint import load_compressed
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("tumor", "sink_designer")
+EXPORT_FORMATS = {"torchscript": ".pt", "onnx": ".onnx"}
+METADATA_FILE = "policy.json"  # TorchScript extra file; ONNX artifacts get a .json sidecar
+
+
+def network_config_from_state_dict(role: str, state_dict: Dict[str, torch.Tensor]) -> Dict:
+    """Recover network constructor arguments from a saved state dict."""
+    embed = state_dict['metabolite_embed.0.weight']
+    config = {
+        'obs_dim': embed.shape[1],
+        'embedding_dim': embed.shape[0],
+        'hidden_dim': state_dict['lstm.weight_hh_l0'].shape[1],
+        'lstm_layers': sum(1 for key in state_dict if key.startswith('lstm.weight_ih_l')),
+    }
+
+    if role == "sink_designer":
+        max_enzymes = state_dict['copy_number_head.2.weight'].shape[0]
+        config.update({
+            'max_enzymes_per_construct': max_enzymes,
+            'n_enzymes': state_dict['enzyme_selector.2.weight'].shape[0] // max_enzymes,
+            'n_compartments': state_dict['compartment_head.2.weight'].shape[0] // max_enzymes,
+        })
+    else:
+        config['action_dim'] = state_dict['actor_head.2.weight'].shape[0]
+
+    return config
+
+
+def load_policy_network(
+    checkpoint_path: Path,
+    role: str,
+    action_mask: Optional[torch.Tensor] = None,
+) -> nn.Module:
+    """Rebuild a role's network from a trainer checkpoint directory.
+
+    Args:
+        checkpoint_path: Directory holding ``{role}_agent.pt.gz``
+        role: "tumor" or "sink_designer"
+        action_mask: Sink designer (enzyme, compartment) validity mask
+    """
+    state_dict = load_compressed(Path(checkpoint_path) / f"{role}_agent.pt.gz", map_location="cpu")
+    config = network_config_from_state_dict(role, state_dict)
+
+    if role == "sink_designer":
+        network = SinkDesignerNetwork(action_mask=action_mask, **config)
+    else:
+        network = ActorCriticNetwork(**config)
+
+    network.load_state_dict(state_dict)
+    return network.eval()
+
+
+class DeterministicPolicy(nn.Module):
+    """Single-step policy with explicit LSTM state and greedy action decoding."""
+
+    def __init__(self, network: ActorCriticNetwork):
+        super().__init__()
+        self.network = network
+        self.is_sink_designer = isinstance(network, SinkDesignerNetwork)
+
+    def forward(
+        self,
+        obs: torch.Tensor,
+        h: torch.Tensor,
+        c: torch.Tensor,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Take one greedy step.
+
+        Args:
+            obs: Observations [batch_size, obs_dim]
+            h, c: LSTM state [lstm_layers, batch_size, hidden_dim]
+
+        Returns:
+            action [batch_size, action_dim], value [batch_size], next h, next c
+        """
+        features, (h, c) = self.network.encode(obs.unsqueeze(1), (h, c))
+        output = self.network._heads(features, (h, c))
+
+        if self.is_sink_designer:
+            enzyme_idx = output['enzyme_logits'].argmax(dim=-1)
+            compartment_logits = self.network.mask_compartment_logits(
+                output['compartment_logits'], enzyme_idx
+            )
+            comp_idx = compartment_logits.argmax(dim=-1)
+            copy_num = torch.floor(output['copy_numbers'] + 0.5).clamp(1, 8)
+            action = torch.stack([enzyme_idx.float(), copy_num, comp_idx.float()], dim=-1)
+            action = action.flatten(start_dim=1)
+        else:
+            action = torch.tanh(output['action_logits'])
+
+        return action, output['value'], h, c
+
+
+def export_policy(
+    network: ActorCriticNetwork,
+    role: str,
+    output_path: Path,
+    export_format: str = "torchscript",
+) -> Path:
+    """Trace a network's deterministic policy and write it to disk.
+
+    Args:
+        network: Trained network (fp32)
+        role: Agent role, recorded in the artifact metadata
+        output_path: Artifact path; the format's suffix is added if missing
+        export_format: "torchscript" or "onnx"
+
+    Returns:
+        Path of the written artifact
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    output_path = Path(output_path)
+    if output_path.suffix != EXPORT_FORMATS[export_format]:
+        output_path = output_path.with_suffix(EXPORT_FORMATS[export_format])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    policy = DeterministicPolicy(network.eval()).eval()
+    h, c = network.initial_state(1)
+    example = (torch.zeros(1, network.obs_dim), h, c)
+
+    metadata = {
+        'role': role,
+        'obs_dim': network.obs_dim,
+        'action_dim': network.action_dim,
+        'lstm_layers': network.lstm.num_layers,
+        'hidden_dim': network.hidden_dim,
+    }
+
+    with torch.no_grad():
+        if export_format == "torchscript":
+            traced = torch.jit.trace(policy, example)
+            torch.jit.save(traced, str(output_path), _extra_files={METADATA_FILE: json.dumps(metadata)})
+        else:
+            torch.onnx.export(
+                policy,
+                example,
+                str(output_path),
+                input_names=['obs', 'h', 'c'],
+                output_names=['action', 'value', 'h_out', 'c_out'],
+                dynamic_axes={
+                    'obs': {0: 'batch'},
+                    'h': {1: 'batch'},
+                    'c': {1: 'batch'},
+                    'action': {0: 'batch'},
+                    'value': {0: 'batch'},
+                    'h_out': {1: 'batch'},
+                    'c_out': {1: 'batch'},
+                },
+                opset_version=17,
+            )
+            with open(output_path.with_suffix(".json"), "w") as f:
+                json.dump(metadata, f, indent=2)
+
+    logger.info(f"Exported {role} policy to {output_path}")
+    return output_path
+
+
+class ExportedPolicy:
+    """Runs an exported policy artifact with numpy inputs and outputs."""
+
+    def __init__(self, path: Path):
+        """Load a TorchScript (``.pt``) or ONNX (``.onnx``) policy.
+
+        Args:
+            path: Artifact written by export_policy
+        """
+        self.path = Path(path)
+
+        if self.path.suffix == ".onnx":
+            try:
+                import onnxruntime as ort
+            except ImportError as e:
+                raise ImportError("onnxruntime is required to run ONNX policies") from e
+            with open(self.path.with_suffix(".json")) as f:
+                self.metadata = json.load(f)
+            self._session = ort.InferenceSession(str(self.path), providers=["CPUExecutionProvider"])
+            self._module = None
+        else:
+            extra_files = {METADATA_FILE: ""}
+            self._module = torch.jit.load(str(self.path), map_location="cpu", _extra_files=extra_files)
+            self._module.eval()
+            self.metadata = json.loads(extra_files[METADATA_FILE])
+            self._session = None
+
+        self.role = self.metadata['role']
+        self.obs_dim = self.metadata['obs_dim']
+        self.action_dim = self.metadata['action_dim']
+        self.state = None
+
+    def initial_state(self, batch_size: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Zero LSTM state (h, c) for a batch of sequences."""
+        shape = (self.metadata['lstm_layers'], batch_size, self.metadata['hidden_dim'])
+        return np.zeros(shape, dtype=np.float32), np.zeros(shape, dtype=np.float32)
+
+    def step(
+        self,
+        obs: np.ndarray,
+        state: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Run one step for a batch of observations.
+
+        Args:
+            obs: Observations [batch_size, obs_dim]
+            state: LSTM state (h, c) [lstm_layers, batch_size, hidden_dim]; zeros if None
+
+        Returns:
+            actions [batch_size, action_dim], values [batch_size], next state
+        """
+        obs = np.asarray(obs, dtype=np.float32)
+        if state is None:
+            state = self.initial_state(obs.shape[0])
+        h, c = state
+
+        if self._session is not None:
+            action, value, h, c = self._session.run(None, {'obs': obs, 'h': h, 'c': c})
+        else:
+            with torch.no_grad():
+                outputs = self._module(torch.from_numpy(obs), torch.from_numpy(h), torch.from_numpy(c))
+            action, value, h, c = (t.numpy() for t in outputs)
+
+        return action, value, (h, c)
+
+    def act(self, observation: np.ndarray) -> np.ndarray:
+        """Greedy action for a single observation, carrying the LSTM state between calls."""
+        if isinstance(observation, tuple):
+            observation = observation[0]
+        action, _, self.state = self.step(np.asarray(observation)[None], self.state)
+        return action[0]
+
+    def reset(self):
+        """Forget the recurrent state at the start of an episode."""
+        self.state = None
+
+
+def load_exported_policy(path: Path) -> ExportedPolicy:
+    """Load an exported policy artifact."""
+    return ExportedPolicy(path)
+
+
+def export_checkpoint(
+    checkpoint_path: Path,
+    output_dir: Optional[Path] = None,
+    export_format: str = "torchscript",
+    enzyme_library_path: Optional[str] = None,
+) -> Dict[str, Path]:
+    """Export every role found in a trainer checkpoint directory.
+
+    Args:
+        checkpoint_path: Checkpoint directory
+        output_dir: Destination (defaults to ``checkpoint_path/export``)
+        export_format: "torchscript" or "onnx"
+        enzyme_library_path: Library whose action mask the sink designer was trained with
+
+    Returns:
+        Mapping of role to artifact path
+    """
+    checkpoint_path = Path(checkpoint_path)
+    output_dir = Path(output_dir) if output_dir else checkpoint_path / "export"
+
+    action_mask = None
+    if enzyme_library_path:
+        from ..data.enzyme_library import EnzymeLibrary
+        action_mask = torch.from_numpy(EnzymeLibrary(enzyme_library_path).action_mask())
+
+    exported = {}
+    for role in ROLES:
+        if not (checkpoint_path / f"{role}_agent.pt.gz").exists():
+            continue
+        network = load_policy_network(
+            checkpoint_path, role, action_mask if role == "sink_designer" else None
+        )
+        exported[role] = export_policy(network, role, output_dir / f"{role}_policy", export_format)
+
+    if not exported:
+        raise FileNotFoundError(f"No agent weights found in {checkpoint_path}")
+    return exported
+
+
+def find_exported_policy(checkpoint_path: Path, role: str) -> Optional[Path]:
+    """Exported artifact for a role under ``checkpoint_path/export``, if any."""
+    for suffix in EXPORT_FORMATS.values():
+        path = Path(checkpoint_path) / "export" / f"{role}_policy{suffix}"
+        if path.exists():
+            return path
+    return None
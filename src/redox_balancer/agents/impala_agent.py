@@ -5,11 +5,11 @@ import torch.nn as nn
 import torch.nn.functional as F
 from torch.distributions import Categorical, Normal
 import numpy as np
-from typing import Dict, Tuple, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Tuple, Optional
+from dataclasses import dataclass, field
 import logging
 
-from .networks import ActorCriticNetwork, SinkDesignerNetwork
+from .networks import ActorCriticNetwork, SinkDesignerNetwork, quantize_for_inference
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +22,65 @@ class Trajectory:
     rewards: torch.Tensor
     values: torch.Tensor
     action_log_probs: torch.Tensor
-    hidden_states: Optional[Tuple[torch.Tensor, torch.Tensor]]
+    hidden_states: Optional[Tuple[torch.Tensor, torch.Tensor]]  # Initial (h, c), [layers, batch, hidden]
     dones: torch.Tensor
-    infos: List[Dict]
+    infos: Dict[str, torch.Tensor] = field(default_factory=dict)  # Whitelisted per-step scalars
+    bootstrap_value: Optional[torch.Tensor] = None  # V(s_T) after the last step, [batch]
+
+
+def vtrace_scan(deltas: torch.Tensor, discounts: torch.Tensor, cs: torch.Tensor) -> torch.Tensor:
+    """Reverse discounted scan giving the V-trace corrections v_s - V(x_s).
+    
+    Solves acc_t = deltas_t + discounts_t * cs_t * acc_{t+1} for the whole
+    [B, T] batch at once. With a_t = discounts_t * cs_t, the result is
+    sum_{k >= t} (a_t ... a_{k-1}) * deltas_k; the products are built with a
+    masked cumprod over a [B, T, T] matrix rather than by dividing cumulative
+    products, so zero discounts at episode ends stay exact.
+    
+    Args:
+        deltas: Clipped temporal differences [batch_size, time_steps]
+        discounts: Per-step discounts, zero after episode ends [batch_size, time_steps]
+        cs: Clipped trace coefficients [batch_size, time_steps]
+        
+    Returns:
+        v_s - V(x_s) [batch_size, time_steps]
+    """
+    time_steps = deltas.shape[1]
+    coeffs = discounts * cs
+    upper = torch.ones(time_steps, time_steps, dtype=torch.bool, device=deltas.device).triu()
+    
+    # Row t holds a_j for j >= t and 1 before, so its cumprod is a_t ... a_k
+    factors = torch.where(upper, coeffs.unsqueeze(1), torch.ones_like(coeffs).unsqueeze(1))
+    products = torch.cumprod(factors, dim=-1)
+    # Shift to the exclusive product a_t ... a_{k-1} and drop k < t
+    weights = torch.cat([torch.ones_like(products[..., :1]), products[..., :-1]], dim=-1)
+    weights = weights * upper
+    
+    return torch.einsum('btk,bk->bt', weights, deltas)
+
+
+def allreduce_gradients(parameters) -> None:
+    """Average gradients over the default torch.distributed process group.
+    
+    Gradients are flattened into one buffer so an update costs a single
+    all-reduce. Parameters without a gradient contribute zeros, so every
+    rank reduces a buffer with the same layout.
+    """
+    import torch.distributed as dist
+    
+    params = [p for p in parameters if p.requires_grad]
+    for p in params:
+        if p.grad is None:
+            p.grad = torch.zeros_like(p)
+            
+    flat = torch.cat([p.grad.reshape(-1) for p in params])
+    dist.all_reduce(flat)
+    flat /= dist.get_world_size()
+    
+    offset = 0
+    for p in params:
+        p.grad.copy_(flat[offset:offset + p.numel()].view_as(p))
+        offset += p.numel()
 
 
 class IMPALAAgent:
@@ -45,10 +101,29 @@ class IMPALAAgent:
         rho_bar: float = 1.0,
         c_bar: float = 1.0,
         device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        quantize: bool = False,
+        inference_only: bool = False,
+        distributed: bool = False,
         **network_kwargs
     ):
+        """Create the agent and its policy network.
+        
+        Args:
+            quantize: Act with an int8 dynamic-quantized copy of the policy
+                (CPU actors only); implies inference_only. Learner weights
+                are re-quantized in load_weights.
+            inference_only: Skip the optimizer, for policies that only act
+                on weights received from the learner
+            distributed: Average gradients over the torch.distributed
+                process group before each step (data-parallel learners)
+        """
         self.agent_role = agent_role
         self.device = torch.device(device)
+        self.quantize = quantize
+        self.inference_only = inference_only or quantize
+        self.distributed = distributed
+        if quantize and self.device.type != "cpu":
+            raise ValueError(f"Quantized inference requires a CPU device, got {device}")
         self.discount = discount
         self.entropy_coef = entropy_coef
         self.entropy_coef_decay = entropy_coef_decay
@@ -60,22 +135,26 @@ class IMPALAAgent:
         self.update_count = 0
         
         # Create network based on agent role
-        if agent_role == "sink_designer":
-            self.network = SinkDesignerNetwork(
-                obs_dim=obs_dim,
-                **network_kwargs
-            ).to(self.device)
-        else:
-            self.network = ActorCriticNetwork(
-                obs_dim=obs_dim,
-                action_dim=action_dim,
-                **network_kwargs
-            ).to(self.device)
+        self._network_kwargs = dict(network_kwargs, obs_dim=obs_dim)
+        if agent_role != "sink_designer":
+            self._network_kwargs['action_dim'] = action_dim
+        self.network = self._build_network()
+        
+        if quantize:
+            # Behavior log-probs come from the int8 policy that actually acted,
+            # so V-trace's importance ratios account for the quantization error.
+            # Only the int8 copy is kept; the fp32 network is dropped here.
+            self.network = quantize_for_inference(self.network)
             
-        self.optimizer = torch.optim.Adam(
-            self.network.parameters(),
-            lr=learning_rate
-        )
+        if self.inference_only:
+            self.network.eval()
+            self.network.requires_grad_(False)
+            self.optimizer = None
+        else:
+            self.optimizer = torch.optim.Adam(
+                self.network.parameters(),
+                lr=learning_rate
+            )
         
         # Hidden state for recurrent network
         self.hidden_state = None
@@ -120,46 +199,75 @@ class IMPALAAgent:
             
         return action, info
         
+    def _build_network(self) -> nn.Module:
+        """Fresh fp32 policy network for this agent's role."""
+        if self.agent_role == "sink_designer":
+            return SinkDesignerNetwork(**self._network_kwargs).to(self.device)
+        return ActorCriticNetwork(**self._network_kwargs).to(self.device)
+        
+    def load_weights(self, state_dict: Dict[str, torch.Tensor]):
+        """Load fp32 learner weights into the acting policy.
+        
+        In quantized mode the weights are loaded into a temporary fp32
+        network, which is quantized and then released, so actors only ever
+        hold the int8 copy between reloads.
+        """
+        if not self.quantize:
+            self.network.load_state_dict(state_dict)
+            return
+            
+        network = self._build_network()
+        network.load_state_dict(state_dict)
+        self.network = quantize_for_inference(network).requires_grad_(False)
+        
+    def bootstrap_value(self, observation: np.ndarray) -> float:
+        """Value estimate for an observation without advancing the hidden state."""
+        if isinstance(observation, tuple):
+            observation = observation[0]
+            
+        with torch.no_grad():
+            obs_tensor = torch.FloatTensor(observation).unsqueeze(0).to(self.device)
+            output = self.network(obs_tensor, self.hidden_state)
+            
+        return output['value'].item()
+        
     def _sample_sink_action(
         self,
         output: Dict[str, torch.Tensor],
         deterministic: bool
     ) -> Tuple[np.ndarray, float]:
-        """Sample structured action for sink designer."""
+        """Sample structured action for sink designer.
+        
+        All slots are sampled at once from the [max_enzymes, n] logits and the
+        action plus its log probability leave the device in a single transfer.
+        """
         enzyme_logits = output['enzyme_logits'][0]  # [max_enzymes, n_enzymes]
         copy_numbers = output['copy_numbers'][0]    # [max_enzymes]
         compartment_logits = output['compartment_logits'][0]  # [max_enzymes, n_compartments]
         
-        actions = []
-        log_probs = []
-        
-        for i in range(enzyme_logits.shape[0]):
-            # Sample enzyme
-            if deterministic:
-                enzyme_idx = enzyme_logits[i].argmax().item()
-            else:
-                enzyme_dist = Categorical(logits=enzyme_logits[i])
-                enzyme_idx = enzyme_dist.sample().item()
-                log_probs.append(enzyme_dist.log_prob(torch.tensor(enzyme_idx).to(enzyme_logits.device)))
-                
-            # Copy number (continuous, clipped to [1, 8])
-            copy_num = copy_numbers[i].item()
-            copy_num = max(1, min(8, int(copy_num + 0.5)))
-            
-            # Sample compartment
-            if deterministic:
-                comp_idx = compartment_logits[i].argmax().item()
-            else:
-                comp_dist = Categorical(logits=compartment_logits[i])
-                comp_idx = comp_dist.sample().item()
-                log_probs.append(comp_dist.log_prob(torch.tensor(comp_idx).to(compartment_logits.device)))
-                
-            actions.extend([enzyme_idx, copy_num, comp_idx])
+        if deterministic:
+            enzyme_idx = enzyme_logits.argmax(dim=-1)
+            compartment_logits = self.network.mask_compartment_logits(compartment_logits, enzyme_idx)
+            comp_idx = compartment_logits.argmax(dim=-1)
+            log_prob = torch.zeros(1, device=enzyme_logits.device)
+        else:
+            enzyme_dist = Categorical(logits=enzyme_logits)
+            enzyme_idx = enzyme_dist.sample()
+            # Compartment is drawn among those allowed for the chosen enzyme
+            comp_dist = Categorical(
+                logits=self.network.mask_compartment_logits(compartment_logits, enzyme_idx)
+            )
+            comp_idx = comp_dist.sample()
+            log_prob = (enzyme_dist.log_prob(enzyme_idx) + comp_dist.log_prob(comp_idx)).sum().view(1)
             
-        action = np.array(actions, dtype=np.float32)
-        total_log_prob = sum(log_probs).item() if log_probs else 0.0
+        # Copy number (continuous, rounded and clipped to [1, 8])
+        copy_num = torch.floor(copy_numbers + 0.5).clamp(1, 8)
         
-        return action, total_log_prob
+        # [enzyme, copies, compartment] per slot, flattened, with the log prob appended
+        action = torch.stack([enzyme_idx.float(), copy_num, comp_idx.float()], dim=-1).view(-1)
+        host = torch.cat([action, log_prob.float()]).cpu().numpy()
+        
+        return host[:-1], float(host[-1])
         
     def compute_vtrace_loss(
         self,
@@ -182,19 +290,19 @@ class IMPALAAgent:
         
         batch_size, time_steps = rewards.shape
         
-        # Forward pass through network - reshape for batch processing
-        obs_flat = observations.view(-1, observations.shape[-1])
-        output = self.network(obs_flat)
+        # Unroll the recurrent policy over [batch, time] from the actors' initial state
+        hidden_states = None
+        if trajectory.hidden_states is not None:
+            hidden_states = tuple(h.to(self.device) for h in trajectory.hidden_states)
+        output = self.network.unroll(observations, hidden_states, dones)
         
-        policy_logits = output['action_logits'].view(batch_size, time_steps, -1)
-        values_pred = output['value'].view(batch_size, time_steps)
+        policy_logits = output['action_logits']
+        values_pred = output['value']
         
         # Compute current policy log probabilities
         if self.agent_role == "sink_designer":
-            # For sink designer, treat as continuous actions for simplicity
-            # TODO: Implement structured action log probs
-            action_dist = Normal(torch.tanh(policy_logits), 0.1)
-            policy_logprobs = action_dist.log_prob(actions).sum(dim=-1)
+            # Same structured distribution the actors sample from
+            policy_logprobs = self._compute_sink_logprobs(output, actions)
         else:
             # Continuous actions with tanh squashing
             action_dist = Normal(torch.tanh(policy_logits), 0.1)
@@ -212,33 +320,37 @@ class IMPALAAgent:
             clipped_rhos = torch.minimum(rhos, torch.tensor(self.rho_bar))
             cs = torch.minimum(rhos, torch.tensor(self.c_bar))
             
-        # Compute V-trace targets (excluding last timestep for deltas)
-        deltas = clipped_rhos[:, :-1] * (rewards[:, :-1] + self.discount * values[:, 1:] * (1 - dones[:, 1:]) - values[:, :-1])
-        
-        # Compute V-trace target recursively
-        vtrace_targets = torch.zeros_like(values)
-        # Bootstrap from the final value with the final TD error
-        if time_steps > 1:
-            # Use the predicted value for the last timestep plus any remaining advantage
-            vtrace_targets[:, -1] = values_pred[:, -1]
-        
-        for t in reversed(range(time_steps - 1)):
-            vtrace_targets[:, t] = values[:, t] + deltas[:, t] + \
-                self.discount * cs[:, t] * (vtrace_targets[:, t + 1] - values[:, t + 1]) * (1 - dones[:, t + 1])
+        # Bootstrap from the value after the segment when the actor shipped it,
+        # otherwise the last recorded step only serves as the bootstrap
+        if trajectory.bootstrap_value is not None:
+            bootstrap = trajectory.bootstrap_value.to(self.device).view(batch_size)
+            n_steps = time_steps
+        else:
+            bootstrap = values[:, -1]
+            n_steps = time_steps - 1
+            
+        values_t = values[:, :n_steps]
+        next_values = torch.cat([values[:, 1:n_steps], bootstrap.unsqueeze(1)], dim=1)
+        # dones[t] marks an episode boundary right after step t
+        discounts = self.discount * (1 - dones[:, :n_steps])
+        
+        deltas = clipped_rhos[:, :n_steps] * (rewards[:, :n_steps] + discounts * next_values - values_t)
+        
+        vtrace_targets = values_t + vtrace_scan(deltas, discounts, cs[:, :n_steps])
                 
-        # Compute losses (exclude last timestep)
-        value_loss = 0.5 * F.mse_loss(values_pred[:, :-1], vtrace_targets[:, :-1].detach())
+        # Compute losses
+        value_loss = 0.5 * F.mse_loss(values_pred[:, :n_steps], vtrace_targets.detach())
         
         # Policy gradient loss with V-trace advantages
-        advantages = (vtrace_targets[:, :-1] - values_pred[:, :-1]).detach()
-        policy_loss = -(policy_logprobs[:, :-1] * advantages).mean()
+        advantages = (vtrace_targets - values_pred[:, :n_steps]).detach()
+        policy_loss = -(policy_logprobs[:, :n_steps] * advantages).mean()
         
         # Entropy bonus
         if self.agent_role == "sink_designer":
-            entropy = self._compute_sink_entropy(output)
+            entropy = self._compute_sink_entropy(output, actions)
         else:
             # For continuous actions, compute entropy from the distribution
-            entropy = action_dist.entropy()[:, :-1].mean()
+            entropy = action_dist.entropy()[:, :n_steps].mean()
             
         # Total loss
         total_loss = policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy
@@ -256,47 +368,66 @@ class IMPALAAgent:
         output: Dict[str, torch.Tensor],
         actions: torch.Tensor
     ) -> torch.Tensor:
-        """Compute log probabilities for structured sink designer actions."""
-        batch_size, time_steps, action_dim = actions.shape
-        enzyme_logits = output['enzyme_logits']
-        compartment_logits = output['compartment_logits']
-        
-        log_probs = []
+        """Compute log probabilities for structured sink designer actions.
         
-        for t in range(time_steps):
-            step_log_probs = []
-            action_t = actions[:, t, :].view(batch_size, -1, 3)  # [batch, max_enzymes, 3]
+        Args:
+            output: Network outputs with logits shaped [batch, time, max_enzymes, n]
+            actions: Flattened actions [batch, time, max_enzymes * 3]
             
-            for i in range(action_t.shape[1]):
-                enzyme_idx = action_t[:, i, 0].long()
-                comp_idx = action_t[:, i, 2].long()
-                
-                # Enzyme log prob
-                enzyme_dist = Categorical(logits=enzyme_logits[:, i, :])
-                step_log_probs.append(enzyme_dist.log_prob(enzyme_idx))
-                
-                # Compartment log prob
-                comp_dist = Categorical(logits=compartment_logits[:, i, :])
-                step_log_probs.append(comp_dist.log_prob(comp_idx))
-                
-            log_probs.append(torch.stack(step_log_probs, dim=1).sum(dim=1))
-            
-        return torch.stack(log_probs, dim=1)
+        Returns:
+            Summed enzyme and compartment log probabilities [batch, time]
+        """
+        batch_size, time_steps, _ = actions.shape
+        slots = actions.view(batch_size, time_steps, -1, 3)  # [batch, time, max_enzymes, 3]
+        enzyme_idx = slots[..., 0].long().unsqueeze(-1)
+        comp_idx = slots[..., 2].long().unsqueeze(-1)
+        
+        compartment_logits = self.network.mask_compartment_logits(
+            output['compartment_logits'], enzyme_idx.squeeze(-1)
+        )
+        enzyme_log_probs = F.log_softmax(output['enzyme_logits'], dim=-1).gather(-1, enzyme_idx)
+        comp_log_probs = F.log_softmax(compartment_logits, dim=-1).gather(-1, comp_idx)
+        
+        return (enzyme_log_probs + comp_log_probs).squeeze(-1).sum(dim=-1)
+        
+    def _compute_sink_entropy(
+        self,
+        output: Dict[str, torch.Tensor],
+        actions: torch.Tensor
+    ) -> torch.Tensor:
+        """Compute entropy for structured sink designer actions.
+        
+        The compartment entropy is that of the masked distribution given each
+        slot's chosen enzyme, so probability on compartments the enzyme can
+        never be targeted to earns no bonus.
+        """
+        batch_size, time_steps, _ = actions.shape
+        enzyme_idx = actions.view(batch_size, time_steps, -1, 3)[..., 0].long()
         
-    def _compute_sink_entropy(self, output: Dict[str, torch.Tensor]) -> torch.Tensor:
-        """Compute entropy for structured sink designer actions."""
         enzyme_dist = Categorical(logits=output['enzyme_logits'])
-        comp_dist = Categorical(logits=output['compartment_logits'])
+        comp_dist = Categorical(logits=self.network.mask_compartment_logits(
+            output['compartment_logits'], enzyme_idx
+        ))
         
         return enzyme_dist.entropy().mean() + comp_dist.entropy().mean()
         
+    def count_invalid_slots(self, action: np.ndarray) -> int:
+        """Count enzyme slots of a sink designer action that the enzyme library rules out."""
+        slots = torch.as_tensor(action).view(-1, 3).long().to(self.device)
+        return self.network.count_invalid_slots(slots[:, 0], slots[:, 2])
+        
     def update(self, trajectory: Trajectory, behavior_policy_logprobs: torch.Tensor, 
                current_step: int = None, total_steps: int = None):
         """Update agent using V-trace with optional entropy annealing."""
+        if self.optimizer is None:
+            raise RuntimeError(f"{self.agent_role} agent is inference only and cannot be updated")
+            
         losses = self.compute_vtrace_loss(trajectory, behavior_policy_logprobs)
         
         self.optimizer.zero_grad()
         losses['total_loss'].backward()
+        if self.distributed:
+            allreduce_gradients(self.network.parameters())
         
         # Gradient clipping
         nn.utils.clip_grad_norm_(self.network.parameters(), self.max_grad_norm)
@@ -327,7 +458,7 @@ class IMPALAAgent:
         """Save agent state."""
         torch.save({
             'network_state_dict': self.network.state_dict(),
-            'optimizer_state_dict': self.optimizer.state_dict(),
+            'optimizer_state_dict': self.optimizer.state_dict() if self.optimizer is not None else None,
             'agent_role': self.agent_role,
         }, path)
         
@@ -339,16 +470,17 @@ class IMPALAAgent:
             # Load compressed checkpoint
             with gzip.open(path, 'rb') as f:
                 state_dict = torch.load(f, map_location=self.device)
-            self.network.load_state_dict(state_dict)
+            self.load_weights(state_dict)
         else:
             # Load regular checkpoint
             checkpoint = torch.load(path, map_location=self.device)
             if 'network_state_dict' in checkpoint:
-                self.network.load_state_dict(checkpoint['network_state_dict'])
-                self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+                self.load_weights(checkpoint['network_state_dict'])
+                if self.optimizer is not None:
+                    self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
             else:
                 # Just state dict
-                self.network.load_state_dict(checkpoint)
+                self.load_weights(checkpoint)
         
     def reset_hidden_state(self):
         """Reset LSTM hidden state."""
@@ -72,6 +72,18 @@ class ActorCriticNetwork(nn.Module):
                     elif 'bias' in name:
                         nn.init.constant_(param, 0)
                         
+    def initial_state(
+        self,
+        batch_size: int,
+        device: Optional[torch.device] = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Zero LSTM state (h, c) for a batch of sequences."""
+        shape = (self.lstm.num_layers, batch_size, self.hidden_dim)
+        return (
+            torch.zeros(shape, device=device),
+            torch.zeros(shape, device=device),
+        )
+        
     def forward(
         self,
         obs: torch.Tensor,
@@ -92,6 +104,21 @@ class ActorCriticNetwork(nn.Module):
                 - 'value': State value estimate
                 - 'hidden_state': Updated LSTM state
         """
+        features, new_hidden = self.encode(obs, hidden_state, sequence_length)
+        return self._heads(features, new_hidden)
+        
+    def encode(
+        self,
+        obs: torch.Tensor,
+        hidden_state: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+        sequence_length: Optional[int] = None,
+    ) -> Tuple[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]:
+        """Shared trunk: embedding + LSTM, run once per forward pass.
+        
+        Returns:
+            features: Trunk output used by every head [batch_size, hidden_dim]
+            hidden_state: Updated LSTM state (h, c)
+        """
         # Handle both sequential and non-sequential inputs
         if obs.dim() == 2:
             obs = obs.unsqueeze(1)  # Add sequence dimension
@@ -103,9 +130,7 @@ class ActorCriticNetwork(nn.Module):
         
         # Pass through LSTM
         if hidden_state is None:
-            h0 = torch.zeros(self.lstm.num_layers, batch_size, self.hidden_dim).to(obs.device)
-            c0 = torch.zeros(self.lstm.num_layers, batch_size, self.hidden_dim).to(obs.device)
-            hidden_state = (h0, c0)
+            hidden_state = self.initial_state(batch_size, obs.device)
             
         lstm_out, new_hidden = self.lstm(embedded, hidden_state)
         
@@ -119,6 +144,68 @@ class ActorCriticNetwork(nn.Module):
         else:
             features = lstm_out[:, -1, :]
             
+        return features, new_hidden
+        
+    def unroll(
+        self,
+        obs: torch.Tensor,
+        hidden_state: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+        dones: Optional[torch.Tensor] = None,
+    ) -> Dict[str, torch.Tensor]:
+        """Run whole [batch, time] sequences and return outputs for every step.
+        
+        The embedding runs once over all B*T observations and the LSTM runs
+        as one sequence op from the recorded initial state. Where a sequence
+        finished an episode (dones[b, t] == 1) its state is zeroed before
+        step t + 1, matching the actor's reset; the LSTM call is only split
+        at those boundaries.
+        
+        Args:
+            obs: Observations [batch_size, seq_len, obs_dim]
+            hidden_state: LSTM state (h, c) at the first step, zeros if None
+            dones: Episode-end flags [batch_size, seq_len]
+            
+        Returns:
+            Same keys as forward, with outputs shaped [batch_size, seq_len, ...]
+            and 'hidden_state' holding the state after the last step
+        """
+        batch_size, seq_len, _ = obs.shape
+        embedded = self.metabolite_embed(obs)
+        
+        if hidden_state is None:
+            hidden_state = self.initial_state(batch_size, obs.device)
+            
+        # Steps at which at least one sequence starts a new episode
+        boundaries = []
+        if dones is not None and seq_len > 1:
+            boundaries = (dones[:, :-1].bool().any(dim=0).nonzero().flatten() + 1).tolist()
+            
+        h, c = hidden_state
+        outputs = []
+        start = 0
+        for end in boundaries + [seq_len]:
+            lstm_out, (h, c) = self.lstm(embedded[:, start:end], (h, c))
+            outputs.append(lstm_out)
+            if end < seq_len:
+                keep = (1 - dones[:, end - 1]).view(1, batch_size, 1)
+                h = h * keep
+                c = c * keep
+            start = end
+            
+        features = torch.cat(outputs, dim=1).reshape(batch_size * seq_len, -1)
+        output = self._heads(features, (h, c))
+        
+        return {
+            key: value if key == 'hidden_state' else value.view(batch_size, seq_len, *value.shape[1:])
+            for key, value in output.items()
+        }
+        
+    def _heads(
+        self,
+        features: torch.Tensor,
+        hidden_state: Tuple[torch.Tensor, torch.Tensor],
+    ) -> Dict[str, torch.Tensor]:
+        """Apply the output heads to trunk features."""
         # Compute policy and value
         action_logits = self.actor_head(features)
         value = self.critic_head(features).squeeze(-1)
@@ -126,7 +213,7 @@ class ActorCriticNetwork(nn.Module):
         return {
             'action_logits': action_logits,
             'value': value,
-            'hidden_state': new_hidden,
+            'hidden_state': hidden_state,
         }
 
 
@@ -140,8 +227,15 @@ class SinkDesignerNetwork(ActorCriticNetwork):
         n_compartments: int = 3,  # c, m, p
         max_enzymes_per_construct: int = 4,
         hidden_dim: int = 256,
+        action_mask: Optional[torch.Tensor] = None,
         **kwargs
     ):
+        """Build the trunk plus enzyme, copy-number and compartment heads.
+        
+        Args:
+            action_mask: Valid (enzyme, compartment) pairs [n_enzymes, n_compartments],
+                e.g. from EnzymeLibrary.action_mask(); every pair is allowed if None
+        """
         # Action dim = enzyme selection + copy numbers + compartments
         action_dim = max_enzymes_per_construct * (1 + 1 + 1)
         super().__init__(obs_dim, action_dim, hidden_dim, **kwargs)
@@ -169,31 +263,52 @@ class SinkDesignerNetwork(ActorCriticNetwork):
             nn.Linear(hidden_dim // 2, n_compartments * max_enzymes_per_construct),
         )
         
-    def forward(
+        # Not persisted: it is rebuilt from the enzyme library, so checkpoints stay loadable
+        if action_mask is None:
+            action_mask = torch.ones(n_enzymes, n_compartments, dtype=torch.bool)
+        action_mask = torch.as_tensor(action_mask, dtype=torch.bool)
+        if action_mask.shape != (n_enzymes, n_compartments):
+            raise ValueError(
+                f"Action mask shape {tuple(action_mask.shape)} does not match "
+                f"({n_enzymes}, {n_compartments})"
+            )
+        self.register_buffer('action_mask', action_mask, persistent=False)
+        
+    def mask_compartment_logits(
         self,
-        obs: torch.Tensor,
-        hidden_state: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
-        sequence_length: Optional[int] = None,
-    ) -> Dict[str, torch.Tensor]:
-        """Forward pass with structured action outputs for sink designer."""
-        # Get base features
-        base_out = super().forward(obs, hidden_state, sequence_length)
+        compartment_logits: torch.Tensor,
+        enzyme_idx: torch.Tensor,
+    ) -> torch.Tensor:
+        """Rule out compartments the chosen enzyme cannot be targeted to.
         
-        # Extract features for specialized heads
-        if obs.dim() == 2:
-            obs = obs.unsqueeze(1)
-            
-        batch_size = obs.shape[0]
+        Args:
+            compartment_logits: Logits [..., n_compartments]
+            enzyme_idx: Chosen enzyme per slot, shaped like the logits' leading dims
+        """
+        valid = self.action_mask[enzyme_idx]
+        return compartment_logits.masked_fill(~valid, torch.finfo(compartment_logits.dtype).min)
         
-        # Get LSTM features
-        embedded = self.metabolite_embed(obs)
-        lstm_out, _ = self.lstm(embedded, hidden_state)
-        features = lstm_out[:, -1, :]
+    def count_invalid_slots(self, enzyme_idx: torch.Tensor, compartment_idx: torch.Tensor) -> int:
+        """Number of (enzyme, compartment) picks the library does not allow."""
+        return int((~self.action_mask[enzyme_idx, compartment_idx]).sum())
+        
+    def _heads(
+        self,
+        features: torch.Tensor,
+        hidden_state: Tuple[torch.Tensor, torch.Tensor],
+    ) -> Dict[str, torch.Tensor]:
+        """Base heads plus structured action heads, all sharing one trunk pass."""
+        base_out = super()._heads(features, hidden_state)
+        batch_size = features.shape[0]
         
         # Compute specialized actions
         enzyme_logits = self.enzyme_selector(features).view(
             batch_size, self.max_enzymes, self.n_enzymes
         )
+        # Enzymes with no allowed compartment are never sampled
+        enzyme_logits = enzyme_logits.masked_fill(
+            ~self.action_mask.any(dim=-1), torch.finfo(enzyme_logits.dtype).min
+        )
         copy_numbers = torch.sigmoid(self.copy_number_head(features)) * 8  # 0-8 copies
         compartment_logits = self.compartment_head(features).view(
             batch_size, self.max_enzymes, self.n_compartments
@@ -204,4 +319,17 @@ class SinkDesignerNetwork(ActorCriticNetwork):
             'enzyme_logits': enzyme_logits,
             'copy_numbers': copy_numbers,
             'compartment_logits': compartment_logits,
-        }
\ No newline at end of file
+        }
+
+
+def quantize_for_inference(network: nn.Module) -> nn.Module:
+    """Int8 dynamic-quantized copy of a policy network for CPU inference.
+    
+    Linear and LSTM weights are stored as int8 and activations are quantized
+    on the fly; LayerNorm and buffers (e.g. the sink designer's action mask)
+    stay fp32. The copy keeps the network's class, so forward, unroll and
+    the masking helpers work unchanged, but it cannot be trained.
+    """
+    from torch.ao.quantization import quantize_dynamic
+    
+    return quantize_dynamic(network.eval(), {nn.Linear, nn.LSTM}, dtype=torch.qint8)
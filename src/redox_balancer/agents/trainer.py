@@ -3,24 +3,76 @@
 import ray
 import torch
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import time
 import logging
 from collections import deque
 from dataclasses import dataclass, field
 import json
 import os
+import random
 import shutil
 from pathlib import Path
 
 from ..env.redox_env import RedoxBalancerEnv
 from ..cache.delta_cache import DeltaCache
-from .impala_agent import IMPALAAgent, Trajectory
+from ..data.enzyme_library import EnzymeLibrary
+from .impala_agent import IMPALAAgent
+from .trajectory_buffer import TrajectoryBuffer, unpack_trajectory
 from .networks import ActorCriticNetwork, SinkDesignerNetwork
-from ..utils import TensorBoardLogger
+from ..utils import AsyncCheckpointWriter, TensorBoardLogger
+from ..utils.checkpoint import (
+    load_compressed,
+    snapshot_state,
+    write_checkpoint_files,
+    write_environment_manifest,
+)
 
 logger = logging.getLogger(__name__)
 
+# Data-parallel learner rounds allowed in flight before the trainer waits on the oldest
+MAX_PENDING_LEARNER_ROUNDS = 2
+
+
+def sink_network_kwargs(enzyme_library_path: str) -> Dict:
+    """Sink designer network sizing and action mask taken from the enzyme library."""
+    library = EnzymeLibrary(enzyme_library_path)
+    return {
+        'n_enzymes': len(library),
+        'action_mask': torch.from_numpy(library.action_mask()),
+    }
+
+
+def build_learner_agents(
+    config: 'TrainingConfig',
+    obs_dim: int,
+    action_dim: int,
+    device: str,
+    distributed: bool = False,
+) -> Dict[str, IMPALAAgent]:
+    """Trainable agents for both roles with the learner's hyperparameters."""
+    return {
+        'tumor': IMPALAAgent(
+            agent_role="tumor",
+            obs_dim=obs_dim,
+            action_dim=action_dim,
+            learning_rate=config.learning_rate,
+            device=device,
+            entropy_coef_decay=0.997,     # slower decay
+            min_entropy_coef=0.005,       # higher floor
+            distributed=distributed,
+        ),
+        'sink_designer': IMPALAAgent(
+            agent_role="sink_designer",
+            obs_dim=obs_dim,
+            action_dim=action_dim,
+            learning_rate=config.learning_rate,
+            device=device,
+            distributed=distributed,
+            **sink_network_kwargs(config.enzyme_library_path),
+        ),
+    }
+
 
 @dataclass
 class TrainingConfig:
@@ -32,12 +84,19 @@ class TrainingConfig:
     # Actor settings
     num_actors: int = 100
     actor_device: str = "cpu"
+    actor_quantize: bool = False  # Int8 dynamic-quantized policies on CPU actors
     
     # Learner settings
     learner_device: str = "cuda"
     batch_size: int = 32
+    num_learners: int = 1  # >1 shards updates over data-parallel CPU learners (gloo)
+    learner_num_cpus: int = 4  # Torch threads, and Ray CPUs, per learner process
     trajectory_length: int = 80
     
+    # Trajectory transport
+    trajectory_obs_dtype: str = "float32"  # "float16" halves observation traffic
+    trajectory_info_keys: Tuple[str, ...] = ("growth_rate", "sink_flux")
+    
     # Training settings
     total_timesteps: int = 10_000_000
     learning_rate: float = 3e-4
@@ -57,12 +116,21 @@ class TrainingConfig:
     ray_num_cpus: Optional[int] = None
     ray_num_gpus: Optional[int] = None
     
+    # Actor memory watchdog
+    actor_memory_limit_gb: float = 14.0  # Drain and replace actors above this RSS
+    memory_check_interval: int = 60_000
+    
+    # Fault tolerance
+    max_actor_failures: int = 100  # Abort once this many rollouts have failed
+    max_learner_failures: int = 3  # Abort once the learner group has failed this many times
+    
     # Logging
     log_interval: int = 1000
     checkpoint_dir: str = "./checkpoints"
+    checkpoint_compress_level: int = 1  # gzip level; 1 favours speed over size
     
 
-@ray.remote
+@ray.remote(concurrency_groups={"monitor": 1})
 class ActorWorker:
     """Ray actor that runs environment rollouts."""
     
@@ -98,128 +166,254 @@ class ActorWorker:
         
         # Create local agent copy
         obs_dim = self.env.observation_space.shape[0]
-        action_dim = self.env.action_space.shape[0]
+        self.sink_kwargs = sink_network_kwargs(config.enzyme_library_path)
         
-        self.agent = IMPALAAgent(
-            agent_role=agent_role,
-            obs_dim=obs_dim,
-            action_dim=action_dim,
-            device=config.actor_device,
-        )
+        self.agent = self._build_agent(agent_role)
         
-        # Opponent agent for self-play
-        opponent_role = "tumor" if agent_role == "sink_designer" else "sink_designer"
-        self.opponent = IMPALAAgent(
-            agent_role=opponent_role,
+        # Preallocated staging buffer reused for every unroll segment
+        self.buffer = TrajectoryBuffer(
+            capacity=config.trajectory_length,
             obs_dim=obs_dim,
-            action_dim=action_dim,
-            device=config.actor_device,
+            action_dim=self.agent.network.action_dim,
+            info_keys=config.trajectory_info_keys,
+            obs_dtype=config.trajectory_obs_dtype,
+            lstm_layers=self.agent.network.lstm.num_layers,
+            hidden_dim=self.agent.network.hidden_dim,
         )
         
+        # Episode in progress; the env persists across segments
+        self.obs = None
+        self.episode_return = 0.0
+        self.episode_length = 0
+        
         self.num_episodes = 0
         self.num_timesteps = 0
         
+    def _build_agent(self, role: str) -> IMPALAAgent:
+        """Inference-only policy for this actor; the learner owns the optimizers."""
+        return IMPALAAgent(
+            agent_role=role,
+            obs_dim=self.env.observation_space.shape[0],
+            action_dim=self.env.action_space.shape[0],
+            device=self.config.actor_device,
+            quantize=self.config.actor_quantize,
+            inference_only=True,
+            **(self.sink_kwargs if role == "sink_designer" else {}),
+        )
+        
     def get_num_episodes(self) -> int:
         """Return current episode count."""
         return self.num_episodes
         
-    def run_episode(self, learner_weights: Dict[str, bytes]) -> Dict:
-        """Run a single episode and return trajectory."""
-        # Update network weights from learner
-        self._update_weights(learner_weights)
+    @ray.method(concurrency_group="monitor")
+    def get_memory_usage(self) -> Dict:
+        """Report this actor's resident memory.
+        
+        Runs in its own concurrency group so the watchdog can sample an
+        actor while it is in the middle of a rollout.
+        """
+        import psutil
+        
+        return {
+            'worker_id': self.worker_id,
+            'pid': os.getpid(),
+            'rss_gb': psutil.Process().memory_info().rss / 1e9,
+        }
         
-        # Reset environment and agents
-        obs, _ = self.env.reset()  # Unpack tuple
+    def _start_episode(self):
+        """Reset the environment and recurrent state for a new episode."""
+        self.obs, _ = self.env.reset()  # Unpack tuple
         self.agent.reset_hidden_state()
-        self.opponent.reset_hidden_state()
+        self.episode_return = 0.0
+        self.episode_length = 0
         
-        # Storage for trajectory
-        observations = []
-        actions = []
-        rewards = []
-        values = []
-        action_log_probs = []
-        dones = []
-        infos = []
+    def run_segment(self, learner_weights: Dict[str, bytes]) -> Dict:
+        """Run a fixed-length unroll segment, continuing the current episode.
         
+        The env is only reset when an episode actually terminates, so a
+        segment may span an episode boundary (marked in its dones) and the
+        next segment picks up where this one stopped.
+        """
+        # Update network weights from learner
+        self._update_weights(learner_weights)
+        
+        if self.obs is None:
+            self._start_episode()
+            
+        # Segment starts from the policy's current recurrent state
+        self.buffer.reset(initial_hidden=self.agent.hidden_state)
+        
+        completed_episodes = []
         done = False
-        episode_return = 0
-        episode_length = 0
+        invalid_slots = 0
         
-        while not done and episode_length < self.config.trajectory_length:
+        for _ in range(self.config.trajectory_length):
             # Agent action - environment is always for our agent role
-            action, info = self.agent.act(obs, deterministic=False)
-            active_agent = self.agent
+            action, info = self.agent.act(self.obs, deterministic=False)
+            if self.agent_role == "sink_designer":
+                invalid_slots += self.agent.count_invalid_slots(action)
                 
             # Step environment
             next_obs, reward, terminated, truncated, env_info = self.env.step(action)
             done = terminated or truncated
             
             # Store trajectory data
-            observations.append(obs)
-            actions.append(action)
-            rewards.append(reward)
-            values.append(info['value'])
-            action_log_probs.append(info['log_prob'])
-            dones.append(done)
-            infos.append(env_info)
+            self.buffer.add(
+                self.obs, action, reward, info['value'], info['log_prob'], done, env_info
+            )
                 
-            episode_return += reward
-            episode_length += 1
-            obs = next_obs
-            
-        self.num_episodes += 1
-        self.num_timesteps += episode_length
-        
-        # Memory cleanup - avoid returning large objects
-        import gc
-        del self.env.model  # Will be recreated on next reset
-        gc.collect()
-        
-        # Convert to tensors with batch dimension
-        trajectory = Trajectory(
-            observations=torch.FloatTensor(np.array(observations)).unsqueeze(0),  # Add batch dim
-            actions=torch.FloatTensor(np.array(actions)).unsqueeze(0),
-            rewards=torch.FloatTensor(np.array(rewards)).unsqueeze(0),
-            values=torch.FloatTensor(np.array(values)).unsqueeze(0),
-            action_log_probs=torch.FloatTensor(np.array(action_log_probs)).unsqueeze(0),
-            hidden_states=None,  # TODO: Add LSTM states
-            dones=torch.FloatTensor(np.array(dones)).unsqueeze(0),
-            infos=infos,
-        )
-        
-        return {
-            'trajectory': trajectory,
-            'episode_return': episode_return,
-            'episode_length': episode_length,
+            self.episode_return += reward
+            self.episode_length += 1
+            self.num_timesteps += 1
+            
+            if done:
+                self.num_episodes += 1
+                completed_episodes.append(self._episode_summary(env_info))
+                self._start_episode()
+            else:
+                self.obs = next_obs
+                
+        # V(s_T) for the learner; masked out when the segment ended an episode
+        if not done:
+            self.buffer.set_bootstrap_value(self.agent.bootstrap_value(self.obs))
+            
+        result = {
+            # Single contiguous buffer; Ray stores it in the object store without pickling
+            'trajectory': self.buffer.pack(),
+            'segment_length': self.buffer.length,
+            'episodes': completed_episodes,
             'worker_id': self.worker_id,
             'num_episodes': self.num_episodes,
             'num_timesteps': self.num_timesteps,
         }
+        if self.agent_role == "sink_designer":
+            # Should stay at zero while the library's action mask is applied
+            n_slots = self.buffer.length * self.agent.network.max_enzymes
+            result['invalid_action_rate'] = invalid_slots / max(n_slots, 1)
+        return result
         
-    def _update_weights(self, weights: Dict[str, bytes]):
-        """Update agent weights from learner."""
+    def _episode_summary(self, env_info: Dict) -> Dict:
+        """Episode metrics, plus whitelisted scalars from the final step's info."""
+        summary = {
+            'episode_return': self.episode_return,
+            'episode_length': self.episode_length,
+        }
+        for key in self.config.trajectory_info_keys:
+            if key in env_info:
+                try:
+                    summary[key] = float(env_info[key])
+                except (TypeError, ValueError):
+                    pass
+        return summary
+        
+    def _load_state_dict(self, blob) -> Dict[str, torch.Tensor]:
+        """Deserialize learner weights, fetching them first if published by reference."""
         import io
         
-        # Update main agent
+        if isinstance(blob, ray.ObjectRef):
+            blob = ray.get(blob)
+        return torch.load(io.BytesIO(blob), map_location=self.config.actor_device)
+        
+    def _update_weights(self, weights: Dict[str, bytes]):
+        """Update agent weights from learner.
+        
+        Values are serialized state dicts, or object refs to them when the
+        weights were published by a data-parallel learner.
+        """
         if self.agent_role in weights:
-            buffer = io.BytesIO(weights[self.agent_role])
-            state_dict = torch.load(buffer, map_location=self.config.actor_device)
-            self.agent.network.load_state_dict(state_dict)
-            
-        # Update opponent
-        opponent_role = "tumor" if self.agent_role == "sink_designer" else "sink_designer"
-        if opponent_role in weights:
-            buffer = io.BytesIO(weights[opponent_role])
-            state_dict = torch.load(buffer, map_location=self.config.actor_device)
-            # Only load if architectures match (same action dim)
-            try:
-                self.opponent.network.load_state_dict(state_dict)
-            except RuntimeError as e:
-                if "size mismatch" in str(e):
-                    logger.debug(f"Skipping opponent weight update due to architecture mismatch: {e}")
-                else:
-                    raise
+            self.agent.load_weights(self._load_state_dict(weights[self.agent_role]))
+
+
+@ray.remote
+class LearnerWorker:
+    """One rank of a data-parallel learner.
+    
+    Every rank holds a full copy of both agents. The trainer hands each rank
+    a different trajectory of the same role per round; gradients are
+    averaged with a gloo all-reduce, so all ranks take identical optimizer
+    steps and stay in sync. Rank 0 publishes the weights.
+    """
+    
+    def __init__(
+        self,
+        rank: int,
+        world_size: int,
+        config: TrainingConfig,
+        obs_dim: int,
+        action_dim: int,
+    ):
+        torch.set_num_threads(config.learner_num_cpus)
+        self.rank = rank
+        self.world_size = world_size
+        self.config = config
+        self.agents = build_learner_agents(config, obs_dim, action_dim, device="cpu", distributed=True)
+        
+    def get_address(self) -> Tuple[str, int]:
+        """Node IP and a free port for the process group rendezvous."""
+        import socket
+        
+        with socket.socket() as sock:
+            sock.bind(("", 0))
+            port = sock.getsockname()[1]
+        return ray.util.get_node_ip_address(), port
+        
+    def init_process_group(self, master_addr: str, master_port: int):
+        """Join the gloo process group and take rank 0's initial parameters."""
+        import torch.distributed as dist
+        
+        dist.init_process_group(
+            backend="gloo",
+            init_method=f"tcp://{master_addr}:{master_port}",
+            rank=self.rank,
+            world_size=self.world_size,
+        )
+        for agent in self.agents.values():
+            for param in agent.network.parameters():
+                dist.broadcast(param.data, src=0)
+                
+    def update(self, role: str, packed_trajectory: np.ndarray, current_step: int) -> Dict[str, float]:
+        """Take one synchronized V-trace step on this rank's share of the round."""
+        trajectory = unpack_trajectory(packed_trajectory, self.config.trajectory_info_keys)
+        return self.agents[role].update(
+            trajectory,
+            trajectory.action_log_probs,
+            current_step=current_step,
+            total_steps=self.config.total_timesteps,
+        )
+        
+    def get_weights(self, role: str) -> bytes:
+        """Serialized network weights for actors."""
+        import io
+        
+        buffer = io.BytesIO()
+        torch.save(self.agents[role].network.state_dict(), buffer)
+        return buffer.getvalue()
+        
+    def get_state(self) -> Dict:
+        """Weights, optimizer state and entropy schedule of both agents."""
+        return {
+            role: {
+                'network': agent.network.state_dict(),
+                'optimizer': agent.optimizer.state_dict(),
+                'entropy_coef': agent.entropy_coef,
+                'update_count': agent.update_count,
+            }
+            for role, agent in self.agents.items()
+        }
+        
+    def set_state(self, state: Dict):
+        """Apply state from get_state (e.g. a resumed checkpoint)."""
+        for role, agent in self.agents.items():
+            agent.network.load_state_dict(state[role]['network'])
+            agent.optimizer.load_state_dict(state[role]['optimizer'])
+            agent.entropy_coef = state[role]['entropy_coef']
+            agent.update_count = state[role]['update_count']
+            
+    def shutdown(self):
+        import torch.distributed as dist
+        
+        if dist.is_initialized():
+            dist.destroy_process_group()
 
 
 class IMPALATrainer:
@@ -261,31 +455,42 @@ class IMPALATrainer:
         action_dim = env.action_space.shape[0]
         env.close()
         
-        self.tumor_agent = IMPALAAgent(
-            agent_role="tumor",
-            obs_dim=obs_dim,
-            action_dim=action_dim,
-            learning_rate=config.learning_rate,
-            device=config.learner_device,
-            entropy_coef_decay=0.997,     # slower decay
-            min_entropy_coef=0.005,       # higher floor
-        )
+        agents = build_learner_agents(config, obs_dim, action_dim, config.learner_device)
+        self.tumor_agent = agents['tumor']
+        self.sink_agent = agents['sink_designer']
         
-        self.sink_agent = IMPALAAgent(
-            agent_role="sink_designer",
-            obs_dim=obs_dim,
-            action_dim=action_dim,
-            learning_rate=config.learning_rate,
-            device=config.learner_device,
-        )
+        # Data-parallel learners; the local agents then only mirror rank 0
+        # for checkpointing and resuming
+        self.learners = []
+        self.learner_queues: Dict[str, List[np.ndarray]] = {"tumor": [], "sink_designer": []}
+        self.pending_updates: deque = deque()
+        self.published_weights: Dict[str, ray.ObjectRef] = {}
+        self.learner_dims = (obs_dim, action_dim)
+        self.learner_failures = 0
+        if config.num_learners > 1:
+            if config.learner_device != "cpu":
+                raise ValueError("Data-parallel learners use the gloo backend and require learner_device='cpu'")
+            self.learners = self._create_learners(obs_dim, action_dim)
+            self._pull_learner_state()
         
         # Create actor workers
-        self.actors = []
-        for i in range(config.num_actors):
-            # Alternate between tumor and sink designer actors
-            agent_role = "tumor" if i % 2 == 0 else "sink_designer"
-            actor = ActorWorker.remote(i, config, agent_role)
-            self.actors.append(actor)
+        self.actors = [self._create_actor(i) for i in range(config.num_actors)]
+        
+        # In-flight rollouts (future -> worker_id) and actors waiting to be replaced
+        self.pending_rollouts: Dict[ray.ObjectRef, int] = {}
+        self.draining: Set[int] = set()
+        
+        # Rollouts submitted with weights published by a learner group that has since failed
+        self.stale_rollouts: Set[ray.ObjectRef] = set()
+        self.actor_restarts = 0
+        
+        # Memory probes in flight (probe -> worker_id) and RSS answers of the current round
+        self.memory_probes: Dict[ray.ObjectRef, int] = {}
+        self.memory_rss: List[float] = []
+        
+        # Rollout failure accounting (1 = failed) over a sliding window
+        self.actor_failures = 0
+        self.recent_rollout_failures = deque(maxlen=1000)
             
         # Training statistics
         self.global_timesteps = 0
@@ -300,71 +505,311 @@ class IMPALATrainer:
         # Initialize TensorBoard logger
         self.tb_logger = TensorBoardLogger(str(self.checkpoint_dir / "tensorboard"))
         
+        # Checkpoints are serialized and written off the training loop;
+        # the package manifest only needs capturing once per run
+        self.checkpoint_writer = AsyncCheckpointWriter()
+        self.checkpoint_writer.submit(
+            lambda: write_environment_manifest(self.checkpoint_dir / "requirements.txt"),
+            block=True,
+        )
+        
+    @staticmethod
+    def _actor_role(worker_id: int) -> str:
+        """Alternate between tumor and sink designer actors."""
+        return "tumor" if worker_id % 2 == 0 else "sink_designer"
+        
+    def _create_actor(self, worker_id: int):
+        """Start an ActorWorker for the given slot."""
+        return ActorWorker.remote(worker_id, self.config, self._actor_role(worker_id))
+        
+    def _create_learners(self, obs_dim: int, action_dim: int) -> List:
+        """Start the learner ranks and join them in one gloo process group."""
+        world_size = self.config.num_learners
+        learners = [
+            LearnerWorker.options(num_cpus=self.config.learner_num_cpus).remote(
+                rank, world_size, self.config, obs_dim, action_dim
+            )
+            for rank in range(world_size)
+        ]
+        master_addr, master_port = ray.get(learners[0].get_address.remote())
+        ray.get([
+            learner.init_process_group.remote(master_addr, master_port) for learner in learners
+        ])
+        
+        for role in self.learner_queues:
+            self.published_weights[role] = learners[0].get_weights.remote(role)
+        logger.info(f"Started {world_size} data-parallel learners ({self.config.learner_num_cpus} CPUs each)")
+        return learners
+        
+    def _submit_rollout(self, worker_id: int):
+        """Queue the next segment on an actor with the latest weights."""
+        roles = [self._actor_role(worker_id)]
+        if self.learners:
+            # Published once per round in the object store and shared by all actors
+            weights = {role: self.published_weights[role] for role in roles}
+        else:
+            weights = self._get_current_weights(roles)
+        future = self.actors[worker_id].run_segment.remote(weights)
+        self.pending_rollouts[future] = worker_id
+        
+    def _replace_actor(self, worker_id: int, reason: str):
+        """Kill an actor and start a fresh one with the same worker_id and role."""
+        try:
+            ray.kill(self.actors[worker_id])
+        except Exception as e:
+            logger.debug(f"Actor {worker_id} already gone: {e}")
+            
+        self.actors[worker_id] = self._create_actor(worker_id)
+        self.actor_restarts += 1
+        logger.warning(
+            f"Replaced actor {worker_id} ({reason}); {self.actor_restarts} restarts so far"
+        )
+        self.tb_logger.log_scalar("actors/restarts", self.actor_restarts)
+        
+    def _handle_rollout_failure(self, worker_id: int, error: Exception):
+        """Respawn a failed actor and resubmit its segment, within the failure budget."""
+        self.actor_failures += 1
+        self.recent_rollout_failures.append(1)
+        
+        kind = "died" if isinstance(error, ray.exceptions.RayActorError) else "raised"
+        logger.error(
+            f"Actor {worker_id} {kind} during rollout "
+            f"({self.actor_failures}/{self.config.max_actor_failures} failures): {error}"
+        )
+        self.tb_logger.log_scalar("actors/failures", self.actor_failures)
+        self.tb_logger.log_scalar("actors/failure_rate", self._failure_rate())
+        
+        if self.actor_failures > self.config.max_actor_failures:
+            logger.error("Actor failure budget exhausted, saving checkpoint and aborting")
+            self._save_checkpoint(block=True)
+            self.checkpoint_writer.flush()
+            raise RuntimeError(
+                f"Aborting training after {self.actor_failures} failed rollouts "
+                f"(max_actor_failures={self.config.max_actor_failures})"
+            ) from error
+            
+        self.draining.discard(worker_id)
+        self._replace_actor(worker_id, f"rollout {kind}")
+        self._submit_rollout(worker_id)
+        
+    def _retry_stale_rollout(self, worker_id: int, error: Exception):
+        """Resubmit a segment that failed fetching a dead learner group's weights.
+        
+        The actor is not at fault, so it is neither charged to the failure
+        budget nor replaced. If it did die, the retry fails and is handled as
+        an ordinary rollout failure.
+        """
+        logger.warning(
+            f"Actor {worker_id} rollout used weights from the failed learner group, resubmitting: {error}"
+        )
+        self._submit_rollout(worker_id)
+        
+    def _handle_learner_failure(self, error: Exception):
+        """Restart the learner group from the local mirror, within the failure budget.
+        
+        A dead rank leaves the others blocked in the all-reduce, so every rank
+        is replaced. The new group starts from the state last mirrored from
+        rank 0 (the last checkpoint); rounds in flight are lost.
+        """
+        self.learner_failures += 1
+        lost = sum(len(futures) for _, futures in self.pending_updates)
+        logger.error(
+            f"Learner group failed ({self.learner_failures}/{self.config.max_learner_failures} failures), "
+            f"{lost} trajectories in flight lost: {error}"
+        )
+        self.tb_logger.log_scalar("learners/failures", self.learner_failures)
+        
+        for learner in self.learners:
+            try:
+                ray.kill(learner)
+            except Exception as e:
+                logger.debug(f"Learner already gone: {e}")
+        self.learners = []
+        self.pending_updates.clear()
+        # In-flight segments may still have to fetch the dead group's weights
+        self.stale_rollouts.update(self.pending_rollouts)
+        
+        if self.learner_failures > self.config.max_learner_failures:
+            logger.error("Learner failure budget exhausted, saving checkpoint and aborting")
+            self._save_checkpoint(block=True)
+            self.checkpoint_writer.flush()
+            raise RuntimeError(
+                f"Aborting training after {self.learner_failures} learner failures "
+                f"(max_learner_failures={self.config.max_learner_failures})"
+            ) from error
+            
+        self.learners = self._create_learners(*self.learner_dims)
+        self._push_learner_state()
+        
+    def _failure_rate(self) -> float:
+        """Fraction of recent rollouts that failed."""
+        if not self.recent_rollout_failures:
+            return 0.0
+        return float(np.mean(self.recent_rollout_failures))
+        
+    def _probe_actor_memory(self):
+        """Ask every actor for its RSS; _check_actor_memory picks up the answers.
+        
+        Probes still unanswered from the previous round are dropped.
+        """
+        if self.memory_probes:
+            logger.debug(f"{len(self.memory_probes)} actors did not report memory since the last probe")
+            self.memory_probes.clear()
+            self._log_memory_round()
+        self.memory_probes = {actor.get_memory_usage.remote(): i for i, actor in enumerate(self.actors)}
+        
+    def _check_actor_memory(self):
+        """Collect answered memory probes, without waiting, and mark actors over the limit.
+        
+        Marked actors are drained: their in-flight segment is still consumed
+        and the replacement happens once it returns.
+        """
+        if not self.memory_probes:
+            return
+        ready, _ = ray.wait(list(self.memory_probes), num_returns=len(self.memory_probes), timeout=0)
+        
+        for probe in ready:
+            worker_id = self.memory_probes.pop(probe)
+            try:
+                usage = ray.get(probe)
+            except ray.exceptions.RayError:
+                continue  # Dead actors are handled by the rollout loop
+                
+            self.memory_rss.append(usage['rss_gb'])
+            if usage['rss_gb'] > self.config.actor_memory_limit_gb and worker_id not in self.draining:
+                logger.warning(
+                    f"Actor {worker_id} RSS {usage['rss_gb']:.2f} GB exceeds "
+                    f"{self.config.actor_memory_limit_gb:.1f} GB, draining"
+                )
+                self.draining.add(worker_id)
+                
+        if not self.memory_probes:
+            self._log_memory_round()
+            
+    def _log_memory_round(self):
+        """Log the RSS collected in one probe round."""
+        rss_values, self.memory_rss = self.memory_rss, []
+        if not rss_values:
+            return
+            
+        metrics = {
+            'max_rss_gb': max(rss_values),
+            'mean_rss_gb': float(np.mean(rss_values)),
+            'actor_restarts': self.actor_restarts,
+        }
+        object_store_gb = self._object_store_used_gb()
+        if object_store_gb is not None:
+            metrics['object_store_used_gb'] = object_store_gb
+        self.tb_logger.log_memory_metrics(metrics)
+        self.tb_logger.log_histogram("actors/rss_gb", np.array(rss_values))
+        
+    @staticmethod
+    def _object_store_used_gb() -> Optional[float]:
+        """Bytes held in Ray's object store across the cluster, from the raylets' store stats.
+        
+        Uses the same node stats as ``ray memory --stats-only``; None if they
+        cannot be fetched.
+        """
+        try:
+            from ray._private.internal_api import get_memory_info_reply, get_state_from_address
+            
+            reply = get_memory_info_reply(get_state_from_address(ray.get_runtime_context().gcs_address))
+            return reply.store_stats.object_store_bytes_used / 1e9
+        except Exception as e:
+            logger.debug(f"Object store stats unavailable: {e}")
+            return None
+        
     def train(self):
         """Main training loop."""
         logger.info(f"Starting IMPALA training with {self.config.num_actors} actors")
         
         # Start initial rollouts
-        rollout_futures = []
-        for actor in self.actors:
-            weights = self._get_current_weights()
-            future = actor.run_episode.remote(weights)
-            rollout_futures.append(future)
+        for worker_id in range(len(self.actors)):
+            self._submit_rollout(worker_id)
             
         start_time = time.time()
         last_log_time = start_time
         last_save_time = start_time
+        last_memory_check = start_time
         
         while self.global_timesteps < self.config.total_timesteps:
             # Wait for any rollout to complete
-            ready_futures, rollout_futures = ray.wait(rollout_futures, num_returns=1)
+            ready_futures, _ = ray.wait(list(self.pending_rollouts), num_returns=1)
             
             # Process completed rollout
             for future in ready_futures:
-                result = ray.get(future)
-                trajectory = result['trajectory']
-                
+                worker_id = self.pending_rollouts.pop(future)
+                stale = future in self.stale_rollouts
+                self.stale_rollouts.discard(future)
+                try:
+                    result = ray.get(future)
+                except ray.exceptions.RayError as e:
+                    if stale:
+                        self._retry_stale_rollout(worker_id, e)
+                        continue
+                    # Actor raised (infeasible model, solver crash) or died (OOM kill)
+                    self._handle_rollout_failure(worker_id, e)
+                    continue
+                self.recent_rollout_failures.append(0)
+                    
                 # Determine which agent to update
-                worker_id = result['worker_id']
-                agent_role = "tumor" if worker_id % 2 == 0 else "sink_designer"
-                agent = self.tumor_agent if agent_role == "tumor" else self.sink_agent
-                
-                # Compute behavior policy log probs (from trajectory)
-                behavior_logprobs = trajectory.action_log_probs  # Already has batch dim
+                agent_role = self._actor_role(worker_id)
                 
-                # Update agent with entropy annealing
-                losses = agent.update(
-                    trajectory, 
-                    behavior_logprobs,
-                    current_step=self.global_timesteps,
-                    total_steps=self.config.total_timesteps
-                )
-                
-                # Log training metrics
-                self.tb_logger.log_training_metrics(losses, agent_role)
+                if self.learners:
+                    self._queue_learner_update(agent_role, result['trajectory'])
+                else:
+                    trajectory = unpack_trajectory(
+                        result['trajectory'], self.config.trajectory_info_keys
+                    )
+                    agent = self.tumor_agent if agent_role == "tumor" else self.sink_agent
+                    
+                    # Compute behavior policy log probs (from trajectory)
+                    behavior_logprobs = trajectory.action_log_probs  # Already has batch dim
+                    
+                    # Update agent with entropy annealing
+                    losses = agent.update(
+                        trajectory, 
+                        behavior_logprobs,
+                        current_step=self.global_timesteps,
+                        total_steps=self.config.total_timesteps
+                    )
+                    
+                    # Log training metrics
+                    self.tb_logger.log_training_metrics(losses, agent_role)
+                if 'invalid_action_rate' in result:
+                    self.tb_logger.log_scalar("sink/invalid_action_rate", result['invalid_action_rate'])
                 
                 # Update statistics
-                self.global_timesteps += result['episode_length']
-                self.episode_returns.append(result['episode_return'])
-                self.episode_lengths.append(result['episode_length'])
-                
-                # Log episode metrics
-                episode_metrics = {
-                    'episode_return': result['episode_return'],
-                    'episode_length': result['episode_length'],
-                }
-                if 'd2hg_level' in result:
-                    episode_metrics['d2hg_level'] = result['d2hg_level']
-                if 'growth_rate' in result:
-                    episode_metrics['growth_rate'] = result['growth_rate']
-                self.tb_logger.log_episode_metrics(episode_metrics)
+                self.global_timesteps += result['segment_length']
+                for episode in result['episodes']:
+                    self.episode_returns.append(episode['episode_return'])
+                    self.episode_lengths.append(episode['episode_length'])
+                    
+                    # Log episode metrics
+                    episode_metrics = {
+                        'episode_return': episode['episode_return'],
+                        'episode_length': episode['episode_length'],
+                    }
+                    if 'd2hg_level' in episode:
+                        episode_metrics['d2hg_level'] = episode['d2hg_level']
+                    if 'growth_rate' in episode:
+                        episode_metrics['growth_rate'] = episode['growth_rate']
+                    self.tb_logger.log_episode_metrics(episode_metrics)
                 self.tb_logger.increment_step()
                 
+                # Swap out drained actors now that their segment is in
+                if worker_id in self.draining:
+                    self.draining.discard(worker_id)
+                    self._replace_actor(worker_id, "memory limit")
+                    
                 # Start new rollout for this actor
-                actor = self.actors[worker_id]
-                weights = self._get_current_weights()
-                new_future = actor.run_episode.remote(weights)
-                rollout_futures.append(new_future)
+                self._submit_rollout(worker_id)
+                
+            # Memory watchdog; probes are answered in the background and collected here
+            self._check_actor_memory()
+            if time.time() - last_memory_check > self.config.memory_check_interval / 1000:
+                self._probe_actor_memory()
+                last_memory_check = time.time()
                 
             # Logging
             if time.time() - last_log_time > self.config.log_interval / 1000:
@@ -377,7 +822,12 @@ class IMPALATrainer:
                 last_save_time = time.time()
                 
         logger.info("Training completed!")
+        self._flush_learner_queues()
+        self._collect_learner_updates(max_pending=0)
         self._save_checkpoint(final=True)
+        self.checkpoint_writer.close()
+        if self.learners:
+            ray.get([learner.shutdown.remote() for learner in self.learners])
         
         # Return final statistics
         final_stats = {
@@ -389,22 +839,119 @@ class IMPALATrainer:
         }
         return final_stats
         
-    def _get_current_weights(self) -> Dict[str, bytes]:
-        """Get current network weights as bytes."""
-        import io
+    def _queue_learner_update(self, role: str, packed_trajectory: np.ndarray):
+        """Hold a trajectory until every learner rank has one of this role, then run the round.
         
-        weights = {}
+        All ranks must enter each gradient all-reduce for the same role, so
+        updates are dispatched in rounds of one trajectory per rank. Ray runs
+        each rank's calls in submission order, which keeps the ranks in step.
+        """
+        queue = self.learner_queues[role]
+        queue.append(packed_trajectory)
+        if len(queue) < len(self.learners):
+            return
+            
+        self._dispatch_learner_round(role)
+        self._collect_learner_updates()
         
-        # Tumor agent weights
-        buffer = io.BytesIO()
-        torch.save(self.tumor_agent.network.state_dict(), buffer)
-        weights['tumor'] = buffer.getvalue()
+    def _dispatch_learner_round(self, role: str):
+        """Hand each rank one queued trajectory of a role."""
+        queue = self.learner_queues[role]
+        futures = [
+            learner.update.remote(role, trajectory, self.global_timesteps)
+            for learner, trajectory in zip(self.learners, queue)
+        ]
+        queue.clear()
+        self.pending_updates.append((role, futures))
+        # Queued behind the update on rank 0, so actors get post-update weights
+        self.published_weights[role] = self.learners[0].get_weights.remote(role)
         
-        # Sink designer weights
-        buffer = io.BytesIO()
-        torch.save(self.sink_agent.network.state_dict(), buffer)
-        weights['sink_designer'] = buffer.getvalue()
+    def _flush_learner_queues(self):
+        """Run the partial rounds left at the end of training.
+        
+        Ranks without a trajectory of their own repeat one from the round, so
+        every rank still enters the all-reduce and no trajectory is dropped.
+        """
+        for role, queue in self.learner_queues.items():
+            if not queue or not self.learners:
+                continue
+            logger.info(f"Flushing a partial {role} learner round of {len(queue)}/{len(self.learners)} trajectories")
+            queue.extend([queue[i % len(queue)] for i in range(len(self.learners) - len(queue))])
+            self._dispatch_learner_round(role)
+            
+    def _collect_learner_updates(self, max_pending: int = MAX_PENDING_LEARNER_ROUNDS):
+        """Log finished learner rounds, waiting while more than max_pending are in flight."""
+        while self.pending_updates:
+            role, futures = self.pending_updates[0]
+            if len(self.pending_updates) <= max_pending:
+                ready, _ = ray.wait(futures, num_returns=len(futures), timeout=0)
+                if len(ready) < len(futures):
+                    break
+            try:
+                rank_losses = self._wait_learner_round(futures)
+            except ray.exceptions.RayError as e:
+                self._handle_learner_failure(e)
+                return
+            self.pending_updates.popleft()
+            
+            # Ranks see different trajectories; log the mean over the round
+            losses = {key: float(np.mean([l[key] for l in rank_losses])) for key in rank_losses[0]}
+            self.tb_logger.log_training_metrics(losses, role)
+            
+    @staticmethod
+    def _wait_learner_round(futures: List[ray.ObjectRef]) -> List[Dict[str, float]]:
+        """Every rank's losses for a round, raising as soon as any rank fails.
+        
+        The surviving ranks of a round with a dead rank block in the
+        all-reduce, so waiting on all of them at once would hang.
+        """
+        remaining = list(futures)
+        while remaining:
+            ready, remaining = ray.wait(remaining, num_returns=1)
+            ray.get(ready)
+        return ray.get(futures)
+        
+    def _pull_learner_state(self):
+        """Mirror rank 0's weights, optimizers and entropy schedule into the local agents."""
+        state = ray.get(self.learners[0].get_state.remote())
+        for role, agent in self._agents():
+            agent.network.load_state_dict(state[role]['network'])
+            agent.optimizer.load_state_dict(state[role]['optimizer'])
+            agent.entropy_coef = state[role]['entropy_coef']
+            agent.update_count = state[role]['update_count']
+            
+    def _push_learner_state(self):
+        """Send the local agents' state to every learner rank and republish weights."""
+        state = {
+            role: {
+                'network': agent.network.state_dict(),
+                'optimizer': agent.optimizer.state_dict(),
+                'entropy_coef': agent.entropy_coef,
+                'update_count': agent.update_count,
+            }
+            for role, agent in self._agents()
+        }
+        state_ref = ray.put(state)
+        ray.get([learner.set_state.remote(state_ref) for learner in self.learners])
+        for role in self.learner_queues:
+            self.published_weights[role] = self.learners[0].get_weights.remote(role)
+            
+    def _get_current_weights(self, roles: Optional[List[str]] = None) -> Dict[str, bytes]:
+        """Get current network weights as bytes.
+        
+        Args:
+            roles: Roles to serialize; all of them if None
+        """
+        import io
         
+        weights = {}
+        for role, agent in self._agents():
+            if roles is not None and role not in roles:
+                continue
+            buffer = io.BytesIO()
+            torch.save(agent.network.state_dict(), buffer)
+            weights[role] = buffer.getvalue()
+            
         return weights
         
     def _log_statistics(self):
@@ -425,7 +972,8 @@ class IMPALATrainer:
             f"Episodes: {len(self.episode_returns)} | "
             f"Return: {mean_return:.6f} | "
             f"Length: {mean_length:.1f} | "
-            f"FPS: {fps:.0f}"
+            f"FPS: {fps:.0f} | "
+            f"Failures: {self.actor_failures} ({self._failure_rate():.1%})"
         )
         
         # Log to TensorBoard
@@ -434,71 +982,102 @@ class IMPALATrainer:
             'episodes_per_second': eps,
         })
         
-    def _save_checkpoint(self, final: bool = False, lightweight: bool = False):
-        """Save training checkpoint with compression.
+    def _agents(self) -> List[Tuple[str, IMPALAAgent]]:
+        """Learner agents by role."""
+        return [("tumor", self.tumor_agent), ("sink_designer", self.sink_agent)]
+        
+    def _snapshot_trainer_state(self) -> Dict:
+        """Copy everything beyond the policy weights needed to resume exactly."""
+        rng_state = {
+            'torch': torch.get_rng_state(),
+            'numpy': np.random.get_state(),
+            'python': random.getstate(),
+        }
+        if torch.cuda.is_available():
+            rng_state['cuda'] = torch.cuda.get_rng_state_all()
+            
+        return snapshot_state({
+            'optimizers': {name: agent.optimizer.state_dict() for name, agent in self._agents()},
+            'entropy_coefs': {name: agent.entropy_coef for name, agent in self._agents()},
+            'update_counts': {name: agent.update_count for name, agent in self._agents()},
+            'rng_state': rng_state,
+            'episode_returns': list(self.episode_returns),
+            'episode_lengths': list(self.episode_lengths),
+            'tensorboard_step': self.tb_logger.global_step,
+            'actor_restarts': self.actor_restarts,
+            'actor_failures': self.actor_failures,
+            'learner_failures': self.learner_failures,
+        })
+        
+    def _save_checkpoint(self, final: bool = False, lightweight: bool = False, block: bool = False):
+        """Snapshot training state and hand it to the background writer.
+        
+        Only the in-memory copy happens on the training loop; serialization,
+        compression and the atomic directory rename run on the writer thread.
         
         Args:
             final: If True, save as 'final' checkpoint
             lightweight: If True, save only policy weights (not optimizer state)
+            block: Wait for a busy writer instead of skipping this checkpoint
         """
-        import gzip
-        import io
-        
         checkpoint_name = "final" if final else f"step_{self.global_timesteps}"
         if lightweight:
             checkpoint_name += "_light"
         checkpoint_path = self.checkpoint_dir / checkpoint_name
-        checkpoint_path.mkdir(exist_ok=True)
         
-        # Save compressed agent checkpoints
-        for agent_name, agent in [("tumor", self.tumor_agent), ("sink_designer", self.sink_agent)]:
-            # Get state dict
-            state_dict = agent.network.state_dict()
-            
-            # Compress state dict
-            buffer = io.BytesIO()
-            torch.save(state_dict, buffer)
-            compressed = gzip.compress(buffer.getvalue())
+        block = block or final
+        if not block and self.checkpoint_writer.busy:
+            # Decided before snapshotting, so a skipped checkpoint costs the loop nothing
+            logger.warning(f"Checkpoint writer busy, skipping {checkpoint_name}")
+            return
             
-            # Save compressed file
-            with open(checkpoint_path / f"{agent_name}_agent.pt.gz", 'wb') as f:
-                f.write(compressed)
+        if self.learners:
+            # Surfaces a failed learner round before asking rank 0 for its state
+            self._collect_learner_updates(max_pending=0)
+        if self.learners:
+            self._pull_learner_state()
+        
+        # Compressed agent weights
+        files = {
+            f"{agent_name}_agent.pt.gz": snapshot_state(agent.network.state_dict())
+            for agent_name, agent in self._agents()
+        }
+        
+        # Optimizer, entropy schedule, RNG and episode statistics
+        if not lightweight:
+            files["trainer_state.pt.gz"] = self._snapshot_trainer_state()
         
         # Save training state
-        state = {
+        files["training_state.json"] = {
             'global_timesteps': self.global_timesteps,
-            'config': self.config.__dict__,
+            'config': dict(self.config.__dict__),
             'checkpoint_format': 'compressed',
+            'resumable': not lightweight,
         }
         
-        with open(checkpoint_path / "training_state.json", 'w') as f:
-            json.dump(state, f, indent=2)
-        
-        # Save requirements for reproducibility
-        import subprocess
-        try:
-            requirements = subprocess.check_output(['pip', 'freeze'], text=True)
-            with open(checkpoint_path / "requirements.txt", 'w') as f:
-                f.write(requirements)
-        except:
-            pass  # Non-critical if it fails
-            
-        logger.info(f"Saved compressed checkpoint to {checkpoint_path}")
-        
-        # Prune old checkpoints (keep only last 5 non-final checkpoints)
-        # Only prune if this is a regular checkpoint, not final
-        if not final:
-            self._prune_old_checkpoints(keep_last=5)
+        def write():
+            write_checkpoint_files(
+                checkpoint_path, files, compress_level=self.config.checkpoint_compress_level
+            )
+            logger.info(f"Saved compressed checkpoint to {checkpoint_path}")
+            
+            # Prune old checkpoints (keep only last 5 non-final checkpoints)
+            # Only prune if this is a regular checkpoint, not final
+            if not final:
+                self._prune_old_checkpoints(keep_last=5)
+                
+        if not self.checkpoint_writer.submit(write, block=block):
+            logger.warning(f"Checkpoint writer busy, skipping {checkpoint_name}")
     
     def load_checkpoint(self, checkpoint_path: str):
         """Load a checkpoint and resume training.
         
+        Restores policy weights and, for full checkpoints, optimizer state,
+        entropy coefficients, RNG state and episode statistics.
+        
         Args:
             checkpoint_path: Path to checkpoint directory
         """
-        import gzip
-        import io
-        
         checkpoint_path = Path(checkpoint_path)
         if not checkpoint_path.exists():
             raise ValueError(f"Checkpoint path does not exist: {checkpoint_path}")
@@ -512,26 +1091,51 @@ class IMPALATrainer:
         logger.info(f"Resuming from checkpoint at step {self.global_timesteps:,}")
         
         # Load compressed agent states
-        for agent_name, agent in [("tumor", self.tumor_agent), ("sink_designer", self.sink_agent)]:
+        for agent_name, agent in self._agents():
             compressed_path = checkpoint_path / f"{agent_name}_agent.pt.gz"
             if compressed_path.exists():
-                # Load and decompress
-                with open(compressed_path, 'rb') as f:
-                    compressed = f.read()
-                decompressed = gzip.decompress(compressed)
-                
-                # Load state dict
-                buffer = io.BytesIO(decompressed)
-                state_dict = torch.load(buffer, map_location=self.config.learner_device)
+                state_dict = load_compressed(compressed_path, map_location=self.config.learner_device)
                 agent.network.load_state_dict(state_dict)
                 logger.info(f"Loaded {agent_name} agent weights")
             else:
                 logger.warning(f"No checkpoint found for {agent_name} agent")
                 
-        # Note: We're not saving/loading optimizer states or replay buffers
-        # This is a limitation but keeps checkpoints smaller
+        trainer_state_path = checkpoint_path / "trainer_state.pt.gz"
+        if trainer_state_path.exists():
+            self._restore_trainer_state(
+                load_compressed(trainer_state_path, map_location=self.config.learner_device)
+            )
+        else:
+            # Older and lightweight checkpoints only carry policy weights
+            logger.warning("Checkpoint has no trainer state; optimizer and RNG start fresh")
+            
+        if self.learners:
+            self._push_learner_state()
+            
         logger.info(f"Successfully resumed from {checkpoint_path}")
         logger.info(f"Continuing training from step {self.global_timesteps:,} to {self.config.total_timesteps:,}")
+        
+    def _restore_trainer_state(self, trainer_state: Dict):
+        """Apply state captured by _snapshot_trainer_state."""
+        for agent_name, agent in self._agents():
+            agent.optimizer.load_state_dict(trainer_state['optimizers'][agent_name])
+            agent.entropy_coef = trainer_state['entropy_coefs'][agent_name]
+            agent.update_count = trainer_state['update_counts'][agent_name]
+            
+        rng_state = trainer_state['rng_state']
+        torch.set_rng_state(rng_state['torch'].cpu())
+        np.random.set_state(rng_state['numpy'])
+        random.setstate(rng_state['python'])
+        if 'cuda' in rng_state and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all([s.cpu() for s in rng_state['cuda']])
+            
+        self.episode_returns.extend(trainer_state['episode_returns'])
+        self.episode_lengths.extend(trainer_state['episode_lengths'])
+        self.tb_logger.global_step = trainer_state['tensorboard_step']
+        self.actor_restarts = trainer_state['actor_restarts']
+        self.actor_failures = trainer_state['actor_failures']
+        self.learner_failures = trainer_state.get('learner_failures', 0)
+        logger.info("Restored optimizer, entropy schedule, RNG and episode statistics")
     
     def _prune_old_checkpoints(self, keep_last: int = 5):
         """Remove old checkpoints to save disk space."""
@@ -0,0 +1,265 @@
+"""Packed trajectory transport between actors and the learner.
+
+Actors write each rollout step into a preallocated staging buffer and ship
+the finished unroll segment as one contiguous byte array: a fixed int32
+header followed by the field sections it points at. Ray places numpy arrays
+in the object store without pickling them, so the driver deserializes a
+single buffer per segment instead of several tensors plus raw env info dicts.
+"""
+
+import numpy as np
+import torch
+from typing import Dict, Optional, Sequence, Tuple
+
+from .impala_agent import Trajectory
+
+PACKED_MAGIC = 0x52445854  # "RDXT"
+PACKED_VERSION = 2
+HEADER_SLOTS = 32
+HEADER_BYTES = HEADER_SLOTS * 4
+
+OBS_DTYPES = {"float32": np.float32, "float16": np.float16}
+_OBS_DTYPE_CODES = {"float32": 0, "float16": 1}
+_OBS_DTYPE_NAMES = {code: name for name, code in _OBS_DTYPE_CODES.items()}
+
+# Header slots
+_H_MAGIC = 0
+_H_VERSION = 1
+_H_LENGTH = 2
+_H_OBS_DIM = 3
+_H_ACTION_DIM = 4
+_H_N_INFO = 5
+_H_OBS_DTYPE = 6
+_H_LSTM_LAYERS = 7
+_H_HIDDEN_DIM = 8
+_H_OFFSETS = 12  # Byte offset of each section, in _SECTIONS order
+
+_SECTIONS = (
+    "observations",
+    "actions",
+    "rewards",
+    "values",
+    "action_log_probs",
+    "dones",
+    "infos",
+    "bootstrap_value",
+    "initial_hidden",
+)
+
+
+def _info_scalar(value) -> float:
+    """Reduce an info entry to a float, NaN if it is missing or not scalar."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class TrajectoryBuffer:
+    """Preallocated per-actor staging area for a single unroll segment."""
+
+    def __init__(
+        self,
+        capacity: int,
+        obs_dim: int,
+        action_dim: int,
+        info_keys: Sequence[str] = (),
+        obs_dtype: str = "float32",
+        lstm_layers: int = 1,
+        hidden_dim: int = 0,
+    ):
+        """Allocate staging arrays.
+
+        Args:
+            capacity: Maximum number of steps per segment
+            obs_dim: Observation size
+            action_dim: Flattened action size
+            info_keys: Env info entries kept per step (as float32 scalars)
+            obs_dtype: Wire dtype for observations ("float32" or "float16")
+            lstm_layers: LSTM layers of the policy that produced the segment
+            hidden_dim: LSTM hidden size (0 if no recurrent state is recorded)
+        """
+        if obs_dtype not in OBS_DTYPES:
+            raise ValueError(f"Unsupported observation dtype: {obs_dtype}")
+
+        self.capacity = capacity
+        self.obs_dim = obs_dim
+        self.action_dim = action_dim
+        self.info_keys = tuple(info_keys)
+        self.obs_dtype = obs_dtype
+        self.lstm_layers = lstm_layers
+        self.hidden_dim = hidden_dim
+
+        self.observations = np.zeros((capacity, obs_dim), dtype=OBS_DTYPES[obs_dtype])
+        self.actions = np.zeros((capacity, action_dim), dtype=np.float32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.values = np.zeros(capacity, dtype=np.float32)
+        self.action_log_probs = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.infos = np.zeros((capacity, len(self.info_keys)), dtype=np.float32)
+        self.bootstrap_value = np.zeros(1, dtype=np.float32)
+        self.initial_hidden = np.zeros((2, lstm_layers, hidden_dim), dtype=np.float32)
+
+        self.length = 0
+
+    def reset(self, initial_hidden: Optional[Tuple[torch.Tensor, torch.Tensor]] = None):
+        """Start a new segment, reusing the allocated storage.
+
+        Args:
+            initial_hidden: LSTM state (h, c) the segment starts from; zeros if None
+        """
+        self.length = 0
+        self.bootstrap_value[0] = 0.0
+        if initial_hidden is None:
+            self.initial_hidden.fill(0.0)
+        else:
+            for i, state in enumerate(initial_hidden):
+                self.initial_hidden[i] = state.detach().cpu().reshape(
+                    self.lstm_layers, self.hidden_dim
+                ).numpy()
+
+    def set_bootstrap_value(self, value: float):
+        """Record V(s_T) for the observation following the last step."""
+        self.bootstrap_value[0] = value
+
+    def add(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: float,
+        value: float,
+        log_prob: float,
+        done: bool,
+        info: Optional[Dict] = None,
+    ):
+        """Record one environment step."""
+        t = self.length
+        if t >= self.capacity:
+            raise IndexError(f"Trajectory buffer full ({self.capacity} steps)")
+
+        self.observations[t] = obs
+        self.actions[t] = action
+        self.rewards[t] = reward
+        self.values[t] = value
+        self.action_log_probs[t] = log_prob
+        self.dones[t] = float(done)
+        if self.info_keys:
+            info = info or {}
+            for j, key in enumerate(self.info_keys):
+                self.infos[t, j] = _info_scalar(info.get(key))
+
+        self.length += 1
+
+    def pack(self) -> np.ndarray:
+        """Serialize the recorded steps into one contiguous uint8 buffer."""
+        length = self.length
+        sections = [
+            self.observations[:length],
+            self.actions[:length],
+            self.rewards[:length],
+            self.values[:length],
+            self.action_log_probs[:length],
+            self.dones[:length],
+            self.infos[:length],
+            self.bootstrap_value,
+            self.initial_hidden,
+        ]
+
+        # Lay sections out back to back, each 8-byte aligned
+        offsets = []
+        total = HEADER_BYTES
+        for section in sections:
+            offsets.append(total)
+            total += -(-section.nbytes // 8) * 8
+
+        packed = np.zeros(total, dtype=np.uint8)
+        header = packed[:HEADER_BYTES].view(np.int32)
+        header[_H_MAGIC] = PACKED_MAGIC
+        header[_H_VERSION] = PACKED_VERSION
+        header[_H_LENGTH] = length
+        header[_H_OBS_DIM] = self.obs_dim
+        header[_H_ACTION_DIM] = self.action_dim
+        header[_H_N_INFO] = len(self.info_keys)
+        header[_H_OBS_DTYPE] = _OBS_DTYPE_CODES[self.obs_dtype]
+        header[_H_LSTM_LAYERS] = self.lstm_layers
+        header[_H_HIDDEN_DIM] = self.hidden_dim
+        header[_H_OFFSETS:_H_OFFSETS + len(offsets)] = offsets
+
+        for offset, section in zip(offsets, sections):
+            packed[offset:offset + section.nbytes] = section.reshape(-1).view(np.uint8)
+
+        return packed
+
+
+def unpack_trajectory(packed: np.ndarray, info_keys: Sequence[str] = ()) -> Trajectory:
+    """Rebuild a batched (B=1) Trajectory from a packed segment.
+
+    Args:
+        packed: Buffer produced by TrajectoryBuffer.pack (may be read-only)
+        info_keys: Names of the info columns, in the order the actor wrote them
+
+    Returns:
+        Trajectory with float32 tensors of shape [1, T, ...], the bootstrap
+        value and, if recorded, the initial LSTM state as [layers, 1, hidden]
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    header = packed[:HEADER_BYTES].view(np.int32)
+
+    if header[_H_MAGIC] != PACKED_MAGIC:
+        raise ValueError("Buffer is not a packed trajectory")
+    if header[_H_VERSION] != PACKED_VERSION:
+        raise ValueError(f"Unsupported packed trajectory version: {header[_H_VERSION]}")
+
+    length = int(header[_H_LENGTH])
+    obs_dim = int(header[_H_OBS_DIM])
+    action_dim = int(header[_H_ACTION_DIM])
+    n_info = int(header[_H_N_INFO])
+    obs_dtype = OBS_DTYPES[_OBS_DTYPE_NAMES[int(header[_H_OBS_DTYPE])]]
+    lstm_layers = int(header[_H_LSTM_LAYERS])
+    hidden_dim = int(header[_H_HIDDEN_DIM])
+
+    if info_keys and len(info_keys) != n_info:
+        raise ValueError(f"Expected {n_info} info keys, got {len(info_keys)}")
+
+    shapes = {
+        "observations": ((length, obs_dim), obs_dtype),
+        "actions": ((length, action_dim), np.float32),
+        "rewards": ((length,), np.float32),
+        "values": ((length,), np.float32),
+        "action_log_probs": ((length,), np.float32),
+        "dones": ((length,), np.float32),
+        "infos": ((length, n_info), np.float32),
+        "bootstrap_value": ((1,), np.float32),
+        "initial_hidden": ((2, lstm_layers, hidden_dim), np.float32),
+    }
+
+    arrays = {}
+    for i, name in enumerate(_SECTIONS):
+        shape, dtype = shapes[name]
+        offset = int(header[_H_OFFSETS + i])
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        raw = packed[offset:offset + nbytes].view(dtype).reshape(shape)
+        # astype copies, which also detaches us from the read-only object store view
+        arrays[name] = torch.from_numpy(raw.astype(np.float32))
+
+    infos = {
+        key: arrays["infos"][:, j].unsqueeze(0)
+        for j, key in enumerate(info_keys)
+    }
+
+    hidden_states = None
+    if hidden_dim > 0:
+        h, c = arrays["initial_hidden"].unsqueeze(2)  # [layers, 1, hidden] each
+        hidden_states = (h, c)
+
+    return Trajectory(
+        observations=arrays["observations"].unsqueeze(0),
+        actions=arrays["actions"].unsqueeze(0),
+        rewards=arrays["rewards"].unsqueeze(0),
+        values=arrays["values"].unsqueeze(0),
+        action_log_probs=arrays["action_log_probs"].unsqueeze(0),
+        hidden_states=hidden_states,
+        dones=arrays["dones"].unsqueeze(0),
+        infos=infos,
+        bootstrap_value=arrays["bootstrap_value"],
+    )
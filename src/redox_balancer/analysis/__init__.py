@@ -0,0 +1,20 @@
+"""Post-training analysis of sink constructs and metabolic models."""
+
+from .essentiality import essential_reactions, scan_essentiality
+from .pareto import construct_frontier, growth_fractions, sweep_frontiers
+from .producibility import check_producibility, missing_precursors
+from .top_constructs import harvest_constructs, rank_candidates, score_constructs, verify_candidates
+
+__all__ = [
+    "harvest_constructs",
+    "rank_candidates",
+    "verify_candidates",
+    "score_constructs",
+    "construct_frontier",
+    "growth_fractions",
+    "sweep_frontiers",
+    "scan_essentiality",
+    "essential_reactions",
+    "check_producibility",
+    "missing_precursors",
+]
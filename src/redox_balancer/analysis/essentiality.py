@@ -0,0 +1,152 @@
+"""Growth-essential reactions from single-reaction knockouts.
+
+cobra's ``single_reaction_deletion`` solves one LP per reaction. Most of
+those solves can be skipped. If a reaction carries no flux in an optimal
+(parsimonious) baseline solution, that solution is still feasible without
+it, so knocking it out cannot lower growth. Only reactions that carry flux
+are knocked out. Each worker toggles one reaction's bounds at a time on a
+single persistent solver, so every solve warm-starts from the last basis.
+Where the platform allows, workers are forked and share the parent's
+model instead of unpickling a copy.
+
+Results are cached per model fingerprint (reactions, bounds, objective),
+skipped reactions included. Which reactions a baseline leaves at zero flux
+can change between solves when the model has alternative optima, so the cache
+is consulted first. Rebuilding a core model, or re-running a scan, therefore
+reuses earlier knockouts.
+"""
+
+import logging
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from ..cache.fba_cache import FBAOutcomeCache, model_fingerprint
+
+logger = logging.getLogger(__name__)
+
+_worker_model = None
+
+
+def _init_worker(model):
+    """Keep the model a worker knocks reactions out of (inherited, not copied, when forked)."""
+    global _worker_model
+    _worker_model = model
+
+
+def knockout_growth(model, reaction_ids: Iterable[str]) -> List[Tuple[str, float, str]]:
+    """Growth with each reaction's bounds zeroed in turn, reusing one solver.
+
+    Returns:
+        (reaction ID, growth, solver status) per reaction; growth is 0 if infeasible
+    """
+    results = []
+    for rxn_id in reaction_ids:
+        rxn = model.reactions.get_by_id(rxn_id)
+        bounds = rxn.bounds
+        rxn.bounds = (0.0, 0.0)
+        try:
+            growth = model.slim_optimize(error_value=float('nan'))
+            status = model.solver.status
+        finally:
+            rxn.bounds = bounds
+        results.append((rxn_id, 0.0 if math.isnan(growth) else float(growth), status))
+    return results
+
+
+def _knockout_batch(reaction_ids: List[str]) -> List[Tuple[str, float, str]]:
+    return knockout_growth(_worker_model, reaction_ids)
+
+
+def scan_essentiality(
+    model,
+    reaction_ids: Optional[Iterable[str]] = None,
+    processes: Optional[int] = None,
+    cache_dir: Optional[str] = "cache/essentiality",
+    parsimonious: bool = True,
+    zero_flux: float = 1e-9,
+    batch_size: int = 64,
+) -> pd.DataFrame:
+    """Growth after knocking out each reaction.
+
+    Args:
+        model: COBRApy model with its medium and objective already set
+        reaction_ids: Reactions to test (all if None)
+        processes: Worker processes (cobra's configured default if None)
+        cache_dir: Knockout cache directory, namespaced by model fingerprint; None disables it
+        parsimonious: Use a pFBA baseline, whose sparser flux skips more reactions
+        zero_flux: Baseline flux at or below which a reaction is skipped
+        batch_size: Reactions per worker task
+
+    Returns:
+        DataFrame indexed by reaction ID with growth, relative_growth, status
+        and source ("skipped", "cache" or "solved")
+
+    Raises:
+        ValueError: If the model cannot grow
+    """
+    import cobra
+    from cobra.flux_analysis import pfba
+
+    reaction_ids = list(reaction_ids) if reaction_ids is not None else [r.id for r in model.reactions]
+    baseline = model.slim_optimize(error_value=float('nan'))
+    if math.isnan(baseline) or baseline <= 0:
+        raise ValueError("Model does not grow; set the medium and objective first")
+    fluxes = (pfba(model) if parsimonious else model.optimize()).fluxes
+
+    cache = FBAOutcomeCache(cache_dir, namespace=model_fingerprint(model)) if cache_dir else None
+    rows = {}
+    pending = []
+    for rxn_id in reaction_ids:
+        outcome = cache.get(("knockout", rxn_id)) if cache is not None else None
+        if outcome is not None:
+            rows[rxn_id] = (outcome['growth'], outcome['status'], "cache")
+        elif abs(fluxes[rxn_id]) <= zero_flux:
+            rows[rxn_id] = (baseline, "optimal", "skipped")
+            if cache is not None:
+                cache.put(("knockout", rxn_id), {'growth': baseline, 'status': "optimal"})
+        else:
+            pending.append(rxn_id)
+
+    logger.info(
+        f"Essentiality: {len(reaction_ids)} reactions, "
+        f"{sum(1 for r in rows.values() if r[2] == 'skipped')} skipped (no baseline flux), "
+        f"{sum(1 for r in rows.values() if r[2] == 'cache')} cached, {len(pending)} to solve"
+    )
+
+    processes = processes or cobra.Configuration().processes
+    if pending:
+        if processes > 1 and len(pending) > batch_size:
+            # Forked workers share the model; spawn pickles it once per worker
+            context = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=mp.get_context(context),
+                initializer=_init_worker,
+                initargs=(model,),
+            ) as pool:
+                results = [result for batch in pool.map(_knockout_batch, batches) for result in batch]
+        else:
+            results = knockout_growth(model, pending)
+
+        for rxn_id, growth, status in results:
+            rows[rxn_id] = (growth, status, "solved")
+            if cache is not None:
+                cache.put(("knockout", rxn_id), {'growth': growth, 'status': status})
+    if cache is not None:
+        cache.save_cache()
+
+    df = pd.DataFrame.from_dict(rows, orient="index", columns=["growth", "status", "source"])
+    df = df.loc[reaction_ids]
+    df.insert(1, "relative_growth", df["growth"] / baseline)
+    df.index.name = "reaction"
+    return df
+
+
+def essential_reactions(results: pd.DataFrame, threshold: float = 1e-6) -> Set[str]:
+    """Reactions whose knockout leaves growth below ``threshold``."""
+    return set(results.index[results["growth"] < threshold])
@@ -0,0 +1,296 @@
+"""Growth vs. redox trade-off frontiers from epsilon-constraint sweeps.
+
+Training mixes growth and redox into one reward with fixed weights
+(``biomass_penalty``, ``redox_weight``), so each trade-off setting needs its
+own run. Here a construct's whole trade-off is traced directly. Growth is
+held above a series of levels (the epsilon constraint) and NADH oxidation
+is maximized at each level. Between solves only the growth floor's bound
+changes, so the solver warm-starts from the previous basis. Secondary
+objectives (ATP maintenance, ROS production) are then optimized at each
+point with the primary held at its optimum.
+
+Frontiers for many constructs are computed across a process pool and
+streamed into a chunked results store: one episode row per construct and
+one step per frontier point. An interrupted sweep resumes where it stopped.
+"""
+
+import logging
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.constructs import Construct, ConstructEvaluator, absolute_flux
+from ..utils.results_store import ChunkedResultsWriter
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ("nadh_oxidation", "sink_flux")
+ROS_METABOLITES = ("o2s", "h2o2")
+
+# Reaction ID -> (forward weight, reverse weight), and "max" or "min". Minimized
+# objectives weight the gross forward and reverse fluxes. Maximized ones are
+# taken on net flux, ``(forward - reverse) * v``: maximizing the split variables
+# would just run reversible reactions both ways at once.
+SecondaryObjective = Tuple[Dict[str, Tuple[float, float]], str]
+
+_worker_evaluator: Optional[ConstructEvaluator] = None
+
+
+def gross_production(model, metabolites: Sequence[str]) -> Dict[str, Tuple[float, float]]:
+    """Weights whose flux sum is the gross production of metabolites, in any compartment."""
+    terms = {}
+    for rxn in model.reactions:
+        forward = reverse = 0.0
+        for met, coeff in rxn.metabolites.items():
+            if met.id.rsplit("_", 1)[0] in metabolites:
+                if coeff > 0:
+                    forward += coeff
+                else:
+                    reverse -= coeff
+        if forward or reverse:
+            terms[rxn.id] = (forward, reverse)
+    return terms
+
+
+def default_secondary_objectives(model) -> Dict[str, SecondaryObjective]:
+    """ATP maintenance flux (maximized) and ROS production (minimized), where the model has them."""
+    objectives = {}
+    if "ATPM" in model.reactions:
+        objectives["atp_maintenance"] = ({"ATPM": (1.0, 0.0)}, "max")
+    ros = gross_production(model, ROS_METABOLITES)
+    if ros:
+        objectives["ros_production"] = (ros, "min")
+    return objectives
+
+
+def growth_fractions(n_points: int = 11, min_fraction: float = 0.0, max_fraction: float = 1.0) -> List[float]:
+    """Growth floors, as fractions of baseline growth, from highest to lowest."""
+    return [float(f) for f in np.linspace(max_fraction, min_fraction, n_points)]
+
+
+def _weighted_flux(model, terms: Dict[str, Tuple[float, float]], direction: str = "min"):
+    """Objective expression for a secondary objective's weights (see SecondaryObjective)."""
+    reactions = [
+        (model.reactions.get_by_id(rxn_id), forward, reverse)
+        for rxn_id, (forward, reverse) in terms.items()
+        if rxn_id in model.reactions
+    ]
+    if direction == "max":
+        return sum((forward - reverse) * rxn.flux_expression for rxn, forward, reverse in reactions)
+    return sum(
+        forward * rxn.forward_variable + reverse * rxn.reverse_variable
+        for rxn, forward, reverse in reactions
+    )
+
+
+def _expressible(evaluator: ConstructEvaluator, construct: Construct) -> bool:
+    return all(evaluator.available(part.enzyme_id, part.compartment) for part in construct.parts)
+
+
+def construct_frontier(
+    evaluator: ConstructEvaluator,
+    construct: Construct,
+    fractions: Sequence[float],
+    objective: str = "nadh_oxidation",
+    secondary: Optional[Dict[str, SecondaryObjective]] = None,
+    medium: Optional[Dict[str, float]] = None,
+    tolerance: float = 1e-6,
+) -> List[Dict]:
+    """Trace one construct's trade-off between growth and the redox objective.
+
+    Args:
+        evaluator: Evaluator whose model holds the SINK reactions
+        construct: Construct to express (at least one part)
+        fractions: Growth floors as fractions of baseline growth
+        objective: "nadh_oxidation" or "sink_flux", maximized at each floor
+        secondary: Objectives optimized at each point with the primary held
+            within ``tolerance`` (relative) of its optimum
+        medium: Optional exchange lower bounds
+        tolerance: Relative slack on the primary for secondary solves
+
+    Returns:
+        One point per feasible floor, from the highest floor down, with
+        growth_fraction, growth_rate, relative_growth, sink_flux,
+        nadh_oxidation and each secondary objective
+
+    Raises:
+        ValueError: For an unknown objective, an empty construct or a part
+            with no SINK reaction in the model
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    if not construct.parts:
+        raise ValueError("A frontier needs a construct with at least one part")
+    if not _expressible(evaluator, construct):
+        raise ValueError(f"Construct {construct.key} has parts with no SINK reaction in the model")
+    from cobra.util.solver import linear_reaction_coefficients
+
+    model = evaluator.model
+    baseline = evaluator.baseline_growth
+    points = []
+    with model:
+        sink_ids = evaluator.express(construct, medium)
+        sinks = [model.reactions.get_by_id(rxn_id) for rxn_id in sink_ids]
+        growth_coefficients = linear_reaction_coefficients(model)
+        if objective == "nadh_oxidation":
+            primary = sum(-evaluator.nadh_coefficients[rxn.id] * rxn.flux_expression for rxn in sinks)
+        else:
+            # Reversible sinks get a direction binary, making this a MILP
+            magnitudes = [
+                absolute_flux(model, rxn, rxn.upper_bound, rxn.id in evaluator.reversible)
+                for rxn in sinks
+            ]
+            model.add_cons_vars([item for _, direction in magnitudes for item in direction])
+            primary = sum(magnitude for magnitude, _ in magnitudes)
+
+        floor = model.problem.Constraint(model.objective.expression, lb=0.0, name="pareto_growth_floor")
+        model.add_cons_vars([floor])
+        model.objective = model.problem.Objective(primary, direction="max")
+
+        for fraction in sorted(fractions, reverse=True):
+            # Only this bound changes, so each solve starts from the last basis
+            floor.lb = fraction * baseline
+            value = model.slim_optimize(error_value=float('nan'))
+            if math.isnan(value):
+                continue
+
+            fluxes = {rxn.id: rxn.flux for rxn in sinks}
+            growth = sum(coeff * rxn.flux for rxn, coeff in growth_coefficients.items())
+            point = {
+                'growth_fraction': fraction,
+                'growth_rate': growth,
+                'relative_growth': growth / baseline if baseline > 0 else 0.0,
+                'sink_flux': sum(abs(v) for v in fluxes.values()),
+                'nadh_oxidation': -sum(evaluator.nadh_coefficients[r] * v for r, v in fluxes.items()),
+            }
+
+            for name, (terms, direction) in (secondary or {}).items():
+                with model:
+                    model.add_cons_vars([model.problem.Constraint(
+                        primary, lb=value - tolerance * max(1.0, abs(value)), name="pareto_primary_floor"
+                    )])
+                    model.objective = model.problem.Objective(
+                        _weighted_flux(model, terms, direction), direction=direction
+                    )
+                    point[name] = model.slim_optimize(error_value=float('nan'))
+            points.append(point)
+
+    return points
+
+
+def _init_worker(model_path: str, enzyme_db: Dict, medium: Optional[Dict[str, float]]):
+    """Build one evaluator per worker process."""
+    global _worker_evaluator
+    import cobra
+
+    _worker_evaluator = ConstructEvaluator(
+        cobra.io.load_json_model(model_path), enzyme_db, medium=medium, copy_model=False
+    )
+
+
+def _frontier_batch(
+    keys: List[str],
+    fractions: Sequence[float],
+    objective: str,
+    secondary: Optional[Dict[str, SecondaryObjective]],
+) -> List[List[Dict]]:
+    return [
+        construct_frontier(_worker_evaluator, Construct.from_key(key), fractions, objective, secondary)
+        for key in keys
+    ]
+
+
+def make_frontier_pool(
+    model_path: str,
+    enzyme_db: Dict,
+    num_workers: int,
+    medium: Optional[Dict[str, float]] = None,
+) -> ProcessPoolExecutor:
+    """Worker pool whose processes each hold one evaluator."""
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path, enzyme_db, medium),
+    )
+
+
+def sweep_frontiers(
+    evaluator: ConstructEvaluator,
+    constructs: Sequence[Construct],
+    fractions: Sequence[float],
+    writer: ChunkedResultsWriter,
+    objective: str = "nadh_oxidation",
+    secondary: Optional[Dict[str, SecondaryObjective]] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    batch_size: int = 4,
+) -> int:
+    """Compute frontiers for many constructs and stream them into a results store.
+
+    Construct ``i`` is stored as episode ``i`` (row: construct key, point
+    count, best objective and growth), with its frontier points as steps.
+    Constructs already in the store, empty ones and ones with a part the
+    model has no SINK reaction for are skipped.
+
+    Args:
+        evaluator: Evaluator used in-process when there is no pool
+        constructs: Constructs in a fixed order (their index is the store key)
+        fractions: Growth floors as fractions of baseline growth
+        writer: Results store to append to
+        objective: "nadh_oxidation" or "sink_flux"
+        secondary: Secondary objectives (see construct_frontier)
+        pool: Pool from make_frontier_pool; frontiers run in-process if None
+        batch_size: Constructs per pool task
+
+    Returns:
+        Number of frontiers computed
+    """
+    pending = [
+        i for i, construct in enumerate(constructs)
+        if i not in writer.completed and construct.parts
+    ]
+    invalid = [i for i in pending if not _expressible(evaluator, constructs[i])]
+    if invalid:
+        # One bad construct would otherwise fail its whole batch, and with it the sweep
+        logger.warning(
+            f"Skipping {len(invalid)} constructs with parts the model cannot express: "
+            f"{[constructs[i].key for i in invalid[:10]]}"
+        )
+        pending = [i for i in pending if i not in invalid]
+    if not pending:
+        return 0
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    if pool is not None:
+        results = pool.map(
+            _frontier_batch,
+            [[constructs[i].key for i in batch] for batch in batches],
+            [fractions] * len(batches),
+            [objective] * len(batches),
+            [secondary] * len(batches),
+        )
+    else:
+        results = (
+            [construct_frontier(evaluator, constructs[i], fractions, objective, secondary) for i in batch]
+            for batch in batches
+        )
+
+    done = 0
+    for batch, frontiers in zip(batches, results):
+        for i, points in zip(batch, frontiers):
+            writer.add_episode(
+                {
+                    'episode': i,
+                    'construct': constructs[i].key,
+                    'points': len(points),
+                    f'max_{objective}': max((p[objective] for p in points), default=0.0),
+                    'max_relative_growth': max((p['relative_growth'] for p in points), default=0.0),
+                },
+                [{'step': j, **point} for j, point in enumerate(points)],
+            )
+            done += 1
+        logger.info(f"Frontiers: {done}/{len(pending)}")
+    return done
@@ -0,0 +1,130 @@
+"""Which metabolites a model can produce from its current medium.
+
+Testing one metabolite at a time by adding a demand reaction, switching the
+objective, optimizing and removing the reaction rebuilds solver state on
+every check. Here one zero-bounded demand per target is added up front.
+Each check then opens one demand's upper bound and sets its objective
+coefficient, solves, and closes it again. The solver warm-starts
+throughout, and the caller's model is unchanged afterwards.
+"""
+
+import logging
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_worker_model = None
+
+
+def _init_worker(model):
+    """Keep the model a worker checks (inherited, not copied, when forked)."""
+    global _worker_model
+    _worker_model = model
+
+
+def biomass_precursors(model, reaction_id: Optional[str] = None) -> List[str]:
+    """Metabolites consumed by the biomass reaction (the objective's reactions if not given)."""
+    if reaction_id is not None:
+        reactions = [model.reactions.get_by_id(reaction_id)]
+    else:
+        reactions = [rxn for rxn in model.reactions if rxn.objective_coefficient != 0]
+    return list(dict.fromkeys(
+        met.id for rxn in reactions for met, coeff in rxn.metabolites.items() if coeff < 0
+    ))
+
+
+def max_production(model, metabolite_ids: Iterable[str], max_flux: float = 1000.0) -> List[Tuple[str, float, str]]:
+    """Maximum demand flux for each metabolite, toggling pre-added demands on one solver.
+
+    Returns:
+        (metabolite ID, max production, solver status) per metabolite; 0 if infeasible
+    """
+    import cobra
+
+    metabolite_ids = list(metabolite_ids)
+    results = []
+    with model:  # Demand reactions and the objective are removed on exit
+        demands = []
+        for met_id in metabolite_ids:
+            demand = cobra.Reaction(f"PRODUCIBILITY_DM_{met_id}")
+            demand.add_metabolites({model.metabolites.get_by_id(met_id): -1})
+            demand.bounds = (0.0, 0.0)
+            demands.append(demand)
+        model.add_reactions(demands)
+        model.objective = model.problem.Objective(demands[0].flux_expression, direction="max")
+
+        for met_id, demand in zip(metabolite_ids, demands):
+            # Only this demand is open and in the objective
+            objective = {demand.forward_variable: 1, demand.reverse_variable: -1}
+            model.solver.objective.set_linear_coefficients(objective)
+            demand.upper_bound = max_flux
+            try:
+                value = model.slim_optimize(error_value=float('nan'))
+                status = model.solver.status
+            finally:
+                demand.upper_bound = 0.0
+                model.solver.objective.set_linear_coefficients({var: 0 for var in objective})
+            results.append((met_id, 0.0 if math.isnan(value) else float(value), status))
+
+    return results
+
+
+def _production_batch(metabolite_ids: List[str], max_flux: float) -> List[Tuple[str, float, str]]:
+    return max_production(_worker_model, metabolite_ids, max_flux)
+
+
+def check_producibility(
+    model,
+    metabolite_ids: Optional[Iterable[str]] = None,
+    processes: int = 1,
+    threshold: float = 1e-6,
+    max_flux: float = 1000.0,
+    batch_size: int = 32,
+) -> pd.DataFrame:
+    """Test whether each metabolite can be produced from the model's medium.
+
+    Args:
+        model: COBRApy model with its medium set
+        metabolite_ids: Metabolites to test (biomass precursors if None)
+        processes: Worker processes; forked workers share the model where possible
+        threshold: Minimum production counted as producible
+        max_flux: Upper bound opened on each demand
+        batch_size: Metabolites per worker task
+
+    Returns:
+        DataFrame indexed by metabolite with max_production, status and producible
+    """
+    metabolite_ids = list(metabolite_ids) if metabolite_ids is not None else biomass_precursors(model)
+    if not metabolite_ids:
+        return pd.DataFrame(columns=["max_production", "status", "producible"])
+
+    if processes > 1 and len(metabolite_ids) > batch_size:
+        context = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        batches = [metabolite_ids[i:i + batch_size] for i in range(0, len(metabolite_ids), batch_size)]
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp.get_context(context),
+            initializer=_init_worker,
+            initargs=(model,),
+        ) as pool:
+            results = [r for batch in pool.map(_production_batch, batches, [max_flux] * len(batches)) for r in batch]
+    else:
+        results = max_production(model, metabolite_ids, max_flux)
+
+    df = pd.DataFrame(results, columns=["metabolite", "max_production", "status"]).set_index("metabolite")
+    df["producible"] = df["max_production"] >= threshold
+    return df
+
+
+def missing_precursors(model, reaction_id: Optional[str] = None, processes: int = 1) -> List[str]:
+    """Biomass precursors the model cannot produce from its medium."""
+    results = check_producibility(model, biomass_precursors(model, reaction_id), processes=processes)
+    missing = results.index[~results["producible"]].tolist()
+    if missing:
+        logger.warning(f"{len(missing)}/{len(results)} biomass precursors cannot be produced: {missing[:10]}")
+    return missing
@@ -0,0 +1,315 @@
+"""Top-k sink constructs from evaluation logs, re-verified with exact FBA and FVA.
+
+Evaluation runs visit thousands of constructs but only a handful matter.
+This pipeline works in three passes, each more expensive than the last:
+
+1. Harvest every construct key in the evaluation results: chunked results
+   directories (episode rows and step traces) and ``evaluation.csv`` tables.
+2. Rank them by predicted NADH oxidation with no new LP solves. A construct
+   with a known outcome (``fba_*`` columns or the FBA outcome cache) is
+   scored by that outcome. Anything else gets its Vmax capacity, an upper
+   bound, so an unsolved construct is never ranked below what it could reach.
+3. Re-solve only the top k exactly, and run parallel flux variability
+   analysis over the redox reactions to see how much of each construct's
+   NADH oxidation the network can route around it.
+
+``scripts/top_constructs.py`` runs the whole pipeline and writes the report.
+"""
+
+import json
+import logging
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from ..utils.constructs import Construct, ConstructEvaluator, sink_reaction_id
+from ..utils.results_store import iter_result_chunks
+
+logger = logging.getLogger(__name__)
+
+# Metabolites (without compartment suffix) whose reactions count as redox reactions
+REDOX_METABOLITES = ("nad", "nadh")
+OUTCOME_FIELDS = ("status", "growth_rate", "relative_growth", "sink_flux", "nadh_oxidation")
+
+
+@dataclass
+class Candidate:
+    """A harvested construct with its evaluation statistics."""
+    construct: Construct
+    visits: int = 0
+    final_visits: int = 0
+    total_return: float = 0.0
+    best_return: float = -math.inf
+    outcome: Optional[Dict] = None
+    predicted: float = 0.0
+    predicted_from: str = ""
+
+    @property
+    def mean_return(self) -> float:
+        return self.total_return / self.final_visits if self.final_visits else math.nan
+
+
+def _add(candidates: Dict[str, Candidate], key, episode_return=None, outcome=None):
+    if not isinstance(key, str) or not key:
+        return
+    candidate = candidates.get(key)
+    if candidate is None:
+        candidate = candidates[key] = Candidate(Construct.from_key(key))
+    candidate.visits += 1
+    if episode_return is not None and not math.isnan(episode_return):
+        candidate.final_visits += 1
+        candidate.total_return += episode_return
+        candidate.best_return = max(candidate.best_return, episode_return)
+    if outcome is not None and candidate.outcome is None:
+        candidate.outcome = outcome
+
+
+def score_constructs(results_df: pd.DataFrame, evaluator: ConstructEvaluator) -> pd.DataFrame:
+    """Add exact FBA outcomes of each episode's final construct as ``fba_*`` columns."""
+    if "construct" not in results_df:
+        return results_df
+
+    outcomes = {
+        key: evaluator.evaluate(Construct.from_key(key))
+        for key in results_df["construct"].dropna().unique()
+    }
+    for field in OUTCOME_FIELDS:
+        results_df[f"fba_{field}"] = results_df["construct"].map(
+            lambda key: outcomes[key][field] if key in outcomes else math.nan
+        )
+    return results_df
+
+
+def _frame_outcomes(df: pd.DataFrame) -> List[Optional[Dict]]:
+    """Exact outcomes from ``fba_*`` columns written by score_constructs, if present."""
+    columns = [f"fba_{field}" for field in OUTCOME_FIELDS]
+    if not all(column in df for column in columns):
+        return [None] * len(df)
+    return [
+        None if pd.isna(row[1]) else dict(zip(OUTCOME_FIELDS, row))
+        for row in df[columns].itertuples(index=False, name=None)
+    ]
+
+
+def _result_sources(path: Path) -> List[Path]:
+    """Results directories and CSVs under a path; a chunked store wins over its CSV."""
+    if path.is_file():
+        return [path]
+    if any(path.glob("chunk_*.npz")):
+        return [path]
+    if (path / "evaluation").is_dir() and any((path / "evaluation").glob("chunk_*.npz")):
+        return [path / "evaluation"]
+    if (path / "evaluation.csv").exists():
+        return [path / "evaluation.csv"]
+    return []
+
+
+def harvest_constructs(paths: Iterable[str]) -> Dict[str, Candidate]:
+    """Collect every construct visited in evaluation results.
+
+    Args:
+        paths: Results directories, checkpoint directories holding
+            ``evaluation/`` or ``evaluation.csv``, or evaluation CSVs
+
+    Returns:
+        Candidates keyed by construct key
+    """
+    candidates: Dict[str, Candidate] = {}
+    for source in (s for p in paths for s in _result_sources(Path(p))):
+        before = len(candidates)
+        if source.is_file():
+            df = pd.read_csv(source)
+            if "construct" not in df:
+                logger.warning(f"No construct column in {source}, skipping")
+                continue
+            returns = df["return"] if "return" in df else [None] * len(df)
+            for key, episode_return, outcome in zip(df["construct"], returns, _frame_outcomes(df)):
+                _add(candidates, key, episode_return, outcome)
+            continue
+
+        for columns in iter_result_chunks(source, "episodes"):
+            if "construct" not in columns:
+                continue
+            returns = columns.get("return", [None] * len(columns["construct"]))
+            for key, episode_return in zip(columns["construct"], returns):
+                _add(candidates, str(key), None if episode_return is None else float(episode_return))
+        for columns in iter_result_chunks(source, "steps", columns=["construct"]):
+            for key in columns.get("construct", []):
+                _add(candidates, str(key))
+        logger.info(f"{source}: {len(candidates) - before} new constructs")
+
+    return candidates
+
+
+def predicted_nadh_oxidation(outcome: Dict, min_relative_growth: float = 0.0) -> float:
+    """Score of an exact outcome: NADH oxidation if the construct keeps enough growth, else 0."""
+    if outcome.get('status') != 'optimal' or outcome.get('relative_growth', 0.0) < min_relative_growth:
+        return 0.0
+    return float(outcome.get('nadh_oxidation', 0.0))
+
+
+def rank_candidates(
+    candidates: Dict[str, Candidate],
+    evaluator: ConstructEvaluator,
+    min_relative_growth: float = 0.0,
+) -> List[Candidate]:
+    """Order candidates by predicted NADH oxidation without solving any LPs.
+
+    Known outcomes (harvested or in the evaluator's caches) give exact
+    scores; the rest are scored by their Vmax capacity, which bounds them
+    from above. Ties fall back to the best observed episode return.
+    """
+    for candidate in candidates.values():
+        outcome = candidate.outcome or evaluator.cached(candidate.construct)
+        if outcome is not None:
+            candidate.outcome = outcome
+            candidate.predicted = predicted_nadh_oxidation(outcome, min_relative_growth)
+            candidate.predicted_from = "cache"
+        elif all(evaluator.available(p.enzyme_id, p.compartment) for p in candidate.construct.parts):
+            candidate.predicted = evaluator.nadh_capacity(candidate.construct)
+            candidate.predicted_from = "bound"
+        else:
+            candidate.predicted = 0.0
+            candidate.predicted_from = "invalid"
+
+    return sorted(
+        candidates.values(),
+        key=lambda c: (c.predicted, c.best_return, c.visits),
+        reverse=True,
+    )
+
+
+def redox_reactions(model, metabolites: Sequence[str] = REDOX_METABOLITES) -> List[str]:
+    """Reactions involving any compartment's copy of the given metabolites (SINK reactions excluded)."""
+    return [
+        rxn.id for rxn in model.reactions
+        if not rxn.id.startswith("SINK_")
+        and any(met.id.rsplit("_", 1)[0] in metabolites for met in rxn.metabolites)
+    ]
+
+
+def verify_candidates(
+    candidates: Sequence[Candidate],
+    evaluator: ConstructEvaluator,
+    reaction_ids: Sequence[str],
+    min_relative_growth: float = 0.0,
+    fraction_of_optimum: float = 1.0,
+    processes: Optional[int] = None,
+) -> pd.DataFrame:
+    """Re-solve candidates exactly and run FVA over the redox reactions.
+
+    Args:
+        candidates: Constructs to verify, in predicted order
+        evaluator: Evaluator for the model the constructs were designed on
+        reaction_ids: Redox reactions to vary (see redox_reactions)
+        min_relative_growth: Growth a construct must keep to score
+        fraction_of_optimum: Fraction of the construct's growth kept during FVA
+        processes: Worker processes for each FVA
+
+    Returns:
+        One row per candidate, sorted by verified NADH oxidation. The FVA
+        columns give the range of the construct's own NADH oxidation and how
+        many redox reactions can still vary by more than 1e-6.
+    """
+    rows = []
+    for i, candidate in enumerate(candidates):
+        construct = candidate.construct
+        outcome = evaluator.evaluate(construct, refresh=True)
+        row = {
+            'construct': construct.key,
+            'n_parts': len(construct.parts),
+            'total_copies': sum(p.copies for p in construct.parts),
+            'visits': candidate.visits,
+            'mean_return': candidate.mean_return,
+            'best_return': candidate.best_return if candidate.final_visits else math.nan,
+            'predicted_nadh_oxidation': candidate.predicted,
+            'predicted_from': candidate.predicted_from,
+            **outcome,
+            'score': predicted_nadh_oxidation(outcome, min_relative_growth),
+        }
+        if candidate.outcome is not None:
+            row['prediction_error'] = row['nadh_oxidation'] - candidate.outcome.get('nadh_oxidation', 0.0)
+
+        if outcome['status'] == 'optimal' and construct.parts:
+            ranges = evaluator.flux_ranges(
+                construct,
+                reaction_ids,
+                fraction_of_optimum=fraction_of_optimum,
+                processes=processes,
+            )
+            low = high = 0.0
+            for part in construct.parts:
+                rxn_id = sink_reaction_id(part.enzyme_id, part.compartment)
+                coeff = -evaluator.nadh_coefficients[rxn_id]
+                lo, hi = ranges[rxn_id]
+                low += min(coeff * lo, coeff * hi)
+                high += max(coeff * lo, coeff * hi)
+            row.update({
+                'fva_nadh_oxidation_min': low,
+                'fva_nadh_oxidation_max': high,
+                'fva_variable_reactions': sum(
+                    1 for rxn_id in reaction_ids if ranges[rxn_id][1] - ranges[rxn_id][0] > 1e-6
+                ),
+            })
+        rows.append(row)
+        logger.info(f"[{i + 1}/{len(candidates)}] {construct.key}: {outcome['status']}, "
+                    f"NADH oxidation {outcome['nadh_oxidation']:.4f}")
+
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df = df.sort_values(['score', 'relative_growth'], ascending=False, ignore_index=True)
+        df.insert(0, 'rank', range(1, len(df) + 1))
+    return df
+
+
+def write_report(
+    verified: pd.DataFrame,
+    output_dir: str,
+    summary: Dict,
+    markdown_rows: int = 20,
+) -> Dict[str, Path]:
+    """Write top_constructs.csv, summary.json and report.md.
+
+    Returns:
+        Paths of the written files keyed by format
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        'csv': output_dir / "top_constructs.csv",
+        'json': output_dir / "summary.json",
+        'markdown': output_dir / "report.md",
+    }
+
+    verified.to_csv(paths['csv'], index=False)
+    with open(paths['json'], "w") as f:
+        json.dump({**summary, 'top': verified.head(markdown_rows).to_dict(orient="records")}, f, indent=2, default=str)
+
+    lines = [
+        "# Top sink constructs",
+        "",
+        f"- Sources: {', '.join(summary['sources'])}",
+        f"- Constructs harvested: {summary['harvested']}",
+        f"- Re-verified with exact FBA and FVA: {summary['verified']}"
+        f" (over {summary['redox_reactions']} redox reactions)",
+        f"- Baseline growth: {summary['baseline_growth']:.4f}; minimum relative growth: {summary['min_relative_growth']}",
+        "",
+        "| Rank | Construct | Visits | Growth | NADH oxidation | FVA range | Predicted |",
+        "|---:|---|---:|---:|---:|---|---:|",
+    ]
+    for row in verified.head(markdown_rows).to_dict(orient="records"):
+        fva = (
+            f"{row['fva_nadh_oxidation_min']:.4f} – {row['fva_nadh_oxidation_max']:.4f}"
+            if not pd.isna(row.get('fva_nadh_oxidation_min', math.nan)) else "n/a"
+        )
+        lines.append(
+            f"| {row['rank']} | `{row['construct']}` | {row['visits']} | {row['relative_growth']:.1%} | "
+            f"{row['nadh_oxidation']:.4f} | {fva} | {row['predicted_nadh_oxidation']:.4f} ({row['predicted_from']}) |"
+        )
+    paths['markdown'].write_text("\n".join(lines) + "\n")
+
+    return paths
+
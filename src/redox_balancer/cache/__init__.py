@@ -1,3 +1,4 @@
 from .delta_cache import DeltaCache, FluxDelta
+from .fba_cache import FBAOutcomeCache, model_fingerprint
 
-__all__ = ["DeltaCache", "FluxDelta"]
\ No newline at end of file
+__all__ = ["DeltaCache", "FluxDelta", "FBAOutcomeCache", "model_fingerprint"]
@@ -0,0 +1,109 @@
+"""Persistent cache of exact FBA outcomes for sink constructs.
+
+Outcomes are keyed by construct and medium. They are stored under a
+fingerprint of the compiled model, so that results from different models,
+default media or enzyme libraries never mix. Evaluations of different
+checkpoints, and repeated sweeps, reuse each other's solves.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def model_fingerprint(model, extra: Optional[Dict] = None) -> str:
+    """Short hash of a model's reactions, bounds and objective.
+
+    Args:
+        model: COBRApy model
+        extra: JSON-serializable inputs the outcomes also depend on but the
+            model does not hold, e.g. the Vmax of zero-bounded SINK reactions
+    """
+    digest = hashlib.sha1()
+    for rxn in sorted(model.reactions, key=lambda r: r.id):
+        digest.update(f"{rxn.id}|{rxn.reaction}|{rxn.lower_bound}|{rxn.upper_bound}\n".encode())
+    digest.update(str(model.objective.expression).encode())
+    if extra:
+        digest.update(json.dumps(extra, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+class FBAOutcomeCache:
+    """Disk-backed mapping of (construct, medium) keys to FBA outcome dicts."""
+    
+    def __init__(self, cache_dir: str = "cache/fba_outcomes", namespace: str = "default"):
+        """Load outcomes cached for ``namespace`` (normally a model fingerprint).
+        
+        Args:
+            cache_dir: Directory holding one pickle per namespace
+            namespace: Keeps outcomes of different models apart
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.path = self.cache_dir / f"{namespace}.pkl"
+        
+        self.outcomes: Dict[Hashable, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        
+        self._load_cache()
+        
+    def _load_cache(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                self.outcomes = pickle.load(f)
+            logger.info(f"Loaded {len(self.outcomes)} cached FBA outcomes from {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load FBA outcome cache: {e}")
+            
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Cached outcome for a key, counting hits and misses."""
+        outcome = self.outcomes.get(key)
+        if outcome is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return outcome
+        
+    def put(self, key: Hashable, outcome: Dict):
+        self.outcomes[key] = outcome
+        self._dirty = True
+        
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.outcomes
+        
+    def __len__(self) -> int:
+        return len(self.outcomes)
+        
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.outcomes),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+        
+    def save_cache(self):
+        """Persist new outcomes; written to a temp file and renamed so readers never see a partial pickle."""
+        if not self._dirty:
+            return
+            
+        tmp_path = self.path.with_suffix(".pkl.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self.outcomes, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        
+        with open(self.cache_dir / f"{self.namespace}_summary.json", "w") as f:
+            json.dump(self.stats(), f, indent=2)
@@ -1,9 +1,10 @@
 """Enzyme library interface for loading from BRENDA/UniProt data."""
 
+import numpy as np
 import pandas as pd
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
 from pydantic import BaseModel, Field, validator, ValidationError
 
@@ -16,13 +17,18 @@ class EnzymeSchema(BaseModel):
     substrates: Optional[List[str]] = Field(None, description="List of substrate names")
     products: Optional[List[str]] = Field(None, description="List of product names")
     kcat: float = Field(..., gt=0, description="Catalytic rate constant (1/s)")
-    km: Optional[float] = Field(None, gt=0, description="Michaelis constant (mM)")
+    km: Optional[Union[float, Dict[str, float]]] = Field(
+        None, description="Michaelis constant (mM), or per-substrate constants"
+    )
     specificity: Optional[float] = Field(None, ge=0, le=1, description="Substrate specificity")
     cofactors: Optional[List[str]] = Field(default_factory=list, description="Required cofactors")
     reaction: Optional[str] = Field(None, description="Reaction string")
     organism: Optional[str] = Field(None, description="Source organism")
     temperature: Optional[float] = Field(None, description="Optimal temperature")
     pH: Optional[float] = Field(None, description="Optimal pH")
+    compartments: Optional[List[str]] = Field(
+        None, description="Compartments the enzyme can be targeted to (any if unset)"
+    )
     
     @validator('cofactors', pre=True)
     def parse_cofactors(cls, v):
@@ -31,6 +37,14 @@ class EnzymeSchema(BaseModel):
             # Handle comma-separated strings
             return [c.strip() for c in v.split(',')]
         return v or []
+        
+    @validator('km')
+    def check_km(cls, v):
+        """Michaelis constants must be positive."""
+        values = v.values() if isinstance(v, dict) else [v]
+        if any(km is not None and km <= 0 for km in values):
+            raise ValueError("km must be positive")
+        return v
 
 
 class EnzymeLibrary:
@@ -71,6 +85,10 @@ class EnzymeLibrary:
                 raw_data = {d.get("id") or d.get("enzyme_id") or str(i): d
                            for i, d in enumerate(raw_data)}
             # ----------------------------------------------------------------------
+            
+            # Curated libraries wrap the records as {"enzymes": {...}, "metadata": {...}}
+            if isinstance(raw_data, dict) and isinstance(raw_data.get("enzymes"), dict):
+                raw_data = raw_data["enzymes"]
                 
             if validate:
                 self.enzymes = self._validate_enzymes(raw_data)
@@ -198,16 +216,22 @@ class EnzymeLibrary:
             return {}
             
         kcats = [e['kcat'] for e in self.enzymes.values()]
-        kms = [e['km'] for e in self.enzymes.values()]
+        kms = []
+        for e in self.enzymes.values():
+            km = e.get('km')
+            if isinstance(km, dict):
+                kms.extend(km.values())
+            elif km is not None:
+                kms.append(km)
         
         return {
             'count': len(self.enzymes),
             'mean_kcat': sum(kcats) / len(kcats),
             'min_kcat': min(kcats),
             'max_kcat': max(kcats),
-            'mean_km': sum(kms) / len(kms),
-            'min_km': min(kms),
-            'max_km': max(kms),
+            'mean_km': sum(kms) / len(kms) if kms else float('nan'),
+            'min_km': min(kms) if kms else float('nan'),
+            'max_km': max(kms) if kms else float('nan'),
         }
         
     def to_action_space(self) -> Tuple[List[str], Dict[str, int]]:
@@ -221,6 +245,24 @@ class EnzymeLibrary:
         enzyme_to_idx = {ec: idx for idx, ec in enumerate(enzyme_list)}
         return enzyme_list, enzyme_to_idx
         
+    def action_mask(self, compartments: Sequence[str] = ('c', 'm', 'p')) -> np.ndarray:
+        """Valid (enzyme, compartment) pairs for the sink designer's action space.
+        
+        Args:
+            compartments: Compartment IDs in action index order
+            
+        Returns:
+            Boolean array [n_enzymes, n_compartments], rows ordered as in
+            to_action_space(); enzymes that declare no compartments allow all
+        """
+        enzyme_list, _ = self.to_action_space()
+        mask = np.ones((len(enzyme_list), len(compartments)), dtype=bool)
+        for i, ec in enumerate(enzyme_list):
+            allowed = self.enzymes[ec].get('compartments')
+            if allowed is not None:
+                mask[i] = [comp in allowed for comp in compartments]
+        return mask
+        
     def save_as_json(self, path: str):
         """Save enzyme library as JSON."""
         with open(path, 'w') as f:
@@ -0,0 +1,15 @@
+"""Direct (non-RL) search over sink constructs."""
+
+from .construct_search import ConstructSearch, SearchResult, make_search_pool
+from .milp import MILPResult, solve_construct_milp
+from .pareto import dominates, pareto_front
+
+__all__ = [
+    "ConstructSearch",
+    "SearchResult",
+    "make_search_pool",
+    "MILPResult",
+    "solve_construct_milp",
+    "dominates",
+    "pareto_front",
+]
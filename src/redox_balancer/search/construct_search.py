@@ -0,0 +1,282 @@
+"""Beam and branch-and-bound search over sink constructs, without RL.
+
+The construct space is small enough to search directly: library enzymes x
+compartments x copy numbers, with a few slots. Search grows constructs one
+part at a time, adding parts in a fixed (enzyme, compartment) order so each
+set is generated once. At every depth:
+
+1. Children are scored cheaply. Their Vmax capacity bounds the objective
+   from above, and it is scaled by DeltaCache's growth prediction when one
+   is available.
+2. A child is pruned if even its best completion (remaining slots filled
+   with the highest-capacity later parts) cannot beat the best verified
+   construct. It is also pruned if DeltaCache confidently predicts it loses
+   too much growth.
+3. The best ``beam_width`` children are solved exactly with FBA, in batches
+   across a process pool. The feasible ones form the next beam.
+
+With ``beam_width=None`` every surviving child is solved, which makes this a
+plain branch and bound. The result holds every exact outcome and their
+Pareto front over sink flux and growth.
+"""
+
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .pareto import pareto_front
+from ..utils.constructs import COMPARTMENTS, Construct, ConstructEvaluator, ConstructPart
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ("sink_flux", "nadh_oxidation")
+
+_worker_evaluator: Optional[ConstructEvaluator] = None
+
+
+def _init_worker(model_path: str, enzyme_db: Dict, medium: Optional[Dict[str, float]]):
+    """Build one evaluator per worker process."""
+    global _worker_evaluator
+    import cobra
+
+    _worker_evaluator = ConstructEvaluator(
+        cobra.io.load_json_model(model_path), enzyme_db, medium=medium, copy_model=False
+    )
+
+
+def _evaluate_batch(keys: List[str]) -> List[Dict]:
+    return [_worker_evaluator.evaluate(Construct.from_key(key)) for key in keys]
+
+
+def make_search_pool(
+    model_path: str,
+    enzyme_db: Dict,
+    num_workers: int,
+    medium: Optional[Dict[str, float]] = None,
+) -> ProcessPoolExecutor:
+    """Worker pool whose processes each hold one evaluator for exact FBA."""
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path, enzyme_db, medium),
+    )
+
+
+@dataclass
+class SearchResult:
+    """Exact outcomes found by a search."""
+    best: Optional[Dict]
+    pareto: List[Dict]
+    outcomes: Dict[str, Dict]
+    stats: Dict[str, int] = field(default_factory=dict)
+
+
+class ConstructSearch:
+    """Searches constructs for the highest sink flux that keeps growth."""
+
+    def __init__(
+        self,
+        evaluator: ConstructEvaluator,
+        enzyme_ids: Optional[Sequence[str]] = None,
+        compartments: Sequence[str] = COMPARTMENTS,
+        max_parts: int = 4,
+        max_copies: int = 8,
+        objective: str = "sink_flux",
+        min_relative_growth: float = 0.9,
+        delta_cache=None,
+        min_confidence: float = 0.5,
+        growth_slack: float = 0.05,
+        pool: Optional[ProcessPoolExecutor] = None,
+        batch_size: int = 16,
+    ):
+        """Set up the search space.
+
+        Args:
+            evaluator: Exact FBA evaluator; its caches are consulted before solving
+            enzyme_ids: Library enzymes to use (all with SINK reactions if None)
+            compartments: Compartments to express in
+            max_parts: Maximum (enzyme, compartment) pairs per construct
+            max_copies: Maximum copy number per part
+            objective: "sink_flux" or "nadh_oxidation"
+            min_relative_growth: Fraction of baseline growth a construct must keep
+            delta_cache: Optional DeltaCache whose growth predictions prune and rank children
+            min_confidence: Only trust DeltaCache predictions at least this confident
+            growth_slack: Predicted growth may fall this far below min_relative_growth
+                before a child is pruned, since the prediction is approximate
+            pool: Pool from make_search_pool; solves run in-process if None
+            batch_size: Constructs per pool task
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        self.evaluator = evaluator
+        self.max_parts = max_parts
+        self.max_copies = max_copies
+        self.objective = objective
+        self.min_relative_growth = min_relative_growth
+        self.delta_cache = delta_cache
+        self.min_confidence = min_confidence
+        self.growth_slack = growth_slack
+        self.pool = pool
+        self.batch_size = batch_size
+
+        enzyme_ids = enzyme_ids if enzyme_ids is not None else sorted(evaluator.enzyme_db)
+        self.pairs: List[Tuple[str, str]] = sorted(
+            (enzyme_id, comp)
+            for enzyme_id in enzyme_ids
+            for comp in compartments
+            if evaluator.available(enzyme_id, comp)
+        )
+        self._index = {pair: i for i, pair in enumerate(self.pairs)}
+
+        # Highest capacities among pairs[i:], for bounding the best completion of a node
+        best_capacity = [self.capacity(Construct((ConstructPart(*pair, max_copies),))) for pair in self.pairs]
+        self._suffix_top: List[List[float]] = [[] for _ in range(len(self.pairs) + 1)]
+        for i in range(len(self.pairs) - 1, -1, -1):
+            self._suffix_top[i] = sorted(self._suffix_top[i + 1] + [best_capacity[i]], reverse=True)[:max_parts]
+
+        self.outcomes: Dict[str, Dict] = {}
+        self.stats = {'expanded': 0, 'pruned_bound': 0, 'pruned_growth': 0, 'evaluated': 0, 'solves': 0}
+
+    def capacity(self, construct: Construct) -> float:
+        """Upper bound on the objective: every part running at Vmax."""
+        if self.objective == "nadh_oxidation":
+            return self.evaluator.nadh_capacity(construct)
+        return sum(self.evaluator.vmax(part) for part in construct.parts)
+
+    def completion_bound(self, construct: Construct) -> float:
+        """Upper bound on the objective over the construct and all its descendants."""
+        slots = self.max_parts - len(construct.parts)
+        start = self._next_index(construct)
+        return self.capacity(construct) + sum(self._suffix_top[start][:slots])
+
+    def predicted_growth(self, construct: Construct) -> Optional[float]:
+        """DeltaCache relative growth estimate, or None if unavailable or not confident."""
+        if self.delta_cache is None or not construct.parts:
+            return None
+        prediction = self.delta_cache.get_construct_prediction(
+            [p.enzyme_id for p in construct.parts],
+            [p.compartment for p in construct.parts],
+            [p.copies for p in construct.parts],
+        )
+        if prediction["confidence"] < self.min_confidence:
+            return None
+        return float(prediction["growth_rate"])
+
+    def feasible(self, outcome: Dict) -> bool:
+        return outcome['status'] == 'optimal' and outcome['relative_growth'] >= self.min_relative_growth
+
+    def score(self, outcome: Dict) -> float:
+        """Objective of an exact outcome; 0 if it does not keep enough growth."""
+        return float(outcome[self.objective]) if self.feasible(outcome) else 0.0
+
+    def _next_index(self, construct: Construct) -> int:
+        if not construct.parts:
+            return 0
+        return max(self._index[(p.enzyme_id, p.compartment)] for p in construct.parts) + 1
+
+    def children(self, construct: Construct) -> Iterator[Construct]:
+        """Constructs with one more part, added after the construct's last (enzyme, compartment)."""
+        if len(construct.parts) >= self.max_parts:
+            return
+        existing = [(p.enzyme_id, p.compartment, p.copies) for p in construct.parts]
+        for enzyme_id, comp in self.pairs[self._next_index(construct):]:
+            for copies in range(1, self.max_copies + 1):
+                yield Construct.from_parts(existing + [(enzyme_id, comp, copies)])
+
+    def evaluate(self, constructs: Sequence[Construct]) -> List[Dict]:
+        """Exact outcomes, solving only what no cache holds; solves are batched across the pool."""
+        pending = []
+        for construct in constructs:
+            if construct.key in self.outcomes:
+                continue
+            cached = self.evaluator.cached(construct)
+            if cached is not None:
+                self.outcomes[construct.key] = cached
+            else:
+                pending.append(construct.key)
+
+        if pending:
+            if self.pool is not None:
+                batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+                results = [outcome for batch in self.pool.map(_evaluate_batch, batches) for outcome in batch]
+            else:
+                results = [self.evaluator.evaluate(Construct.from_key(key)) for key in pending]
+            for key, outcome in zip(pending, results):
+                self.outcomes[key] = outcome
+                if self.evaluator.outcome_cache is not None:
+                    self.evaluator.outcome_cache.put((key, ()), outcome)
+            self.stats['solves'] += len(pending)
+
+        self.stats['evaluated'] += len(constructs)
+        return [self.outcomes[construct.key] for construct in constructs]
+
+    def run(self, beam_width: Optional[int] = 32) -> SearchResult:
+        """Search depth by depth.
+
+        Args:
+            beam_width: Children solved and kept per depth; None solves every
+                child that survives pruning (branch and bound)
+
+        Returns:
+            SearchResult with the best feasible construct, the Pareto front
+            over sink flux and growth, every exact outcome and search counters
+        """
+        beam = [Construct(())]
+        incumbent = 0.0
+        growth_floor = self.min_relative_growth - self.growth_slack
+
+        for depth in range(1, self.max_parts + 1):
+            candidates: Dict[str, Tuple[Construct, float]] = {}
+            for node in beam:
+                for child in self.children(node):
+                    self.stats['expanded'] += 1
+                    if child.key in candidates or child.key in self.outcomes:
+                        continue
+                    if self.completion_bound(child) <= incumbent:
+                        self.stats['pruned_bound'] += 1
+                        continue
+                    growth = self.predicted_growth(child)
+                    if growth is not None and growth < growth_floor:
+                        self.stats['pruned_growth'] += 1
+                        continue
+                    candidates[child.key] = (child, self.capacity(child) * (1.0 if growth is None else growth))
+
+            if not candidates:
+                break
+            ranked = sorted(candidates.values(), key=lambda item: item[1], reverse=True)
+            selected = [construct for construct, _ in ranked[:beam_width]]
+            outcomes = self.evaluate(selected)
+
+            scored = sorted(
+                ((self.score(outcome), construct) for construct, outcome in zip(selected, outcomes)
+                 if self.feasible(outcome)),
+                key=lambda item: item[0],
+                reverse=True,
+            )
+            if scored:
+                incumbent = max(incumbent, scored[0][0])
+            beam = [construct for _, construct in scored]
+            logger.info(
+                f"Depth {depth}: {len(candidates)} candidates, {len(selected)} verified, "
+                f"{len(beam)} feasible, best {self.objective} {incumbent:.4f}"
+            )
+            if not beam:
+                break
+
+        points = [
+            {'construct': key, **outcome}
+            for key, outcome in self.outcomes.items()
+            if outcome['status'] == 'optimal'
+        ]
+        feasible = [p for p in points if self.feasible(p)]
+        best = max(feasible, key=self.score) if feasible else None
+        return SearchResult(
+            best=best,
+            pareto=pareto_front(points, (self.objective, "growth_rate")),
+            outcomes=dict(self.outcomes),
+            stats=dict(self.stats),
+        )
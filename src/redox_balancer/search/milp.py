@@ -0,0 +1,180 @@
+"""Optimal constructs from a single mixed-integer linear program.
+
+The evaluator's model already holds a zero-bounded SINK reaction for every
+expressible (enzyme, compartment). The MILP adds, per SINK reaction ``r``:
+
+- an integer copy number ``n_r`` in ``[0, max_copies]``,
+- a binary ``y_r`` marking the pair as used (``y_r <= n_r <= max_copies * y_r``),
+- capacity constraints ``v_r <= vmax_r * n_r`` on the forward flux and, for
+  reversible reactions, on the reverse flux,
+- for the sink flux objective and reversible reactions, a binary direction
+  so that forward and reverse flux are never both counted (see absolute_flux).
+
+Together with ``sum(y_r) <= max_parts`` and a growth floor of
+``min_relative_growth`` times baseline on the model objective, maximizing
+NADH oxidation (or total sink flux) gives the globally optimal construct
+in one solve. The chosen construct is then re-scored with the evaluator, so
+its row matches the ``fba_*`` columns ``scripts/eval_agents.py`` writes.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from .construct_search import OBJECTIVES
+from ..utils.constructs import (
+    COMPARTMENTS,
+    Construct,
+    ConstructEvaluator,
+    ConstructPart,
+    absolute_flux,
+    sink_reaction_id,
+)
+
+logger = logging.getLogger(__name__)
+
+# Solver statuses that come with a feasible solution (the incumbent, if stopped early)
+INCUMBENT_STATUSES = ("optimal", "feasible", "suboptimal", "time_limit")
+
+
+@dataclass
+class MILPResult:
+    """Construct chosen by the MILP and its exact FBA outcome."""
+    construct: Construct
+    status: str
+    objective_value: float
+    outcome: Dict
+    seconds: float
+
+    def to_row(self) -> Dict:
+        """Row in the layout of eval_agents.py's evaluation.csv (``construct`` plus ``fba_*``)."""
+        return {
+            'construct': self.construct.key,
+            **{f"fba_{key}": value for key, value in self.outcome.items()},
+            'milp_status': self.status,
+            'milp_objective': self.objective_value,
+            'milp_seconds': self.seconds,
+        }
+
+
+def solve_construct_milp(
+    evaluator: ConstructEvaluator,
+    objective: str = "nadh_oxidation",
+    max_parts: int = 4,
+    max_copies: int = 8,
+    min_relative_growth: float = 0.95,
+    enzyme_ids: Optional[Sequence[str]] = None,
+    compartments: Sequence[str] = COMPARTMENTS,
+    time_limit: Optional[float] = None,
+) -> MILPResult:
+    """Solve for the construct maximizing the objective subject to the growth floor.
+
+    Args:
+        evaluator: Evaluator whose model holds the SINK reactions
+        objective: "nadh_oxidation" or "sink_flux"
+        max_parts: Maximum (enzyme, compartment) pairs
+        max_copies: Maximum copies per pair
+        min_relative_growth: Growth floor as a fraction of baseline
+        enzyme_ids: Library enzymes to consider (all if None)
+        compartments: Compartments to consider
+        time_limit: Solver time limit in seconds; the best construct found so
+            far is returned, with status "time_limit", if it is reached
+
+    Returns:
+        MILPResult; an empty construct if the MILP found no solution
+
+    Raises:
+        ValueError: For an unknown objective, a model that cannot grow or
+            no expressible SINK reactions
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    if not evaluator.baseline_growth > 0:
+        raise ValueError("Baseline growth must be positive to set a growth floor")
+
+    model = evaluator.model
+    enzyme_ids = enzyme_ids if enzyme_ids is not None else sorted(evaluator.enzyme_db)
+    pairs = [
+        (enzyme_id, comp)
+        for enzyme_id in enzyme_ids
+        for comp in compartments
+        if evaluator.available(enzyme_id, comp)
+    ]
+    if not pairs:
+        raise ValueError("No SINK reactions available for the given enzymes and compartments")
+
+    start = time.time()
+    with model:  # Variables, constraints, bounds and objective are reverted on exit
+        prob = model.problem
+        growth = model.objective.expression
+
+        copies = {}
+        used = []
+        objective_terms = []
+        for enzyme_id, comp in pairs:
+            rxn = model.reactions.get_by_id(sink_reaction_id(enzyme_id, comp))
+            vmax = evaluator.vmax(ConstructPart(enzyme_id, comp, 1))
+            reversible = rxn.id in evaluator.reversible
+            rxn.bounds = (-vmax * max_copies if reversible else 0.0, vmax * max_copies)
+
+            n = prob.Variable(f"copies_{rxn.id}", lb=0, ub=max_copies, type="integer")
+            y = prob.Variable(f"used_{rxn.id}", type="binary")
+            constraints = [
+                prob.Constraint(rxn.forward_variable - vmax * n, ub=0, name=f"capacity_fwd_{rxn.id}"),
+                prob.Constraint(n - y, lb=0, name=f"used_min_{rxn.id}"),
+                prob.Constraint(n - max_copies * y, ub=0, name=f"used_max_{rxn.id}"),
+            ]
+            if reversible:
+                constraints.append(
+                    prob.Constraint(rxn.reverse_variable - vmax * n, ub=0, name=f"capacity_rev_{rxn.id}")
+                )
+            if objective == "nadh_oxidation":
+                objective_terms.append(-evaluator.nadh_coefficients[rxn.id] * rxn.flux_expression)
+            else:
+                magnitude, direction = absolute_flux(model, rxn, vmax * max_copies, reversible)
+                objective_terms.append(magnitude)
+                constraints.extend(direction)
+            model.add_cons_vars([n, y, *constraints])
+            copies[(enzyme_id, comp)] = n
+            used.append(y)
+
+        model.add_cons_vars([
+            prob.Constraint(sum(used), ub=max_parts, name="max_parts"),
+            prob.Constraint(growth, lb=min_relative_growth * evaluator.baseline_growth, name="growth_floor"),
+        ])
+        model.objective = prob.Objective(sum(objective_terms), direction="max")
+        timeout = model.solver.configuration.timeout
+        try:  # The timeout is solver configuration, which ``with model`` does not revert
+            if time_limit is not None:
+                model.solver.configuration.timeout = time_limit
+            status = model.solver.optimize()
+        finally:
+            model.solver.configuration.timeout = timeout
+
+        objective_value, chosen = 0.0, []
+        if status in INCUMBENT_STATUSES:
+            primals = {pair: n.primal for pair, n in copies.items()}
+            if all(value is not None for value in primals.values()):
+                objective_value = float(model.solver.objective.value)
+                chosen = [
+                    (enzyme_id, comp, int(round(value)))
+                    for (enzyme_id, comp), value in primals.items()
+                    if round(value) > 0
+                ]
+        if status != "optimal":
+            logger.warning(f"MILP stopped with status {status}; the construct may not be optimal")
+
+    seconds = time.time() - start
+    construct = Construct.from_parts(chosen)
+    logger.info(
+        f"MILP over {len(pairs)} SINK reactions: {status} in {seconds:.1f}s, "
+        f"{objective} {objective_value:.4f}, construct {construct.key or '(none)'}"
+    )
+    return MILPResult(
+        construct=construct,
+        status=status,
+        objective_value=objective_value,
+        outcome=evaluator.evaluate(construct),
+        seconds=seconds,
+    )
@@ -0,0 +1,34 @@
+"""Pareto fronts over construct outcomes."""
+
+from typing import Dict, List, Sequence
+
+
+def dominates(a: Dict, b: Dict, objectives: Sequence[str]) -> bool:
+    """Whether ``a`` is at least as good as ``b`` everywhere and better somewhere (all maximized)."""
+    return (
+        all(a[name] >= b[name] for name in objectives)
+        and any(a[name] > b[name] for name in objectives)
+    )
+
+
+def pareto_front(
+    points: Sequence[Dict],
+    objectives: Sequence[str] = ("sink_flux", "growth_rate"),
+) -> List[Dict]:
+    """Non-dominated points, maximizing every objective.
+
+    Args:
+        points: Outcome dicts holding each objective
+        objectives: Keys to maximize
+
+    Returns:
+        The front, sorted by the first objective (descending). Points with
+        identical objective values are all kept.
+    """
+    ordered = sorted(points, key=lambda p: tuple(p[name] for name in objectives), reverse=True)
+    front: List[Dict] = []
+    for point in ordered:
+        # Sorted order means no later point can dominate one already on the front
+        if not any(dominates(kept, point, objectives) for kept in front):
+            front.append(point)
+    return front
@@ -0,0 +1,14 @@
+"""Local policy serving with dynamic batching."""
+
+from .batcher import DynamicBatcher
+from .client import PolicyClient
+from .metrics import ServingMetrics
+from .server import PolicyService, create_server
+
+__all__ = [
+    "DynamicBatcher",
+    "PolicyClient",
+    "PolicyService",
+    "ServingMetrics",
+    "create_server",
+]
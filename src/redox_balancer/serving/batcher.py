@@ -0,0 +1,113 @@
+"""Dynamic batching of concurrent inference requests."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence
+
+from .metrics import ServingMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """Collects items from concurrent callers and runs them through one batch function.
+
+    A single worker thread takes the first queued request, keeps pulling
+    more until ``max_batch_size`` items are gathered or ``max_wait_ms`` has
+    passed, runs ``process_batch`` once and hands each caller its slice of
+    the results. Because only the worker calls ``process_batch``, it may use
+    state that is not thread-safe (such as a solver-backed model).
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List], List],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        metrics: Optional[ServingMetrics] = None,
+    ):
+        """Start the worker thread.
+
+        Args:
+            process_batch: Maps a list of items to a list of results of equal length
+            max_batch_size: Upper bound on items per batch (a larger single request still runs whole)
+            max_wait_ms: How long to wait for more requests once one is queued
+            metrics: Where batch sizes and durations are recorded
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.metrics = metrics or ServingMetrics()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dynamic-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: Sequence) -> Future:
+        """Queue a request; the future resolves to one result per item."""
+        future: Future = Future()
+        if self._stopped.is_set():
+            future.set_exception(RuntimeError("Batcher is stopped"))
+        else:
+            self._queue.put((list(items), future))
+        return future
+
+    def __call__(self, items: Sequence, timeout: Optional[float] = None) -> List:
+        """Submit and wait for the results."""
+        return self.submit(items).result(timeout=timeout)
+
+    def stop(self):
+        """Stop accepting requests and let the worker drain the queue."""
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first) -> List:
+        """Gather queued requests behind ``first`` until the batch is full or the wait expires."""
+        requests = [first]
+        n_items = len(first[0])
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+
+        while n_items < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # Re-queue the stop marker for _run
+                break
+            requests.append(request)
+            n_items += len(request[0])
+
+        return requests
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            requests = self._collect(first)
+            batch = [item for items, _ in requests for item in items]
+
+            start = time.perf_counter()
+            try:
+                results = self.process_batch(batch)
+            except Exception as e:
+                logger.exception("Batch failed")
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+            self.metrics.record_batch(len(batch), time.perf_counter() - start)
+
+            offset = 0
+            for items, future in requests:
+                future.set_result(results[offset:offset + len(items)])
+                offset += len(items)
@@ -0,0 +1,56 @@
+"""Minimal client for the policy server over TCP or a Unix socket."""
+
+import http.client
+import json
+import socket
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class PolicyClient:
+    """Keeps one persistent connection; use one client per thread."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8080", unix_socket: Optional[str] = None,
+                 timeout: float = 60.0):
+        if unix_socket:
+            self._connection = UnixHTTPConnection(unix_socket, timeout=timeout)
+        else:
+            parsed = urlparse(url)
+            self._connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        self._connection.request(method, path, body=body, headers=headers)
+        response = self._connection.getresponse()
+        data = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} failed ({response.status}): {data.get('error')}")
+        return data
+
+    def predict(self, requests: List[Dict]) -> List[Dict]:
+        """Send ``[{"observation": [...], "medium": {...}}, ...]`` and return the results."""
+        return self._request("POST", "/predict", {'requests': requests})['results']
+
+    def metrics(self) -> Dict:
+        return self._request("GET", "/metrics")
+
+    def health(self) -> Dict:
+        return self._request("GET", "/health")
+
+    def close(self):
+        self._connection.close()
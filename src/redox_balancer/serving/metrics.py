@@ -0,0 +1,65 @@
+"""Latency and throughput accounting for the policy server."""
+
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+
+class ServingMetrics:
+    """Thread-safe request counters with a sliding window of latencies."""
+
+    def __init__(self, window: int = 10_000):
+        """Start with empty counters.
+
+        Args:
+            window: Number of most recent requests/batches kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self.start_time = time.time()
+        self.requests = 0
+        self.items = 0
+        self.errors = 0
+        self.batches = 0
+        self._latencies_ms = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._batch_ms = deque(maxlen=window)
+
+    def record_request(self, n_items: int, latency_s: float, error: bool = False):
+        """Account for one client request (end to end, including queueing)."""
+        with self._lock:
+            self.requests += 1
+            self.items += n_items
+            self.errors += int(error)
+            self._latencies_ms.append(latency_s * 1e3)
+
+    def record_batch(self, batch_size: int, duration_s: float):
+        """Account for one batch executed by the model worker."""
+        with self._lock:
+            self.batches += 1
+            self._batch_sizes.append(batch_size)
+            self._batch_ms.append(duration_s * 1e3)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current counters, latency percentiles and throughput."""
+        with self._lock:
+            latencies = np.array(self._latencies_ms) if self._latencies_ms else np.zeros(1)
+            batch_sizes = np.array(self._batch_sizes) if self._batch_sizes else np.zeros(1)
+            batch_ms = np.array(self._batch_ms) if self._batch_ms else np.zeros(1)
+            elapsed = max(time.time() - self.start_time, 1e-9)
+            return {
+                'uptime_s': elapsed,
+                'requests': self.requests,
+                'items': self.items,
+                'errors': self.errors,
+                'batches': self.batches,
+                'requests_per_second': self.requests / elapsed,
+                'items_per_second': self.items / elapsed,
+                'latency_p50_ms': float(np.percentile(latencies, 50)),
+                'latency_p95_ms': float(np.percentile(latencies, 95)),
+                'latency_p99_ms': float(np.percentile(latencies, 99)),
+                'mean_batch_size': float(batch_sizes.mean()),
+                'mean_batch_ms': float(batch_ms.mean()),
+            }
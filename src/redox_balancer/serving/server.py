@@ -0,0 +1,267 @@
+"""Local HTTP / Unix-socket server for exported policies.
+
+``POST /predict`` takes ``{"requests": [{"observation": [...], "medium":
+{"EX_glc__D_e": -10.0}}, ...]}``. For each request it returns the policy's
+greedy action and value. For sink designer policies it also returns the
+decoded construct and its exact FBA outcome, solved on the compiled model
+under the request's medium. ``GET /metrics`` reports latency and
+throughput, and ``GET /health`` reports the loaded policy.
+
+Concurrent requests are merged by a DynamicBatcher, so the policy runs one
+batched forward pass. A single worker thread owns the solver-backed model.
+
+Usage:
+    python -m redox_balancer.serving.server --policy export/sink_designer_policy.pt \\
+        --model data/models/redox_core_v2.json --enzymes data/enzyme_library_redox.json --port 8080
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..agents.export import load_exported_policy
+from ..utils.constructs import ConstructEvaluator, decode_sink_action
+from .batcher import DynamicBatcher
+from .metrics import ServingMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyService:
+    """Exported policy plus compiled metabolic model behind a dynamic batcher."""
+
+    def __init__(
+        self,
+        policy_path: str,
+        model_path: Optional[str] = None,
+        enzyme_library_path: Optional[str] = None,
+        medium: Optional[Dict[str, float]] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ):
+        """Load the policy and, for sink designer policies, the model and library.
+
+        Args:
+            policy_path: Artifact written by export_policy
+            model_path: COBRApy JSON model for FBA predictions (actions only if None)
+            enzyme_library_path: Library the policy's enzyme indices refer to
+            medium: Default exchange bounds for the compiled model
+            max_batch_size: Items per batched forward pass
+            max_wait_ms: Time a request may wait for others to batch with
+        """
+        self.policy = load_exported_policy(policy_path)
+        self.metrics = ServingMetrics()
+        self.enzyme_list = None
+        self.evaluator = None
+
+        if self.policy.role == "sink_designer":
+            if enzyme_library_path is None:
+                raise ValueError("Sink designer policies need the enzyme library to decode actions")
+            from ..data.enzyme_library import EnzymeLibrary
+            library = EnzymeLibrary(enzyme_library_path)
+            self.enzyme_list, _ = library.to_action_space()
+
+            if model_path is not None:
+                import cobra
+                self.evaluator = ConstructEvaluator(
+                    cobra.io.load_json_model(model_path), library.enzymes, medium=medium
+                )
+                logger.info(f"Compiled model ready, baseline growth {self.evaluator.baseline_growth:.4f}")
+
+        self.batcher = DynamicBatcher(
+            self._process_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            metrics=self.metrics,
+        )
+
+    def _process_batch(self, items: List[Dict]) -> List[Dict]:
+        """One forward pass for the whole batch, then per-item decoding and FBA."""
+        obs = np.stack([item['observation'] for item in items])
+        actions, values, _ = self.policy.step(obs)
+
+        results = []
+        for item, action, value in zip(items, actions, values):
+            result = {'action': action.tolist(), 'value': float(value)}
+            if self.enzyme_list is not None:
+                construct = decode_sink_action(action, self.enzyme_list)
+                result['construct'] = construct.to_dict()
+                if self.evaluator is not None:
+                    result['prediction'] = self.evaluator.evaluate(construct, item.get('medium'))
+            results.append(result)
+        return results
+
+    def predict(self, requests: List[Dict], timeout: Optional[float] = None) -> List[Dict]:
+        """Validate, batch and run a list of requests.
+
+        Raises:
+            ValueError: If a request is malformed
+        """
+        start = time.perf_counter()
+        items = []
+        for request in requests:
+            obs = np.asarray(request.get('observation'), dtype=np.float32)
+            if obs.shape != (self.policy.obs_dim,):
+                raise ValueError(f"Observation must have shape ({self.policy.obs_dim},), got {obs.shape}")
+            medium = request.get('medium')
+            if medium is not None:
+                # Bad bounds would otherwise fail in the batch worker, taking the whole batch down
+                if not isinstance(medium, dict):
+                    raise ValueError("Medium must map exchange reaction IDs to lower bounds")
+                try:
+                    medium = {str(rxn_id): float(bound) for rxn_id, bound in medium.items()}
+                except (TypeError, ValueError):
+                    raise ValueError(f"Medium lower bounds must be numbers, got {medium}") from None
+                if not all(math.isfinite(bound) for bound in medium.values()):
+                    raise ValueError(f"Medium lower bounds must be finite, got {medium}")
+            items.append({'observation': obs, 'medium': medium})
+
+        try:
+            results = self.batcher(items, timeout=timeout)
+        except Exception:
+            self.metrics.record_request(len(items), time.perf_counter() - start, error=True)
+            raise
+        self.metrics.record_request(len(items), time.perf_counter() - start)
+        return results
+
+    def info(self) -> Dict:
+        return {
+            'status': 'ok',
+            'role': self.policy.role,
+            'obs_dim': self.policy.obs_dim,
+            'action_dim': self.policy.action_dim,
+            'fba': self.evaluator is not None,
+        }
+
+    def close(self):
+        self.batcher.stop()
+
+
+def make_handler(service: PolicyService):
+    """Request handler class bound to a service."""
+
+    class PolicyRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, service.info())
+            elif self.path == "/metrics":
+                self._send_json(200, service.metrics.snapshot())
+            else:
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                results = service.predict(payload['requests'])
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            except Exception as e:
+                logger.exception("Prediction failed")
+                self._send_json(500, {'error': str(e)})
+                return
+            self._send_json(200, {'results': results})
+
+        def _send_json(self, status: int, payload: Dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # client_address is empty for Unix sockets, so skip address_string()
+            logger.debug(format % args)
+
+    return PolicyRequestHandler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def create_server(
+    service: PolicyService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    unix_socket: Optional[str] = None,
+):
+    """HTTP server for a service on TCP, or on a Unix socket if given."""
+    handler = make_handler(service)
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an exported redox balancer policy")
+    parser.add_argument("--policy", required=True, help="Exported policy (.pt or .onnx)")
+    parser.add_argument("--model", help="Metabolic model for FBA predictions")
+    parser.add_argument("--enzymes", default="data/enzyme_library_redox.json", help="Enzyme library")
+    parser.add_argument("--medium", help="JSON file of exchange lower bounds for the compiled model")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8080, help="TCP port")
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Items per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Batching window")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
+    )
+
+    medium = None
+    if args.medium:
+        with open(args.medium) as f:
+            medium = json.load(f)
+
+    service = PolicyService(
+        args.policy,
+        model_path=args.model,
+        enzyme_library_path=args.enzymes if Path(args.enzymes).exists() else None,
+        medium=medium,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    server = create_server(service, args.host, args.port, args.unix_socket)
+    address = args.unix_socket or f"http://{args.host}:{args.port}"
+    logger.info(f"Serving {service.policy.role} policy on {address}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
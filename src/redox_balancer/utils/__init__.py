@@ -1,5 +1,6 @@
 """Utility modules for Redox-Balancer."""
 
+from .checkpoint import AsyncCheckpointWriter
 from .logging import TensorBoardLogger
 
-__all__ = ["TensorBoardLogger"]
\ No newline at end of file
+__all__ = ["AsyncCheckpointWriter", "TensorBoardLogger"]
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""Checkpoint utilities: in-memory snapshots and a background writer."""
+
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_state(obj: Any) -> Any:
+    """Copy a (nested) state dict to CPU so training can keep mutating the original.
+
+    Tensors are cloned; dicts, lists and tuples are rebuilt; everything else
+    (ints, floats, strings, RNG tuples) is immutable and shared.
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {k: snapshot_state(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [snapshot_state(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(snapshot_state(v) for v in obj)
+    return obj
+
+
+def write_checkpoint_files(path: Path, files: Dict[str, Any], compress_level: int = 1):
+    """Write a checkpoint directory atomically.
+
+    Files ending in ``.pt.gz`` are torch-serialized and gzip-compressed,
+    ``.json`` files are JSON-dumped and anything else is written as text.
+    Everything goes into a hidden temporary directory that is renamed into
+    place once complete, so a crash never leaves a half-written checkpoint.
+    An existing checkpoint is renamed aside before the swap and deleted
+    after it, so one of the two is always on disk.
+
+    Args:
+        path: Final checkpoint directory
+        files: Mapping of file name to object
+        compress_level: gzip level (1 = fastest)
+    """
+    path = Path(path)
+    tmp_path = path.parent / f".{path.name}.tmp"
+    old_path = path.parent / f".{path.name}.old"
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    if old_path.exists():
+        # Left by a swap interrupted between its renames
+        if path.exists():
+            shutil.rmtree(old_path)
+        else:
+            os.rename(old_path, path)
+    tmp_path.mkdir(parents=True)
+
+    for name, obj in files.items():
+        target = tmp_path / name
+        if name.endswith(".pt.gz"):
+            buffer = io.BytesIO()
+            torch.save(obj, buffer)
+            with open(target, "wb") as f:
+                f.write(gzip.compress(buffer.getvalue(), compresslevel=compress_level))
+        elif name.endswith(".json"):
+            with open(target, "w") as f:
+                json.dump(obj, f, indent=2, default=str)
+        else:
+            with open(target, "w") as f:
+                f.write(str(obj))
+
+    if path.exists():
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    if old_path.exists():
+        shutil.rmtree(old_path)
+
+
+def load_compressed(path: Path, map_location: Optional[str] = None) -> Any:
+    """Load an object written as ``.pt.gz`` by write_checkpoint_files."""
+    with gzip.open(path, "rb") as f:
+        buffer = io.BytesIO(f.read())
+    # Trainer state holds numpy/python RNG state, which weights_only rejects
+    return torch.load(buffer, map_location=map_location, weights_only=False)
+
+
+def write_environment_manifest(path: Path):
+    """Record installed packages (``pip freeze``) for reproducibility."""
+    try:
+        requirements = subprocess.check_output(["pip", "freeze"], text=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"Could not capture environment manifest: {e}")
+        return
+    with open(path, "w") as f:
+        f.write(requirements)
+
+
+class AsyncCheckpointWriter:
+    """Runs checkpoint serialization and file I/O on a background thread.
+
+    The training loop only pays for taking an in-memory snapshot; jobs are
+    executed in submission order by a single daemon thread.
+    """
+
+    def __init__(self, max_pending: int = 1):
+        """Start the writer thread.
+
+        Args:
+            max_pending: Jobs allowed to queue behind the one being written
+        """
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue(maxsize=max_pending)
+        self.failed_jobs = 0
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Callable[[], None], block: bool = False) -> bool:
+        """Queue a write job.
+
+        Args:
+            job: Callable performing the write
+            block: Wait for queue space instead of dropping the job when busy
+
+        Returns:
+            True if the job was queued
+        """
+        try:
+            self._queue.put(job, block=block)
+        except queue.Full:
+            return False
+        return True
+
+    @property
+    def busy(self) -> bool:
+        """Whether a non-blocking submit would be dropped right now."""
+        return self._queue.full()
+
+    def flush(self):
+        """Block until every queued job has finished."""
+        self._queue.join()
+
+    def close(self):
+        """Finish pending jobs and stop the writer thread."""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                job()
+            except Exception:
+                self.failed_jobs += 1
+                logger.exception("Checkpoint write failed")
+            finally:
+                self._queue.task_done()
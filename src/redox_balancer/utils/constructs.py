@@ -0,0 +1,383 @@
+"""Sink designer constructs: decoding actions and exact FBA evaluation.
+
+A construct is a set of library enzymes, each expressed in a compartment at
+some copy number. Every (enzyme, compartment) pair maps to a ``SINK_``
+reaction built from the enzyme's reaction string. The evaluator adds all of
+them to one model copy with zero bounds. It then scores a construct by
+opening the bounds of its reactions and re-solving, so the LP is never
+rebuilt.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPARTMENTS = ("c", "m", "p")
+
+# Library metabolite names -> model metabolite IDs (without compartment suffix)
+METABOLITE_IDS = {
+    "NADH": "nadh",
+    "NAD+": "nad",
+    "H+": "h",
+    "O2": "o2",
+    "H2O": "h2o",
+    "L-aspartate": "asp__L",
+    "aspartate": "asp__L",
+    "2-oxoglutarate": "akg",
+    "oxaloacetate": "oaa",
+    "L-glutamate": "glu__L",
+    "glutamate": "glu__L",
+    "malate": "mal__L",
+}
+
+# For transporters, "(in)" is the target compartment and "(out)" the cytosol
+_OUTSIDE = {"m": "c", "p": "c", "c": "e"}
+_TERM = re.compile(r"^(?:(\d+(?:\.\d+)?)\s+)?(.+?)(?:\((in|out)\))?$")
+
+
+@dataclass(frozen=True)
+class ConstructPart:
+    """One enzyme of a construct."""
+    enzyme_id: str
+    compartment: str
+    copies: int
+
+
+@dataclass(frozen=True)
+class Construct:
+    """A sink design: enzymes with compartments and copy numbers, in canonical order."""
+    parts: Tuple[ConstructPart, ...]
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, e.g. ``MDH1_c_x2+NOX_Ec_m_x1``."""
+        return "+".join(f"{p.enzyme_id}_{p.compartment}_x{p.copies}" for p in self.parts)
+
+    def to_dict(self) -> Dict:
+        return {
+            'key': self.key,
+            'enzymes': [
+                {'enzyme_id': p.enzyme_id, 'compartment': p.compartment, 'copies': p.copies}
+                for p in self.parts
+            ],
+        }
+
+    @classmethod
+    def from_key(cls, key: str) -> 'Construct':
+        """Inverse of ``key``; enzyme IDs may themselves contain underscores."""
+        parts = []
+        for token in filter(None, key.split("+")):
+            enzyme_id, compartment, copies = token.rsplit("_", 2)
+            parts.append((enzyme_id, compartment, int(copies.lstrip("x"))))
+        return cls.from_parts(parts)
+
+    @classmethod
+    def from_parts(cls, parts: Iterable[Tuple[str, str, int]]) -> 'Construct':
+        """Build a construct, merging repeated (enzyme, compartment) pairs."""
+        copies: Dict[Tuple[str, str], int] = {}
+        for enzyme_id, compartment, n in parts:
+            copies[(enzyme_id, compartment)] = copies.get((enzyme_id, compartment), 0) + int(n)
+        return cls(tuple(
+            ConstructPart(enzyme_id, compartment, n)
+            for (enzyme_id, compartment), n in sorted(copies.items())
+            if n > 0
+        ))
+
+
+def decode_sink_action(
+    action: np.ndarray,
+    enzyme_list: Sequence[str],
+    compartments: Sequence[str] = COMPARTMENTS,
+) -> Construct:
+    """Turn a flat sink designer action ``[enzyme, copies, compartment] * slots`` into a construct.
+
+    Args:
+        action: Action from the policy, length max_enzymes * 3
+        enzyme_list: Enzyme IDs in action index order (EnzymeLibrary.to_action_space)
+        compartments: Compartment IDs in action index order
+    """
+    slots = np.asarray(action).reshape(-1, 3)
+    return Construct.from_parts(
+        (enzyme_list[int(enzyme)], compartments[int(comp)], int(round(copies)))
+        for enzyme, copies, comp in slots
+    )
+
+
+def sink_reaction_id(enzyme_id: str, compartment: str) -> str:
+    return f"SINK_{enzyme_id}_{compartment}"
+
+
+def absolute_flux(model, reaction, capacity: float, reversible: bool) -> Tuple[object, List]:
+    """Expression for a reaction's |flux| that stays exact when maximized.
+
+    ``forward_variable + reverse_variable`` is only |v| while one of the two
+    is zero; maximizing it runs a reversible reaction both ways at once. For
+    reversible reactions a binary direction variable closes the unused side.
+
+    Args:
+        model: Model holding the reaction
+        reaction: Reaction whose flux magnitude is wanted
+        capacity: Upper bound on the flux in either direction
+        reversible: Whether the reaction may carry negative flux
+
+    Returns:
+        The expression, and the variables and constraints to add to the model
+    """
+    if not reversible:
+        return reaction.flux_expression, []
+    prob = model.problem
+    forward = prob.Variable(f"direction_{reaction.id}", type="binary")
+    return reaction.forward_variable + reaction.reverse_variable, [
+        forward,
+        prob.Constraint(reaction.forward_variable - capacity * forward, ub=0, name=f"direction_fwd_{reaction.id}"),
+        prob.Constraint(reaction.reverse_variable + capacity * forward, ub=capacity, name=f"direction_rev_{reaction.id}"),
+    ]
+
+
+def parse_reaction_string(reaction: str, compartment: str) -> Tuple[Dict[str, float], bool]:
+    """Parse a library reaction string into model metabolite IDs.
+
+    Args:
+        reaction: e.g. ``"malate + NAD+ <=> oxaloacetate + NADH + H+"``
+        compartment: Compartment the enzyme is expressed in
+
+    Returns:
+        Stoichiometry keyed by metabolite ID and whether the reaction is reversible
+
+    Raises:
+        ValueError: If a metabolite name is not in METABOLITE_IDS
+    """
+    reversible = "<=>" in reaction
+    arrow = "<=>" if reversible else "->"
+    lhs, rhs = reaction.split(arrow)
+
+    stoichiometry: Dict[str, float] = {}
+    for side, sign in ((lhs, -1.0), (rhs, 1.0)):
+        for term in side.split(" + "):
+            coeff, name, location = _TERM.match(term.strip()).groups()
+            if name not in METABOLITE_IDS:
+                raise ValueError(f"Unknown metabolite '{name}' in reaction: {reaction}")
+            comp = _OUTSIDE.get(compartment, compartment) if location == "out" else compartment
+            met_id = f"{METABOLITE_IDS[name]}_{comp}"
+            stoichiometry[met_id] = stoichiometry.get(met_id, 0.0) + sign * float(coeff or 1)
+
+    return {k: v for k, v in stoichiometry.items() if v != 0}, reversible
+
+
+class ConstructEvaluator:
+    """Exact FBA outcomes for constructs on a model with pre-built sink reactions."""
+
+    def __init__(
+        self,
+        model,
+        enzyme_db: Mapping[str, Dict],
+        compartments: Sequence[str] = COMPARTMENTS,
+        medium: Optional[Dict[str, float]] = None,
+        cache_size: int = 10_000,
+        copy_model: bool = True,
+        cache_dir: Optional[str] = None,
+    ):
+        """Add a zero-bounded SINK reaction for every expressible (enzyme, compartment).
+
+        Args:
+            model: COBRApy model
+            enzyme_db: Enzyme records with ``reaction``, ``kcat`` and optional ``compartments``
+            compartments: Compartments to consider
+            medium: Exchange lower bounds to apply before evaluating
+            cache_size: Outcomes kept in the LRU cache
+            copy_model: Work on a copy so the caller's model is left untouched
+            cache_dir: Back the in-memory cache with a persistent FBAOutcomeCache
+                for this compiled model
+        """
+        import cobra
+        from .medium import set_medium
+
+        self.model = model.copy() if copy_model else model
+        self.enzyme_db = dict(enzyme_db)
+        if medium is not None:
+            set_medium(self.model, medium)
+
+        self.nadh_coefficients: Dict[str, float] = {}
+        self.reversible = set()
+        sink_vmax: Dict[str, float] = {}
+        reactions = []
+        for enzyme_id, record in self.enzyme_db.items():
+            allowed = record.get('compartments') or compartments
+            for comp in compartments:
+                if comp not in allowed:
+                    continue
+                try:
+                    stoichiometry, reversible = parse_reaction_string(record.get('reaction', ''), comp)
+                except ValueError as e:
+                    logger.warning(f"Skipping {enzyme_id} in {comp}: {e}")
+                    continue
+                missing = [m for m in stoichiometry if m not in self.model.metabolites]
+                if missing:
+                    logger.debug(f"Skipping {enzyme_id} in {comp}: metabolites {missing} not in model")
+                    continue
+
+                rxn = cobra.Reaction(sink_reaction_id(enzyme_id, comp))
+                rxn.add_metabolites({
+                    self.model.metabolites.get_by_id(m): coeff for m, coeff in stoichiometry.items()
+                })
+                rxn.bounds = (0.0, 0.0)
+                reactions.append(rxn)
+                self.nadh_coefficients[rxn.id] = stoichiometry.get(f"nadh_{comp}", 0.0)
+                sink_vmax[rxn.id] = self.vmax(ConstructPart(enzyme_id, comp, 1))
+                if reversible:
+                    self.reversible.add(rxn.id)
+        self.model.add_reactions(reactions)
+
+        baseline = self.model.slim_optimize(error_value=float('nan'))
+        self.baseline_growth = float(baseline)
+        self._cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.cache_size = cache_size
+        self.solves = 0
+        
+        self.outcome_cache = None
+        if cache_dir is not None:
+            from ..cache.fba_cache import FBAOutcomeCache, model_fingerprint
+            # SINK bounds are zero in the model, so their kinetics must be hashed explicitly
+            self.outcome_cache = FBAOutcomeCache(
+                cache_dir, namespace=model_fingerprint(self.model, extra={'sink_vmax': sink_vmax})
+            )
+
+    def available(self, enzyme_id: str, compartment: str) -> bool:
+        """Whether the construct part has a SINK reaction in the model."""
+        return sink_reaction_id(enzyme_id, compartment) in self.nadh_coefficients
+
+    def vmax(self, part: ConstructPart) -> float:
+        """Flux capacity of a part: kcat-derived Vmax per copy (as DeltaCache) times copies."""
+        return self.enzyme_db[part.enzyme_id].get('kcat', 10.0) * 1e-3 * part.copies
+
+    def evaluate(
+        self,
+        construct: Construct,
+        medium: Optional[Dict[str, float]] = None,
+        refresh: bool = False,
+    ) -> Dict:
+        """Solve FBA with the construct's sink reactions opened.
+
+        Args:
+            construct: Construct to score
+            medium: Optional exchange lower bounds overriding the current ones
+            refresh: Re-solve even if the outcome is cached, replacing it
+
+        Returns:
+            Dict with status, growth_rate, relative_growth, sink_flux and
+            nadh_oxidation (net NADH consumed by the construct)
+        """
+        cache_key = (construct.key, tuple(sorted((medium or {}).items())))
+        if cache_key in self._cache and not refresh:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
+
+        result = None
+        if self.outcome_cache is not None and not refresh:
+            result = self.outcome_cache.get(cache_key)
+        if result is None:
+            result = {'status': 'invalid', 'growth_rate': 0.0, 'relative_growth': 0.0,
+                      'sink_flux': 0.0, 'nadh_oxidation': 0.0}
+            if all(self.available(p.enzyme_id, p.compartment) for p in construct.parts):
+                result = self._solve(construct, medium)
+            if self.outcome_cache is not None:
+                self.outcome_cache.put(cache_key, result)
+
+        self._cache[cache_key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def cached(self, construct: Construct, medium: Optional[Dict[str, float]] = None) -> Optional[Dict]:
+        """Outcome already known for a construct, or None; never solves."""
+        cache_key = (construct.key, tuple(sorted((medium or {}).items())))
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+        if self.outcome_cache is not None:
+            return self.outcome_cache.get(cache_key)
+        return None
+
+    def nadh_capacity(self, construct: Construct) -> float:
+        """Upper bound on a construct's NADH oxidation: every part at Vmax."""
+        return sum(
+            self.vmax(part) * abs(self.nadh_coefficients.get(
+                sink_reaction_id(part.enzyme_id, part.compartment), 0.0
+            ))
+            for part in construct.parts
+        )
+
+    def flux_ranges(
+        self,
+        construct: Construct,
+        reaction_ids: Sequence[str],
+        medium: Optional[Dict[str, float]] = None,
+        fraction_of_optimum: float = 1.0,
+        processes: Optional[int] = None,
+    ) -> Dict[str, Tuple[float, float]]:
+        """Flux variability of reactions with a construct expressed.
+
+        Args:
+            construct: Construct to express
+            reaction_ids: Reactions to vary; the construct's SINK reactions are always included
+            medium: Optional exchange lower bounds overriding the current ones
+            fraction_of_optimum: Fraction of maximal growth kept while varying fluxes
+            processes: Worker processes for cobra's parallel FVA
+
+        Returns:
+            (minimum, maximum) flux per reaction
+        """
+        from cobra.flux_analysis import flux_variability_analysis
+
+        with self.model:
+            sink_ids = self.express(construct, medium)
+            fva = flux_variability_analysis(
+                self.model,
+                reaction_list=list(dict.fromkeys([*sink_ids, *reaction_ids])),
+                fraction_of_optimum=fraction_of_optimum,
+                processes=processes,
+            )
+        return {rxn_id: (float(row.minimum), float(row.maximum)) for rxn_id, row in fva.iterrows()}
+
+    def express(self, construct: Construct, medium: Optional[Dict[str, float]] = None) -> List[str]:
+        """Apply the medium and open the construct's SINK reactions, returning their IDs.
+
+        Call inside ``with self.model`` so the bounds are reverted.
+        """
+        for exchange_id, lower_bound in (medium or {}).items():
+            if exchange_id in self.model.reactions:
+                self.model.reactions.get_by_id(exchange_id).lower_bound = lower_bound
+
+        reaction_ids = []
+        for part in construct.parts:
+            rxn_id = sink_reaction_id(part.enzyme_id, part.compartment)
+            vmax = self.vmax(part)
+            rxn = self.model.reactions.get_by_id(rxn_id)
+            rxn.bounds = (-vmax if rxn_id in self.reversible else 0.0, vmax)
+            reaction_ids.append(rxn_id)
+        return reaction_ids
+
+    def _solve(self, construct: Construct, medium: Optional[Dict[str, float]]) -> Dict:
+        with self.model:  # Bound changes are reverted on exit
+            reaction_ids = self.express(construct, medium)
+            solution = self.model.optimize()
+            self.solves += 1
+
+        if solution.status != "optimal":
+            return {'status': solution.status, 'growth_rate': 0.0, 'relative_growth': 0.0,
+                    'sink_flux': 0.0, 'nadh_oxidation': 0.0}
+
+        fluxes = {rxn_id: float(solution.fluxes[rxn_id]) for rxn_id in reaction_ids}
+        growth = float(solution.objective_value)
+        return {
+            'status': 'optimal',
+            'growth_rate': growth,
+            'relative_growth': growth / self.baseline_growth if self.baseline_growth > 0 else 0.0,
+            'sink_flux': sum(abs(v) for v in fluxes.values()),
+            'nadh_oxidation': -sum(self.nadh_coefficients[r] * v for r, v in fluxes.items()),
+        }
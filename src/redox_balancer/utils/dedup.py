@@ -0,0 +1,103 @@
+"""Transition deduplication for deterministic evaluation.
+
+With a greedy policy, episodes that start from the same observation take
+the same actions, so they follow the same path and repeat the same FBA
+solves. DedupEnv records every transition under a hash of the
+observation/action history that led to it, and serves repeats from the
+record.
+
+The wrapped environment is only advanced lazily. Reused steps are queued,
+and they are replayed only if the episode later diverges onto a path that
+has not been seen. An episode that repeats an earlier one end to end costs
+a reset and no steps.
+
+This assumes the environment's transitions are determined by the
+observed history, which holds for the FBA environment once reset.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _digest(prefix: bytes, value: Any) -> bytes:
+    array = np.ascontiguousarray(value)
+    h = hashlib.blake2b(prefix, digest_size=16)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    h.update(array.tobytes())
+    return h.digest()
+
+
+class DedupEnv:
+    """Environment wrapper that reuses recorded transitions along repeated histories."""
+
+    def __init__(self, env, max_entries: int = 1_000_000):
+        """Wrap an environment.
+
+        Args:
+            env: Gymnasium-style environment (reset/step)
+            max_entries: Transitions kept; new ones are not recorded past this
+        """
+        self.env = env
+        self.max_entries = max_entries
+        self.memo: Dict[bytes, Tuple] = {}
+        self.env_steps = 0
+        self.reused_steps = 0
+        self.replayed_steps = 0
+
+        self._history = b""
+        self._pending: List[np.ndarray] = []
+
+    def __getattr__(self, name: str):
+        # action_space, agent_role, model, ... come from the wrapped env
+        if name == "env":
+            raise AttributeError(name)
+        return getattr(self.env, name)
+
+    def reset(self, seed: Optional[int] = None, options: Optional[Dict] = None):
+        self._pending = []
+        obs, info = self.env.reset(seed=seed, options=options)
+        self._history = _digest(b"", obs)
+        return obs, info
+
+    def step(self, action):
+        key = _digest(self._history, action)
+        outcome = self.memo.get(key)
+
+        if outcome is not None:
+            self._pending.append(np.array(action, copy=True))
+            self.reused_steps += 1
+        else:
+            self._catch_up()
+            outcome = self.env.step(action)
+            self.env_steps += 1
+            if len(self.memo) < self.max_entries:
+                next_obs, reward, terminated, truncated, info = outcome
+                outcome = (np.array(next_obs, copy=True), reward, terminated, truncated, dict(info))
+                self.memo[key] = outcome
+
+        next_obs, reward, terminated, truncated, info = outcome
+        self._history = _digest(key, next_obs)
+        # Callers get their own copies so they cannot alter the record
+        return np.array(next_obs, copy=True), reward, terminated, truncated, dict(info)
+
+    def _catch_up(self):
+        """Apply queued reused steps to the wrapped env before a real step."""
+        for action in self._pending:
+            self.env.step(action)
+            self.replayed_steps += 1
+        self._pending = []
+
+    def stats(self) -> Dict[str, int]:
+        """Step accounting; solves_saved is environment steps avoided net of replays."""
+        return {
+            'env_steps': self.env_steps,
+            'reused_steps': self.reused_steps,
+            'replayed_steps': self.replayed_steps,
+            'solves_saved': self.reused_steps - self.replayed_steps,
+            'recorded_transitions': len(self.memo),
+        }
+
+    def close(self):
+        self.env.close()
@@ -60,6 +60,14 @@ class TensorBoardLogger:
         self.log_scalar("performance/episodes_per_second", metrics.get('episodes_per_second', 0))
         self.log_scalar("performance/cache_hit_rate", metrics.get('cache_hit_rate', 0))
         
+    def log_memory_metrics(self, metrics: Dict[str, float]):
+        """Log actor and object store memory metrics."""
+        self.log_scalar("actors/max_rss_gb", metrics.get('max_rss_gb', 0))
+        self.log_scalar("actors/mean_rss_gb", metrics.get('mean_rss_gb', 0))
+        self.log_scalar("actors/restarts", metrics.get('actor_restarts', 0))
+        if 'object_store_used_gb' in metrics:
+            self.log_scalar("ray/object_store_used_gb", metrics['object_store_used_gb'])
+        
     def increment_step(self):
         """Increment global step counter."""
         self.global_step += 1
@@ -0,0 +1,183 @@
+"""Streaming, chunked columnar storage for evaluation results.
+
+A results directory holds numbered ``chunk_XXXXXX.npz`` files. Each chunk
+stores one column per episode field (``episodes/<name>``) and, optionally,
+one per per-step trace field (``steps/<name>``). An episode and its trace
+always go in the same chunk.
+
+Chunks are written to a temporary file and then renamed, so a crash loses
+at most the buffered episodes. A restarted writer skips every episode
+index already on disk. Readers load chunks, and columns within a chunk,
+only when asked.
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_PATTERN = re.compile(r"chunk_(\d+)\.npz$")
+TABLES = ("episodes", "steps")
+
+
+def _chunk_paths(path: Path) -> List[Path]:
+    return sorted(p for p in Path(path).glob("chunk_*.npz") if _CHUNK_PATTERN.search(p.name))
+
+
+def _to_column(values: List) -> np.ndarray:
+    """Numeric columns become int64/float64 (None -> NaN), anything else strings."""
+    if all(isinstance(v, (bool, np.bool_)) for v in values):
+        return np.asarray(values, dtype=bool)
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in values):
+        return np.asarray(values, dtype=np.int64)
+    if all(v is None or isinstance(v, (int, float, np.number)) for v in values):
+        return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.asarray(["" if v is None else str(v) for v in values])
+
+
+def _columns(rows: List[Dict]) -> Dict[str, np.ndarray]:
+    keys = []
+    for row in rows:
+        keys.extend(k for k in row if k not in keys)
+    return {key: _to_column([row.get(key) for row in rows]) for key in keys}
+
+
+class ChunkedResultsWriter:
+    """Appends episode rows and step traces to a results directory in bounded chunks."""
+
+    def __init__(self, path: str, chunk_size: int = 64, metadata: Optional[Dict] = None):
+        """Open a results directory, picking up any chunks already written.
+
+        Args:
+            path: Results directory
+            chunk_size: Episodes buffered before a chunk is written
+            metadata: Run settings (JSON-serializable). A directory written
+                with different settings is not resumed.
+
+        Raises:
+            ValueError: If the directory holds results for different metadata
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+
+        meta_path = self.path / "meta.json"
+        if metadata is not None:
+            metadata = json.loads(json.dumps(metadata))
+            if meta_path.exists():
+                with open(meta_path) as f:
+                    existing = json.load(f)
+                if existing != metadata and _chunk_paths(self.path):
+                    raise ValueError(
+                        f"{self.path} holds results for {existing}, not {metadata}; "
+                        "remove it or write elsewhere"
+                    )
+            with open(meta_path, "w") as f:
+                json.dump(metadata, f, indent=2)
+
+        # Leftovers from a write interrupted before its rename
+        for tmp in self.path.glob("*.npz.tmp"):
+            tmp.unlink()
+
+        chunks = _chunk_paths(self.path)
+        self.completed: Set[int] = completed_episodes(self.path)
+        self._next_chunk = int(_CHUNK_PATTERN.search(chunks[-1].name).group(1)) + 1 if chunks else 0
+        if self.completed:
+            logger.info(f"Resuming {self.path}: {len(self.completed)} episodes already recorded")
+
+        self._episodes: List[Dict] = []
+        self._steps: List[Dict] = []
+
+    def add_episode(self, row: Dict, steps: Optional[Sequence[Dict]] = None):
+        """Buffer one finished episode; ``row['episode']`` is its index."""
+        episode = int(row['episode'])
+        self._episodes.append(row)
+        for step in steps or ():
+            self._steps.append({'episode': episode, **step})
+        self.completed.add(episode)
+
+        if len(self._episodes) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered episodes as one chunk."""
+        if not self._episodes:
+            return
+
+        arrays = {f"episodes/{k}": v for k, v in _columns(self._episodes).items()}
+        if self._steps:
+            arrays.update({f"steps/{k}": v for k, v in _columns(self._steps).items()})
+
+        chunk_path = self.path / f"chunk_{self._next_chunk:06d}.npz"
+        tmp_path = chunk_path.with_suffix(".npz.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, chunk_path)
+
+        self._next_chunk += 1
+        self._episodes = []
+        self._steps = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> 'ChunkedResultsWriter':
+        return self
+
+    def __exit__(self, *exc):
+        # Keep what finished even if evaluation raised
+        self.close()
+
+
+def iter_result_chunks(
+    path: str,
+    table: str = "episodes",
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield one dict of column arrays per chunk, loading only the requested columns.
+
+    Args:
+        path: Results directory
+        table: "episodes" or "steps"
+        columns: Column names to load (all if None)
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+
+    prefix = f"{table}/"
+    for chunk_path in _chunk_paths(Path(path)):
+        with np.load(chunk_path, allow_pickle=False) as chunk:
+            names = [n[len(prefix):] for n in chunk.files if n.startswith(prefix)]
+            if columns is not None:
+                names = [n for n in names if n in columns]
+            if names:
+                yield {name: chunk[prefix + name] for name in names}
+
+
+def completed_episodes(path: str) -> Set[int]:
+    """Episode indices already stored in a results directory."""
+    done: Set[int] = set()
+    for chunk in iter_result_chunks(path, "episodes", columns=["episode"]):
+        done.update(int(e) for e in chunk['episode'])
+    return done
+
+
+def read_results(path: str, table: str = "episodes", columns: Optional[Sequence[str]] = None):
+    """Load a table as a DataFrame ordered by episode (and step)."""
+    import pandas as pd
+
+    frames = [pd.DataFrame(chunk) for chunk in iter_result_chunks(path, table, columns)]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns else None)
+
+    df = pd.concat(frames, ignore_index=True)
+    sort_keys = [k for k in ("episode", "step") if k in df]
+    if sort_keys:
+        df = df.sort_values(sort_keys, kind="stable").reset_index(drop=True)
+    return df
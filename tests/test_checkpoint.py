@@ -0,0 +1,89 @@
+"""Tests for checkpoint snapshotting and background writing."""
+
+import json
+import threading
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from redox_balancer.utils.checkpoint import (
+    AsyncCheckpointWriter,
+    load_compressed,
+    snapshot_state,
+    write_checkpoint_files,
+)
+
+
+def test_snapshot_is_independent_copy():
+    net = torch.nn.Linear(3, 2)
+    optimizer = torch.optim.Adam(net.parameters())
+    net(torch.randn(4, 3)).sum().backward()
+    optimizer.step()
+
+    snapshot = snapshot_state({"net": net.state_dict(), "opt": optimizer.state_dict()})
+    with torch.no_grad():
+        net.weight.add_(1.0)
+
+    assert not torch.equal(snapshot["net"]["weight"], net.weight)
+    assert snapshot["opt"]["state"][0]["exp_avg"].device.type == "cpu"
+
+
+def test_write_checkpoint_files_round_trip(tmp_path):
+    path = tmp_path / "step_100"
+    state = {"weight": torch.arange(6.0).view(2, 3)}
+    write_checkpoint_files(path, {
+        "tumor_agent.pt.gz": state,
+        "training_state.json": {"global_timesteps": 100, "keys": ("a", "b")},
+    })
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["step_100"]
+    assert torch.equal(load_compressed(path / "tumor_agent.pt.gz")["weight"], state["weight"])
+    assert json.loads((path / "training_state.json").read_text())["global_timesteps"] == 100
+
+    # Rewriting the same checkpoint replaces it
+    write_checkpoint_files(path, {"training_state.json": {"global_timesteps": 101}})
+    assert [p.name for p in path.iterdir()] == ["training_state.json"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["step_100"]
+
+
+def test_write_checkpoint_files_recovers_interrupted_swap(tmp_path):
+    path = tmp_path / "step_100"
+    write_checkpoint_files(path, {"training_state.json": {"global_timesteps": 100}})
+    # A crash after moving the old checkpoint aside, before the new one was in place
+    path.rename(tmp_path / ".step_100.old")
+
+    write_checkpoint_files(path, {"training_state.json": {"global_timesteps": 101}})
+    assert json.loads((path / "training_state.json").read_text())["global_timesteps"] == 101
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["step_100"]
+
+
+def test_async_writer_runs_jobs_in_order_and_survives_failures():
+    writer = AsyncCheckpointWriter(max_pending=4)
+    release = threading.Event()
+    done = []
+
+    writer.submit(release.wait, block=True)
+    writer.submit(lambda: done.append(1), block=True)
+    writer.submit(lambda: 1 / 0, block=True)
+    writer.submit(lambda: done.append(2), block=True)
+    release.set()
+    writer.close()
+
+    assert done == [1, 2]
+    assert writer.failed_jobs == 1
+
+
+def test_async_writer_drops_jobs_when_busy():
+    writer = AsyncCheckpointWriter(max_pending=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    writer.submit(lambda: (started.set(), release.wait()), block=True)
+    started.wait()
+    assert not writer.busy
+    assert writer.submit(lambda: None)
+    assert writer.busy
+    assert not writer.submit(lambda: None)
+    release.set()
+    writer.close()
@@ -0,0 +1,142 @@
+"""Tests for the non-RL construct search and Pareto helpers."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from redox_balancer.search.pareto import pareto_front
+
+
+def toy_evaluator(extra_enzymes=None):
+    cobra = pytest.importorskip("cobra")
+    from redox_balancer.utils.constructs import ConstructEvaluator
+
+    # Growth needs NAD+, which only a capped native reaction and the sinks regenerate
+    model = cobra.Model("toy")
+    mets = {m: cobra.Metabolite(f"{m}_c", compartment="c") for m in ("nadh", "nad", "h", "o2", "h2o")}
+    for m in ("nadh", "h", "o2", "h2o"):
+        exchange = cobra.Reaction(f"EX_{m}")
+        exchange.add_metabolites({mets[m]: -1})
+        exchange.bounds = (-10.0, 1000.0)
+        model.add_reactions([exchange])
+    native = cobra.Reaction("NATIVE")
+    native.add_metabolites({mets["nadh"]: -1, mets["nad"]: 1})
+    native.bounds = (0.0, 0.5)
+    biomass = cobra.Reaction("BIOMASS")
+    biomass.add_metabolites({mets["nad"]: -1})
+    biomass.bounds = (0.0, 10.0)
+    model.add_reactions([native, biomass])
+    model.objective = "BIOMASS"
+
+    reaction = "NADH + H+ + 0.5 O2 -> NAD+ + H2O"
+    enzymes = {
+        'NOX_A': {'reaction': reaction, 'kcat': 1000.0, 'compartments': ['c']},
+        'NOX_B': {'reaction': reaction, 'kcat': 100.0, 'compartments': ['c']},
+        **(extra_enzymes or {}),
+    }
+    return ConstructEvaluator(model, enzymes, compartments=("c",))
+
+
+@pytest.fixture
+def evaluator():
+    return toy_evaluator()
+
+
+class TestParetoFront:
+    """Non-dominated points over maximized objectives."""
+
+    def test_front(self):
+        points = [
+            {'id': 'a', 'sink_flux': 1.0, 'growth_rate': 0.2},
+            {'id': 'b', 'sink_flux': 0.5, 'growth_rate': 0.5},
+            {'id': 'c', 'sink_flux': 0.4, 'growth_rate': 0.4},
+            {'id': 'd', 'sink_flux': 0.1, 'growth_rate': 0.6},
+            {'id': 'e', 'sink_flux': 1.0, 'growth_rate': 0.1},
+        ]
+        assert [p['id'] for p in pareto_front(points)] == ['a', 'b', 'd']
+
+    def test_ties_kept(self):
+        points = [{'sink_flux': 1.0, 'growth_rate': 1.0}, {'sink_flux': 1.0, 'growth_rate': 1.0}]
+        assert len(pareto_front(points)) == 2
+
+
+class TestConstructSearch:
+    """Bound pruning skips subtrees that cannot beat the incumbent."""
+
+    def test_beam_search(self, evaluator):
+        from redox_balancer.search import ConstructSearch
+
+        search = ConstructSearch(evaluator, compartments=("c",), max_parts=2, max_copies=2)
+        result = search.run(beam_width=2)
+
+        assert result.best['construct'] == "NOX_A_c_x2+NOX_B_c_x2"
+        assert result.best['sink_flux'] == pytest.approx(2.2)
+        assert result.stats['pruned_bound'] == 2
+        assert result.stats['solves'] == 4
+        assert result.pareto[0]['construct'] == result.best['construct']
+
+    def test_branch_and_bound_matches_exhaustive(self, evaluator):
+        from redox_balancer.search import ConstructSearch
+
+        search = ConstructSearch(evaluator, compartments=("c",), max_parts=2, max_copies=2)
+        result = search.run(beam_width=None)
+
+        assert result.best['sink_flux'] == pytest.approx(2.2)
+        assert result.stats['solves'] < 8  # 4 singles + 4 pairs without pruning
+
+
+class TestConstructMILP:
+    """One MILP solve finds the global optimum, scored like eval_agents.py rows."""
+
+    def test_optimum(self, evaluator):
+        from redox_balancer.search import solve_construct_milp
+
+        result = solve_construct_milp(evaluator, max_parts=2, max_copies=2, compartments=("c",))
+        assert result.status == "optimal"
+        assert result.construct.key == "NOX_A_c_x2+NOX_B_c_x2"
+        assert result.objective_value == pytest.approx(2.2)
+        assert result.outcome['nadh_oxidation'] == pytest.approx(2.2)
+
+        row = result.to_row()
+        assert row['construct'] == result.construct.key
+        assert row['fba_relative_growth'] == pytest.approx(result.outcome['relative_growth'])
+
+    def test_part_limit(self, evaluator):
+        from redox_balancer.search import solve_construct_milp
+
+        result = solve_construct_milp(evaluator, max_parts=1, max_copies=2, compartments=("c",))
+        assert result.construct.key == "NOX_A_c_x2"
+        # The MILP's bounds and constraints do not leak into later evaluations
+        assert evaluator.model.reactions.get_by_id("SINK_NOX_A_c").bounds == (0.0, 0.0)
+        assert "max_parts" not in evaluator.model.constraints
+
+    def test_reversible_sink_counted_once(self):
+        from redox_balancer.search import solve_construct_milp
+
+        evaluator = toy_evaluator({
+            'NOX_R': {'reaction': "NADH + H+ + 0.5 O2 <=> NAD+ + H2O", 'kcat': 1000.0, 'compartments': ['c']},
+        })
+        result = solve_construct_milp(
+            evaluator, objective="sink_flux", max_parts=1, max_copies=2,
+            enzyme_ids=["NOX_R"], compartments=("c",),
+        )
+        # Running the sink both ways at once would score 4.0
+        assert result.objective_value == pytest.approx(2.0)
+
+    def test_time_limit_keeps_incumbent(self, evaluator, monkeypatch):
+        from redox_balancer.search import solve_construct_milp
+
+        solver = evaluator.model.solver
+        timeout = solver.configuration.timeout
+        optimize = solver.optimize
+
+        def stopped_early():
+            optimize()
+            return "time_limit"
+
+        monkeypatch.setattr(solver, "optimize", stopped_early)
+        result = solve_construct_milp(evaluator, max_parts=2, max_copies=2, compartments=("c",), time_limit=5)
+
+        assert result.status == "time_limit"
+        assert result.construct.key == "NOX_A_c_x2+NOX_B_c_x2"
+        assert solver.configuration.timeout == timeout
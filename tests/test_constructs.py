@@ -0,0 +1,52 @@
+"""Tests for sink designer construct decoding and reaction parsing."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from redox_balancer.utils.constructs import (
+    Construct,
+    decode_sink_action,
+    parse_reaction_string,
+)
+
+
+class TestConstruct:
+    """Canonical construct keys."""
+
+    def test_duplicate_parts_merge(self):
+        construct = Construct.from_parts([("MDH1", "c", 1), ("NOX_Ec", "m", 2), ("MDH1", "c", 3)])
+        assert construct.key == "MDH1_c_x4+NOX_Ec_m_x2"
+
+    def test_key_round_trip(self):
+        construct = Construct.from_parts([("NOX_Ec", "m", 2), ("SLC25A11", "m", 1)])
+        assert Construct.from_key(construct.key) == construct
+        assert Construct.from_key("") == Construct(())
+
+    def test_decode_sink_action(self):
+        enzyme_list = ["MDH1", "MDH2", "NOX_Ec"]
+        action = np.array([2, 1.0, 1, 0, 2.0, 0, 2, 3.0, 1])
+        construct = decode_sink_action(action, enzyme_list)
+
+        assert construct.key == "MDH1_c_x2+NOX_Ec_m_x4"
+        assert construct == decode_sink_action(action[[6, 7, 8, 3, 4, 5, 0, 1, 2]], enzyme_list)
+
+
+class TestParseReaction:
+    """Library reaction strings map to model metabolite IDs."""
+
+    def test_nadh_oxidase(self):
+        stoichiometry, reversible = parse_reaction_string("NADH + H+ + 0.5 O2 -> NAD+ + H2O", "m")
+        assert not reversible
+        assert stoichiometry == {'nadh_m': -1.0, 'h_m': -1.0, 'o2_m': -0.5, 'nad_m': 1.0, 'h2o_m': 1.0}
+
+    def test_transporter_sides(self):
+        stoichiometry, reversible = parse_reaction_string(
+            "2-oxoglutarate(in) + malate(out) <=> 2-oxoglutarate(out) + malate(in)", "m"
+        )
+        assert reversible
+        assert stoichiometry == {'akg_m': -1.0, 'mal__L_c': -1.0, 'akg_c': 1.0, 'mal__L_m': 1.0}
+
+    def test_unknown_metabolite(self):
+        with pytest.raises(ValueError, match="pyruvate"):
+            parse_reaction_string("pyruvate + NADH -> lactate + NAD+", "c")
@@ -0,0 +1,43 @@
+"""Tests for the enzyme library's sink designer action mask."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pydantic")
+
+from redox_balancer.data.enzyme_library import EnzymeLibrary
+
+LIBRARY_PATH = Path(__file__).parent.parent / "data" / "enzyme_library_redox.json"
+
+
+@pytest.fixture
+def library():
+    return EnzymeLibrary(str(LIBRARY_PATH))
+
+
+class TestActionMask:
+    """Validity mask aligned to to_action_space()."""
+
+    def test_loads_wrapped_library(self, library):
+        assert len(library) == 8
+        assert library['NOX_Lb']['compartments'] == ['c']
+        assert isinstance(library['NOX_Ec']['km'], dict)
+
+    def test_mask_rows_follow_action_space(self, library):
+        enzyme_list, enzyme_to_idx = library.to_action_space()
+        mask = library.action_mask()
+
+        assert mask.shape == (len(enzyme_list), 3)
+        assert mask[enzyme_to_idx['NOX_Lb']].tolist() == [True, False, False]
+        assert mask[enzyme_to_idx['NOX_Ec']].tolist() == [True, True, False]
+        assert mask[enzyme_to_idx['MDH2']].tolist() == [False, True, False]
+
+    def test_missing_compartments_allow_everything(self, tmp_path):
+        path = tmp_path / "library.json"
+        path.write_text('{"E1": {"name": "e1", "kcat": 1.0}, "E2": {"name": "e2", "kcat": 2.0, "compartments": ["p"]}}')
+
+        mask = EnzymeLibrary(str(path)).action_mask(compartments=('c', 'p'))
+
+        assert mask.tolist() == [[True, True], [False, True]]
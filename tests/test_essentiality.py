@@ -0,0 +1,71 @@
+"""Tests for pruned, cached essentiality scanning."""
+
+import pytest
+
+pytest.importorskip("pandas")
+cobra = pytest.importorskip("cobra")
+
+from redox_balancer.analysis.essentiality import essential_reactions, scan_essentiality
+
+
+def toy_model():
+    """a -> (R1 | R2) -> b -> c -> biomass, plus a dead-end branch a -> d."""
+    model = cobra.Model("toy")
+    a, b, c, d = (cobra.Metabolite(f"{m}_c", compartment="c") for m in "abcd")
+    reactions = {
+        "EX_a": ({a: -1}, (-10.0, 1000.0)),
+        "R1": ({a: -1, b: 1}, (0.0, 1000.0)),
+        "R2": ({a: -1, b: 1}, (0.0, 1000.0)),
+        "R3": ({b: -1, c: 1}, (0.0, 1000.0)),
+        "DEAD": ({a: -1, d: 1}, (0.0, 1000.0)),
+        "EX_d": ({d: -1}, (0.0, 1000.0)),
+        "BIOMASS": ({c: -1}, (0.0, 10.0)),
+    }
+    for rxn_id, (metabolites, bounds) in reactions.items():
+        rxn = cobra.Reaction(rxn_id)
+        rxn.add_metabolites(metabolites)
+        rxn.bounds = bounds
+        model.add_reactions([rxn])
+    model.objective = "BIOMASS"
+    return model
+
+
+class TestScanEssentiality:
+    """Knockouts agree with cobra while skipping zero-flux reactions."""
+
+    def test_matches_single_reaction_deletion(self):
+        from cobra.flux_analysis import single_reaction_deletion
+
+        model = toy_model()
+        results = scan_essentiality(model, processes=1, cache_dir=None)
+
+        deletion = single_reaction_deletion(model, processes=1)
+        reference = set()
+        for ids, growth in zip(deletion["ids"], deletion["growth"]):
+            if not growth >= 1e-6:
+                reference.update(ids)
+        assert essential_reactions(results) == reference == {"EX_a", "R3", "BIOMASS"}
+        assert results.loc["DEAD", "source"] == "skipped"
+        assert results.loc["EX_d", "relative_growth"] == pytest.approx(1.0)
+        # Bounds are restored after each knockout
+        assert model.slim_optimize() == pytest.approx(10.0)
+
+    def test_cache_by_model(self, tmp_path):
+        model = toy_model()
+        first = scan_essentiality(model, processes=1, cache_dir=str(tmp_path))
+        second = scan_essentiality(model, processes=1, cache_dir=str(tmp_path))
+        assert "solved" in set(first["source"])
+        # R1 and R2 are tied, so either may be skipped; skipped knockouts are cached too
+        assert set(second["source"]) == {"cache"}
+        assert second["growth"].tolist() == pytest.approx(first["growth"].tolist())
+
+        model.reactions.R2.knock_out()
+        changed = scan_essentiality(model, processes=1, cache_dir=str(tmp_path))
+        assert "solved" in set(changed["source"])
+        assert "R1" in essential_reactions(changed)
+
+    def test_parallel(self):
+        model = toy_model()
+        serial = scan_essentiality(model, processes=1, cache_dir=None)
+        parallel = scan_essentiality(model, processes=2, cache_dir=None, batch_size=1)
+        assert parallel["growth"].tolist() == pytest.approx(serial["growth"].tolist())
@@ -0,0 +1,77 @@
+"""Tests for exported (TorchScript) policies."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+
+from redox_balancer.agents.export import (
+    DeterministicPolicy,
+    export_checkpoint,
+    load_exported_policy,
+    network_config_from_state_dict,
+)
+from redox_balancer.agents.networks import ActorCriticNetwork, SinkDesignerNetwork
+from redox_balancer.utils.checkpoint import write_checkpoint_files
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    torch.manual_seed(0)
+    networks = {
+        "tumor": ActorCriticNetwork(obs_dim=12, action_dim=5, hidden_dim=16, embedding_dim=8),
+        "sink_designer": SinkDesignerNetwork(obs_dim=12, n_enzymes=6, hidden_dim=16, lstm_layers=2),
+    }
+    path = tmp_path / "step_1"
+    write_checkpoint_files(path, {
+        f"{role}_agent.pt.gz": network.state_dict() for role, network in networks.items()
+    })
+    return path, networks
+
+
+class TestExport:
+    """Exported artifacts reproduce the eager greedy policy."""
+
+    def test_infers_network_config(self, checkpoint):
+        _, networks = checkpoint
+        config = network_config_from_state_dict("sink_designer", networks["sink_designer"].state_dict())
+
+        assert config == {
+            'obs_dim': 12,
+            'embedding_dim': 128,
+            'hidden_dim': 16,
+            'lstm_layers': 2,
+            'max_enzymes_per_construct': 4,
+            'n_enzymes': 6,
+            'n_compartments': 3,
+        }
+
+    def test_round_trip_matches_eager(self, checkpoint):
+        path, networks = checkpoint
+        exported = export_checkpoint(path)
+
+        obs = np.random.default_rng(0).normal(size=(3, 12)).astype(np.float32)
+        for role, network in networks.items():
+            policy = load_exported_policy(exported[role])
+            assert policy.role == role
+
+            state = None
+            eager_state = network.initial_state(3)
+            for _ in range(3):  # Recurrent state is carried explicitly
+                action, value, state = policy.step(obs, state)
+                with torch.no_grad():
+                    eager_action, eager_value, *eager_state = DeterministicPolicy(network)(
+                        torch.from_numpy(obs), *eager_state
+                    )
+                np.testing.assert_allclose(action, eager_action.numpy(), atol=1e-5)
+                np.testing.assert_allclose(value, eager_value.numpy(), atol=1e-5)
+
+    def test_sink_actions_decoded(self, checkpoint):
+        path, _ = checkpoint
+        policy = load_exported_policy(export_checkpoint(path)["sink_designer"])
+
+        action = policy.act(np.zeros(12, dtype=np.float32)).reshape(-1, 3)
+
+        assert action.shape == (4, 3)
+        assert np.all(action[:, 0] < 6)
+        assert np.all((action[:, 1] >= 1) & (action[:, 1] <= 8))
@@ -0,0 +1,69 @@
+"""Tests for the persistent FBA outcome cache."""
+
+import pytest
+
+pytest.importorskip("cobra")
+
+from redox_balancer.cache.fba_cache import FBAOutcomeCache
+
+
+OUTCOME = {'status': 'optimal', 'growth_rate': 0.5, 'relative_growth': 0.9,
+           'sink_flux': 0.01, 'nadh_oxidation': 0.01}
+
+
+class TestFBAOutcomeCache:
+    """Outcomes survive across cache instances of the same namespace."""
+
+    def test_round_trip(self, tmp_path):
+        cache = FBAOutcomeCache(str(tmp_path), namespace="model_a")
+        key = ("NOX_Ec_c_x2", ())
+        assert cache.get(key) is None
+        cache.put(key, OUTCOME)
+        cache.save_cache()
+
+        reloaded = FBAOutcomeCache(str(tmp_path), namespace="model_a")
+        assert reloaded.get(key) == OUTCOME
+        assert reloaded.stats()['hits'] == 1
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_namespaces_are_separate(self, tmp_path):
+        cache = FBAOutcomeCache(str(tmp_path), namespace="model_a")
+        cache.put(("NOX_Ec_c_x2", ()), OUTCOME)
+        cache.save_cache()
+
+        other = FBAOutcomeCache(str(tmp_path), namespace="model_b")
+        assert len(other) == 0
+
+    def test_fingerprint_tracks_bounds(self):
+        import cobra
+        from redox_balancer.cache.fba_cache import model_fingerprint
+
+        model = cobra.Model("toy")
+        met = cobra.Metabolite("a_c", compartment="c")
+        rxn = cobra.Reaction("EX_a")
+        rxn.add_metabolites({met: -1})
+        model.add_reactions([rxn])
+        model.objective = "EX_a"
+
+        before = model_fingerprint(model)
+        assert model_fingerprint(model) == before
+        rxn.lower_bound = -5
+        assert model_fingerprint(model) != before
+
+    def test_namespace_tracks_sink_kinetics(self, tmp_path):
+        import cobra
+        from redox_balancer.utils.constructs import ConstructEvaluator
+
+        model = cobra.Model("toy")
+        model.add_metabolites([cobra.Metabolite(f"{m}_c", compartment="c") for m in ("nadh", "nad", "h")])
+        model.add_boundary(model.metabolites.nad_c, type="demand")
+        model.objective = "DM_nad_c"
+
+        def namespace(kcat):
+            enzymes = {'NOX': {'reaction': "NADH + H+ -> NAD+", 'kcat': kcat, 'compartments': ['c']}}
+            evaluator = ConstructEvaluator(model, enzymes, compartments=("c",), cache_dir=str(tmp_path))
+            return evaluator.outcome_cache.namespace
+
+        # The SINKs are zero-bounded in the model, so only the library kinetics differ
+        assert namespace(100.0) == namespace(100.0)
+        assert namespace(100.0) != namespace(200.0)
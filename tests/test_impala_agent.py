@@ -0,0 +1,214 @@
+"""Tests for the IMPALA agent's structured sink designer actions."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+
+from redox_balancer.agents.impala_agent import IMPALAAgent, Trajectory, allreduce_gradients
+
+
+@pytest.fixture
+def sink_agent():
+    torch.manual_seed(0)
+    return IMPALAAgent(agent_role="sink_designer", obs_dim=16, device="cpu", n_enzymes=6, hidden_dim=32)
+
+
+class TestSinkActions:
+    """Sampling and log-prob evaluation must describe the same distribution."""
+
+    def test_action_layout(self, sink_agent):
+        action, info = sink_agent.act(np.random.randn(16).astype(np.float32))
+
+        slots = action.reshape(-1, 3)
+        assert action.dtype == np.float32
+        assert slots.shape == (4, 3)
+        assert np.all((slots[:, 0] >= 0) & (slots[:, 0] < 6))
+        assert np.all((slots[:, 1] >= 1) & (slots[:, 1] <= 8))
+        assert np.all((slots[:, 2] >= 0) & (slots[:, 2] < 3))
+        assert np.isfinite(info['log_prob'])
+
+    def test_sampled_log_prob_matches_evaluation(self, sink_agent):
+        obs = torch.randn(1, 16)
+        with torch.no_grad():
+            output = sink_agent.network(obs)
+            action, log_prob = sink_agent._sample_sink_action(output, deterministic=False)
+
+            step_output = {
+                key: value.unsqueeze(1)
+                for key, value in output.items()
+                if key in ('enzyme_logits', 'compartment_logits')
+            }
+            evaluated = sink_agent._compute_sink_logprobs(
+                step_output, torch.from_numpy(action).view(1, 1, -1)
+            )
+
+        assert evaluated.shape == (1, 1)
+        assert evaluated.item() == pytest.approx(log_prob, abs=1e-5)
+
+    def test_deterministic_takes_argmax(self, sink_agent):
+        with torch.no_grad():
+            output = sink_agent.network(torch.randn(1, 16))
+            action, log_prob = sink_agent._sample_sink_action(output, deterministic=True)
+
+        slots = action.reshape(-1, 3)
+        assert log_prob == 0.0
+        np.testing.assert_array_equal(slots[:, 0], output['enzyme_logits'][0].argmax(-1).numpy())
+        np.testing.assert_array_equal(slots[:, 2], output['compartment_logits'][0].argmax(-1).numpy())
+
+    def test_entropy_ignores_masked_compartments(self, sink_agent):
+        # Enzyme 0 can only go to compartment 0, so its compartment pick has no entropy
+        sink_agent.network.action_mask[0] = torch.tensor([True, False, False])
+        with torch.no_grad():
+            output = sink_agent.network(torch.randn(1, 16))
+            step_output = {key: output[key].unsqueeze(1) for key in ('enzyme_logits', 'compartment_logits')}
+            actions = torch.zeros(1, 1, 12)  # Every slot picks enzyme 0
+            entropy = sink_agent._compute_sink_entropy(step_output, actions)
+            enzyme_entropy = torch.distributions.Categorical(logits=step_output['enzyme_logits']).entropy().mean()
+
+        assert entropy.item() == pytest.approx(enzyme_entropy.item(), abs=1e-5)
+
+
+class TestQuantizedAgent:
+    """Int8 inference-only policies for CPU actors."""
+
+    def test_tracks_fp32_policy(self):
+        torch.manual_seed(0)
+        learner = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", hidden_dim=32)
+        actor = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", hidden_dim=32,
+                            quantize=True)
+        actor.load_weights(learner.network.state_dict())
+
+        obs = np.random.randn(16).astype(np.float32)
+        _, learner_info = learner.act(obs)
+        action, actor_info = actor.act(obs)
+
+        assert action.shape == (5,)
+        assert actor_info['value'] == pytest.approx(learner_info['value'], abs=0.05)
+
+    def test_reloads_keep_only_int8_copy(self):
+        torch.manual_seed(0)
+        learner = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", hidden_dim=32)
+        actor = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", hidden_dim=32,
+                            quantize=True)
+        obs = np.random.randn(16).astype(np.float32)
+
+        for _ in range(2):
+            with torch.no_grad():
+                for param in learner.network.parameters():
+                    param.add_(0.1)
+            actor.load_weights(learner.network.state_dict())
+
+            learner.reset_hidden_state()
+            actor.reset_hidden_state()
+            _, learner_info = learner.act(obs)
+            _, actor_info = actor.act(obs)
+            assert actor_info['value'] == pytest.approx(learner_info['value'], abs=0.05)
+
+        # No fp32 Linear layers survive next to the int8 ones
+        assert not any(type(module) is torch.nn.Linear for module in actor.network.modules())
+        assert [name for name, value in vars(actor).items() if isinstance(value, torch.nn.Module)] == ["network"]
+
+    def test_sink_designer_keeps_structured_heads(self):
+        actor = IMPALAAgent(agent_role="sink_designer", obs_dim=16, device="cpu", n_enzymes=6,
+                            hidden_dim=32, quantize=True)
+
+        action, info = actor.act(np.random.randn(16).astype(np.float32))
+
+        assert action.shape == (12,)
+        assert np.isfinite(info['log_prob'])
+        assert actor.count_invalid_slots(action) == 0
+
+    def test_inference_only(self):
+        actor = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", quantize=True)
+        assert actor.optimizer is None
+        with pytest.raises(ValueError):
+            IMPALAAgent(agent_role="tumor", obs_dim=16, device="cuda", quantize=True)
+
+
+class TestInferenceOnlyAgent:
+    """Actor-side policies hold no optimizer state."""
+
+    def test_no_optimizer_and_frozen(self):
+        agent = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", inference_only=True)
+
+        assert agent.optimizer is None
+        assert not any(p.requires_grad for p in agent.network.parameters())
+        with pytest.raises(RuntimeError):
+            agent.update(None, None)
+
+    def test_loads_learner_weights(self, tmp_path):
+        learner = IMPALAAgent(agent_role="sink_designer", obs_dim=16, device="cpu", n_enzymes=6, hidden_dim=32)
+        learner.save(str(tmp_path / "agent.pt"))
+
+        actor = IMPALAAgent(agent_role="sink_designer", obs_dim=16, device="cpu", n_enzymes=6, hidden_dim=32,
+                            inference_only=True)
+        actor.load(str(tmp_path / "agent.pt"))
+
+        for name, value in learner.network.state_dict().items():
+            torch.testing.assert_close(actor.network.state_dict()[name], value)
+
+
+def _tumor_trajectory(seed: int, time_steps: int = 6) -> Trajectory:
+    generator = torch.Generator().manual_seed(seed)
+    return Trajectory(
+        observations=torch.randn(1, time_steps, 16, generator=generator),
+        actions=torch.rand(1, time_steps, 5, generator=generator) * 2 - 1,
+        rewards=torch.randn(1, time_steps, generator=generator),
+        values=torch.zeros(1, time_steps),
+        action_log_probs=torch.zeros(1, time_steps),
+        hidden_states=None,
+        dones=torch.zeros(1, time_steps),
+    )
+
+
+def _allreduce_worker(rank: int, world_size: int, init_method: str, results):
+    import torch.distributed as dist
+
+    dist.init_process_group("gloo", init_method=init_method, rank=rank, world_size=world_size)
+    param = torch.nn.Parameter(torch.zeros(3))
+    unused = torch.nn.Parameter(torch.zeros(2))
+    param.grad = torch.full((3,), float(rank + 1))
+    allreduce_gradients([param, unused])
+    results[rank] = (param.grad.tolist(), unused.grad.tolist())
+    dist.destroy_process_group()
+
+
+class TestDistributedUpdate:
+    """Gradient averaging for data-parallel learners."""
+
+    def test_allreduce_averages_across_ranks(self, tmp_path):
+        import torch.multiprocessing as mp
+
+        manager = mp.Manager()
+        results = manager.dict()
+        mp.spawn(
+            _allreduce_worker,
+            args=(2, f"file://{tmp_path / 'store'}", results),
+            nprocs=2,
+        )
+
+        for rank in range(2):
+            grad, unused_grad = results[rank]
+            assert grad == [1.5, 1.5, 1.5]
+            assert unused_grad == [0.0, 0.0]
+
+    def test_single_rank_matches_local_update(self, tmp_path):
+        import torch.distributed as dist
+
+        torch.manual_seed(0)
+        local = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu", hidden_dim=32)
+        distributed = IMPALAAgent(agent_role="tumor", obs_dim=16, action_dim=5, device="cpu",
+                                  hidden_dim=32, distributed=True)
+        distributed.network.load_state_dict(local.network.state_dict())
+        trajectory = _tumor_trajectory(seed=1)
+
+        dist.init_process_group("gloo", init_method=f"file://{tmp_path / 'store'}", rank=0, world_size=1)
+        try:
+            local.update(trajectory, trajectory.action_log_probs)
+            distributed.update(trajectory, trajectory.action_log_probs)
+        finally:
+            dist.destroy_process_group()
+
+        for a, b in zip(local.network.parameters(), distributed.network.parameters()):
+            torch.testing.assert_close(a, b)
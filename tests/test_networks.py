@@ -0,0 +1,127 @@
+"""Tests for agent network architectures."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from redox_balancer.agents.networks import ActorCriticNetwork, SinkDesignerNetwork
+
+
+def count_calls(module):
+    """Attach a forward hook counting calls to a module."""
+    calls = []
+    module.register_forward_hook(lambda *args: calls.append(1))
+    return calls
+
+
+class TestSinkDesignerNetwork:
+    """Structured-head network behaviour."""
+
+    def test_trunk_runs_once_per_forward(self):
+        net = SinkDesignerNetwork(obs_dim=20, n_enzymes=8, hidden_dim=32)
+        lstm_calls = count_calls(net.lstm)
+        embed_calls = count_calls(net.metabolite_embed)
+
+        out = net(torch.randn(5, 20))
+
+        assert len(lstm_calls) == 1
+        assert len(embed_calls) == 1
+        assert out['enzyme_logits'].shape == (5, 4, 8)
+        assert out['compartment_logits'].shape == (5, 4, 3)
+        assert out['copy_numbers'].shape == (5, 4)
+        assert out['value'].shape == (5,)
+
+    def test_heads_share_returned_state(self):
+        net = SinkDesignerNetwork(obs_dim=20, n_enzymes=8, hidden_dim=32)
+        obs = torch.randn(2, 20)
+        hidden = net.initial_state(2)
+
+        out = net(obs, hidden)
+        features, new_hidden = net.encode(obs, hidden)
+
+        torch.testing.assert_close(out['hidden_state'][0], new_hidden[0])
+        torch.testing.assert_close(
+            out['enzyme_logits'], net.enzyme_selector(features).view(2, 4, 8)
+        )
+
+    def test_base_network_unchanged_outputs(self):
+        net = ActorCriticNetwork(obs_dim=20, action_dim=5, hidden_dim=32)
+        out = net(torch.randn(3, 20))
+        assert set(out) == {'action_logits', 'value', 'hidden_state'}
+        assert out['action_logits'].shape == (3, 5)
+
+
+class TestSequenceUnroll:
+    """Learner-side unroll must reproduce the actor's step-by-step rollout."""
+
+    def test_matches_stepwise_rollout_with_resets(self):
+        torch.manual_seed(0)
+        net = ActorCriticNetwork(obs_dim=12, action_dim=3, hidden_dim=16, lstm_layers=2)
+        batch_size, seq_len = 2, 7
+        obs = torch.randn(batch_size, seq_len, 12)
+        dones = torch.zeros(batch_size, seq_len)
+        dones[0, 2] = 1.0
+        dones[1, 4] = 1.0
+        initial = tuple(torch.randn(2, batch_size, 16) for _ in range(2))
+
+        with torch.no_grad():
+            out = net.unroll(obs, initial, dones)
+
+            for b in range(batch_size):
+                hidden = (initial[0][:, b:b + 1], initial[1][:, b:b + 1])
+                for t in range(seq_len):
+                    step = net(obs[b:b + 1, t], hidden)
+                    torch.testing.assert_close(out['value'][b, t], step['value'][0])
+                    torch.testing.assert_close(out['action_logits'][b, t], step['action_logits'][0])
+                    hidden = step['hidden_state']
+                    if dones[b, t]:
+                        hidden = net.initial_state(1)
+
+        assert out['action_logits'].shape == (batch_size, seq_len, 3)
+
+    def test_single_lstm_call_without_resets(self):
+        net = SinkDesignerNetwork(obs_dim=20, n_enzymes=8, hidden_dim=32)
+        lstm_calls = count_calls(net.lstm)
+
+        out = net.unroll(torch.randn(3, 10, 20), dones=torch.zeros(3, 10))
+
+        assert len(lstm_calls) == 1
+        assert out['enzyme_logits'].shape == (3, 10, 4, 8)
+        assert out['value'].shape == (3, 10)
+
+
+class TestActionMask:
+    """Enzyme library validity mask applied in logit space."""
+
+    def make_network(self):
+        mask = torch.tensor([
+            [True, False, False],
+            [False, False, False],  # Enzyme with no valid compartment
+            [False, True, True],
+        ])
+        return SinkDesignerNetwork(obs_dim=10, n_enzymes=3, hidden_dim=16, action_mask=mask)
+
+    def test_enzyme_without_compartment_never_sampled(self):
+        net = self.make_network()
+        out = net(torch.randn(64, 10))
+
+        probs = torch.softmax(out['enzyme_logits'], dim=-1)
+        assert torch.all(probs[..., 1] == 0)
+
+    def test_compartments_masked_by_enzyme(self):
+        net = self.make_network()
+        logits = torch.zeros(2, 3)
+
+        masked = net.mask_compartment_logits(logits, torch.tensor([0, 2]))
+        probs = torch.softmax(masked, dim=-1)
+
+        torch.testing.assert_close(probs[0], torch.tensor([1.0, 0.0, 0.0]))
+        torch.testing.assert_close(probs[1], torch.tensor([0.0, 0.5, 0.5]))
+        assert net.count_invalid_slots(torch.tensor([0, 2, 1]), torch.tensor([1, 2, 0])) == 2
+
+    def test_mask_not_saved_in_state_dict(self):
+        assert 'action_mask' not in self.make_network().state_dict()
+
+    def test_rejects_mismatched_mask(self):
+        with pytest.raises(ValueError):
+            SinkDesignerNetwork(obs_dim=10, n_enzymes=4, hidden_dim=16, action_mask=torch.ones(3, 3))
@@ -0,0 +1,101 @@
+"""Tests for epsilon-constraint growth vs. redox frontiers."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+cobra = pytest.importorskip("cobra")
+
+from redox_balancer.analysis.pareto import (
+    construct_frontier,
+    gross_production,
+    growth_fractions,
+    sweep_frontiers,
+)
+from redox_balancer.utils.constructs import Construct, ConstructEvaluator
+from redox_balancer.utils.results_store import ChunkedResultsWriter, read_results
+
+
+@pytest.fixture
+def evaluator():
+    # One unit of NADH is shared between biomass and the sink
+    model = cobra.Model("toy")
+    mets = {m: cobra.Metabolite(f"{m}_c", compartment="c") for m in ("nadh", "nad", "h", "o2", "h2o")}
+    for m in mets:
+        exchange = cobra.Reaction(f"EX_{m}")
+        exchange.add_metabolites({mets[m]: -1})
+        exchange.bounds = {"nadh": (-1.0, 1000.0), "nad": (0.0, 1000.0)}.get(m, (-10.0, 1000.0))
+        model.add_reactions([exchange])
+    biomass = cobra.Reaction("BIOMASS")
+    biomass.add_metabolites({mets["nadh"]: -1, mets["nad"]: 1})
+    biomass.bounds = (0.0, 10.0)
+    model.add_reactions([biomass])
+    model.objective = "BIOMASS"
+
+    enzymes = {
+        'NOX': {'reaction': "NADH + H+ + 0.5 O2 -> NAD+ + H2O", 'kcat': 1000.0, 'compartments': ['c']},
+        'NOX_R': {'reaction': "NADH + H+ + 0.5 O2 <=> NAD+ + H2O", 'kcat': 1000.0, 'compartments': ['c']},
+    }
+    return ConstructEvaluator(model, enzymes, compartments=("c",))
+
+
+class TestConstructFrontier:
+    """Each growth floor trades off against NADH oxidation."""
+
+    def test_trade_off(self, evaluator):
+        secondary = {'o2_uptake': ({'EX_o2': (0.0, 1.0)}, "max")}
+        points = construct_frontier(
+            evaluator, Construct.from_key("NOX_c_x2"), growth_fractions(3), secondary=secondary
+        )
+
+        assert [p['growth_fraction'] for p in points] == [1.0, 0.5, 0.0]
+        assert [p['nadh_oxidation'] for p in points] == pytest.approx([0.0, 0.5, 1.0], abs=1e-6)
+        assert [p['relative_growth'] for p in points] == pytest.approx([1.0, 0.5, 0.0], abs=1e-6)
+        # EX_o2 is reversible: maximized objectives use net flux, not a secretion/uptake cycle
+        assert points[1]['o2_uptake'] == pytest.approx(0.25)
+
+        # The sweep's constraints and bounds are reverted
+        assert "pareto_growth_floor" not in evaluator.model.constraints
+        assert evaluator.model.slim_optimize() == pytest.approx(evaluator.baseline_growth)
+
+    def test_reversible_sink_flux(self, evaluator):
+        # A split-variable objective would score forward + reverse with zero net flux
+        points = construct_frontier(evaluator, Construct.from_key("NOX_R_c_x1"), [0.0], objective="sink_flux")
+        assert points[0]['sink_flux'] == pytest.approx(1.0)
+        assert "direction_SINK_NOX_R_c" not in evaluator.model.variables
+
+    def test_infeasible_floors_skipped(self, evaluator):
+        points = construct_frontier(evaluator, Construct.from_key("NOX_c_x1"), [2.0, 0.5])
+        assert [p['growth_fraction'] for p in points] == [0.5]
+
+    def test_gross_production(self, evaluator):
+        terms = gross_production(evaluator.model, ("nad",))
+        assert terms["EX_nad"] == (0.0, 1.0)
+        assert terms["BIOMASS"] == (1.0, 0.0)
+
+
+class TestSweepFrontiers:
+    """Frontiers are streamed to the results store and resumed."""
+
+    def test_store_and_resume(self, evaluator, tmp_path):
+        constructs = [Construct.from_key("NOX_c_x1"), Construct.from_key("NOX_c_x2")]
+        fractions = growth_fractions(5)
+
+        with ChunkedResultsWriter(tmp_path, chunk_size=1) as writer:
+            assert sweep_frontiers(evaluator, constructs[:1], fractions, writer) == 1
+        with ChunkedResultsWriter(tmp_path, chunk_size=1) as writer:
+            assert sweep_frontiers(evaluator, constructs, fractions, writer) == 1
+
+        summary = read_results(tmp_path)
+        assert summary['construct'].tolist() == ["NOX_c_x1", "NOX_c_x2"]
+        assert summary['max_nadh_oxidation'].tolist() == pytest.approx([1.0, 1.0])
+        assert len(read_results(tmp_path, table="steps")) == 10
+
+    def test_unexpressible_constructs_skipped(self, evaluator, tmp_path):
+        constructs = [Construct.from_key("NOX_m_x1"), Construct.from_key("NOX_c_x1")]
+        with pytest.raises(ValueError):
+            construct_frontier(evaluator, constructs[0], [0.5])
+
+        with ChunkedResultsWriter(tmp_path, chunk_size=1) as writer:
+            assert sweep_frontiers(evaluator, constructs, growth_fractions(3), writer) == 1
+        assert read_results(tmp_path)['construct'].tolist() == ["NOX_c_x1"]
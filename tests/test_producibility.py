@@ -0,0 +1,51 @@
+"""Tests for batch precursor producibility checks."""
+
+import pytest
+
+pytest.importorskip("pandas")
+cobra = pytest.importorskip("cobra")
+
+from redox_balancer.analysis.producibility import (
+    biomass_precursors,
+    check_producibility,
+    missing_precursors,
+)
+
+
+def toy_model():
+    """Biomass needs b (made from imported a) and z (no source)."""
+    model = cobra.Model("toy")
+    a, b, z = (cobra.Metabolite(f"{m}_c", compartment="c") for m in "abz")
+    exchange = cobra.Reaction("EX_a")
+    exchange.add_metabolites({a: -1})
+    exchange.bounds = (-10.0, 1000.0)
+    convert = cobra.Reaction("R1")
+    convert.add_metabolites({a: -1, b: 1})
+    biomass = cobra.Reaction("BIOMASS")
+    biomass.add_metabolites({b: -1, z: -1})
+    model.add_reactions([exchange, convert, biomass])
+    model.objective = "BIOMASS"
+    return model
+
+
+class TestProducibility:
+    """Demands are toggled on one solver and leave the model unchanged."""
+
+    def test_precursors(self):
+        model = toy_model()
+        assert set(biomass_precursors(model)) == {"b_c", "z_c"}
+
+        results = check_producibility(model)
+        assert results.loc["b_c", "max_production"] == pytest.approx(10.0)
+        assert results["producible"].to_dict() == {"b_c": True, "z_c": False}
+        assert missing_precursors(model) == ["z_c"]
+
+        assert len(model.reactions) == 3
+        assert str(model.objective.expression) == str(toy_model().objective.expression)
+
+    def test_parallel(self):
+        model = toy_model()
+        targets = ["a_c", "b_c", "z_c"]
+        serial = check_producibility(model, targets)
+        parallel = check_producibility(model, targets, processes=2, batch_size=1)
+        assert parallel["max_production"].tolist() == pytest.approx(serial["max_production"].tolist())
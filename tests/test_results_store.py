@@ -0,0 +1,76 @@
+"""Tests for the streaming chunked results store."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from redox_balancer.utils.results_store import (
+    ChunkedResultsWriter,
+    completed_episodes,
+    iter_result_chunks,
+    read_results,
+)
+
+
+def episode_row(i):
+    return {'episode': i, 'return': float(i) * 0.5, 'length': 3, 'construct': f"NOX_Ec_c_x{i % 3 + 1}"}
+
+
+def episode_steps(i):
+    return [{'step': t, 'reward': float(i + t), 'sink_flux': None if t == 0 else 0.01} for t in range(3)]
+
+
+class TestChunkedResultsWriter:
+    """Bounded buffering, crash-safe resumption and lazy reads."""
+
+    def test_chunks_written_at_chunk_size(self, tmp_path):
+        writer = ChunkedResultsWriter(tmp_path, chunk_size=4)
+        for i in range(10):
+            writer.add_episode(episode_row(i), episode_steps(i))
+        assert len(list(tmp_path.glob("chunk_*.npz"))) == 2
+        writer.close()
+        assert len(list(tmp_path.glob("chunk_*.npz"))) == 3
+
+        episodes = read_results(tmp_path)
+        assert episodes['episode'].tolist() == list(range(10))
+        assert episodes['construct'][4] == "NOX_Ec_c_x2"
+
+        steps = read_results(tmp_path, table="steps")
+        assert len(steps) == 30
+        assert np.isnan(steps['sink_flux'][0])
+
+    def test_resume_skips_completed_episodes(self, tmp_path):
+        writer = ChunkedResultsWriter(tmp_path, chunk_size=2)
+        for i in range(5):
+            writer.add_episode(episode_row(i))
+        # Simulated crash: episode 4 was still buffered
+        del writer
+        (tmp_path / "chunk_000009.npz.tmp").write_bytes(b"partial")
+
+        resumed = ChunkedResultsWriter(tmp_path, chunk_size=2)
+        assert resumed.completed == {0, 1, 2, 3}
+        assert not list(tmp_path.glob("*.tmp"))
+        for i in range(10):
+            if i not in resumed.completed:
+                resumed.add_episode(episode_row(i))
+        resumed.close()
+
+        assert read_results(tmp_path)['episode'].tolist() == list(range(10))
+        assert completed_episodes(tmp_path) == set(range(10))
+
+    def test_metadata_mismatch_refuses_resume(self, tmp_path):
+        with ChunkedResultsWriter(tmp_path, metadata={'seed': 1}) as writer:
+            writer.add_episode(episode_row(0))
+
+        with pytest.raises(ValueError):
+            ChunkedResultsWriter(tmp_path, metadata={'seed': 2})
+
+    def test_column_selection(self, tmp_path):
+        with ChunkedResultsWriter(tmp_path, chunk_size=3) as writer:
+            for i in range(6):
+                writer.add_episode(episode_row(i))
+
+        chunks = list(iter_result_chunks(tmp_path, columns=['return']))
+        assert len(chunks) == 2
+        assert all(set(chunk) == {'return'} for chunk in chunks)
@@ -0,0 +1,183 @@
+"""Tests for the dynamic batcher, serving metrics and the policy service."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")  # The serving package imports the policy exporter
+
+from redox_balancer.agents.export import export_policy
+from redox_balancer.agents.networks import ActorCriticNetwork
+from redox_balancer.serving import PolicyClient, PolicyService, create_server
+from redox_balancer.serving.batcher import DynamicBatcher
+from redox_balancer.serving.metrics import ServingMetrics
+
+
+@pytest.fixture
+def service(tmp_path):
+    torch.manual_seed(0)
+    network = ActorCriticNetwork(obs_dim=6, action_dim=3, hidden_dim=16, embedding_dim=8)
+    service = PolicyService(str(export_policy(network, "tumor", tmp_path / "tumor_policy")))
+    yield service
+    service.close()
+
+
+class TestDynamicBatcher:
+    """Concurrent requests are merged and split back per caller."""
+
+    def test_results_follow_request_order(self):
+        batcher = DynamicBatcher(lambda items: [x * 2 for x in items])
+        try:
+            assert batcher([1, 2, 3]) == [2, 4, 6]
+            assert batcher([]) == []
+        finally:
+            batcher.stop()
+
+    def test_concurrent_requests_share_batches(self):
+        batch_sizes = []
+
+        def process(items):
+            batch_sizes.append(len(items))
+            return [x + 1 for x in items]
+
+        batcher = DynamicBatcher(process, max_batch_size=64, max_wait_ms=50.0)
+        results = {}
+
+        def call(i):
+            results[i] = batcher([i])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            batcher.stop()
+
+        assert results == {i: [i + 1] for i in range(16)}
+        assert sum(batch_sizes) == 16
+        assert len(batch_sizes) < 16
+
+    def test_batch_size_is_capped(self):
+        batch_sizes = []
+        release = threading.Event()
+
+        def process(items):
+            release.wait()
+            batch_sizes.append(len(items))
+            return items
+
+        batcher = DynamicBatcher(process, max_batch_size=4, max_wait_ms=20.0)
+        try:
+            futures = [batcher.submit([i]) for i in range(10)]
+            release.set()
+            assert [f.result(timeout=5) for f in futures] == [[i] for i in range(10)]
+        finally:
+            batcher.stop()
+
+        assert max(batch_sizes) <= 4
+
+    def test_errors_reach_every_caller(self):
+        def process(items):
+            raise RuntimeError("solver failed")
+
+        metrics = ServingMetrics()
+        batcher = DynamicBatcher(process, metrics=metrics)
+        try:
+            with pytest.raises(RuntimeError, match="solver failed"):
+                batcher([1])
+            # The worker survives a failed batch
+            batcher.process_batch = lambda items: items
+            assert batcher([5]) == [5]
+        finally:
+            batcher.stop()
+
+    def test_stopped_batcher_rejects_requests(self):
+        batcher = DynamicBatcher(lambda items: items)
+        batcher.stop()
+        with pytest.raises(RuntimeError):
+            batcher([1])
+
+
+class TestServingMetrics:
+    """Latency percentiles and batch statistics."""
+
+    def test_empty_snapshot(self):
+        snapshot = ServingMetrics().snapshot()
+        assert snapshot['requests'] == 0
+        assert snapshot['batches'] == 0
+
+    def test_snapshot_aggregates(self):
+        metrics = ServingMetrics()
+        for ms in range(1, 101):
+            metrics.record_request(1, ms / 1000)
+        metrics.record_request(2, 0.5, error=True)
+        metrics.record_batch(8, 0.002)
+        metrics.record_batch(4, 0.004)
+
+        snapshot = metrics.snapshot()
+        assert snapshot['requests'] == 101
+        assert snapshot['items'] == 102
+        assert snapshot['errors'] == 1
+        assert snapshot['latency_p50_ms'] == pytest.approx(50.5, abs=1.0)
+        assert snapshot['mean_batch_size'] == pytest.approx(6.0)
+        assert snapshot['mean_batch_ms'] == pytest.approx(3.0)
+
+    def test_window_bounds_samples(self):
+        metrics = ServingMetrics(window=10)
+        for _ in range(100):
+            metrics.record_request(1, 1.0)
+        for _ in range(5):
+            metrics.record_request(1, 0.0)
+
+        snapshot = metrics.snapshot()
+        assert snapshot['requests'] == 105
+        assert snapshot['latency_p50_ms'] == pytest.approx(500.0)
+
+
+class TestPolicyService:
+    """Requests are validated before they are batched with others."""
+
+    def test_predict(self, service):
+        results = service.predict([
+            {'observation': [0.0] * 6},
+            {'observation': [1.0] * 6, 'medium': {'EX_glc__D_e': "-10"}},
+        ])
+
+        assert len(results) == 2
+        assert all(len(result['action']) == 3 for result in results)
+        assert service.metrics.snapshot()['items'] == 2
+
+    @pytest.mark.parametrize("request_", [
+        {'observation': [0.0] * 5},
+        {'observation': [0.0] * 6, 'medium': [-10.0]},
+        {'observation': [0.0] * 6, 'medium': {'EX_glc__D_e': "abc"}},
+        {'observation': [0.0] * 6, 'medium': {'EX_glc__D_e': [-10.0]}},
+        {'observation': [0.0] * 6, 'medium': {'EX_glc__D_e': float("nan")}},
+    ])
+    def test_malformed_requests_rejected(self, service, request_):
+        with pytest.raises(ValueError):
+            service.predict([{'observation': [0.0] * 6}, request_])
+        # Nothing reached the batcher
+        assert service.metrics.snapshot()['batches'] == 0
+
+    def test_http_round_trip(self, service):
+        server = create_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        client = PolicyClient(f"http://127.0.0.1:{server.server_address[1]}")
+        try:
+            assert client.health()['role'] == "tumor"
+            results = client.predict([{'observation': [0.5] * 6, 'medium': {'EX_o2_e': -20}}])
+            assert len(results[0]['action']) == 3
+
+            with pytest.raises(RuntimeError, match="400"):
+                client.predict([{'observation': [0.5] * 6, 'medium': {'EX_o2_e': "abc"}}])
+            # The server keeps serving after a bad request
+            assert client.metrics()['requests'] == 1
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,122 @@
+"""Tests for top-k construct extraction and re-verification."""
+
+import pytest
+
+pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+cobra = pytest.importorskip("cobra")
+
+from redox_balancer.analysis.top_constructs import (
+    harvest_constructs,
+    rank_candidates,
+    redox_reactions,
+    score_constructs,
+    verify_candidates,
+    write_report,
+)
+from redox_balancer.utils.constructs import ConstructEvaluator
+from redox_balancer.utils.results_store import ChunkedResultsWriter
+
+
+ENZYMES = {
+    'NOX': {'reaction': "NADH + H+ + 0.5 O2 -> NAD+ + H2O", 'kcat': 1000.0, 'compartments': ['c']},
+}
+
+
+def toy_model():
+    """NADH supply feeding a capped biomass reaction, with free H+, O2 and H2O exchange."""
+    model = cobra.Model("toy")
+    mets = {m: cobra.Metabolite(f"{m}_c", compartment="c") for m in ("nadh", "nad", "h", "o2", "h2o")}
+    for m, met in mets.items():
+        exchange = cobra.Reaction(f"EX_{m}")
+        exchange.add_metabolites({met: -1})
+        exchange.bounds = (-10.0 if m != "nad" else 0.0, 1000.0)
+        model.add_reactions([exchange])
+    biomass = cobra.Reaction("BIOMASS")
+    biomass.add_metabolites({mets["nadh"]: -1, mets["nad"]: 1})
+    biomass.bounds = (0.0, 1.0)
+    model.add_reactions([biomass])
+    model.objective = "BIOMASS"
+    return model
+
+
+class TestHarvest:
+    """Constructs are collected from CSVs, episode rows and step traces."""
+
+    def test_sources_merge(self, tmp_path):
+        pd.DataFrame({
+            'episode': [0, 1, 2],
+            'return': [1.0, 3.0, 2.0],
+            'construct': ["NOX_c_x1", "NOX_c_x2", "NOX_c_x1"],
+        }).to_csv(tmp_path / "evaluation.csv", index=False)
+
+        with ChunkedResultsWriter(tmp_path / "run" / "evaluation", chunk_size=2) as writer:
+            for i in range(3):
+                writer.add_episode(
+                    {'episode': i, 'return': 5.0, 'construct': "NOX_c_x3"},
+                    [{'step': 0, 'reward': 1.0, 'construct': "NOX_c_x4"}],
+                )
+
+        candidates = harvest_constructs([tmp_path / "evaluation.csv", tmp_path / "run"])
+
+        assert set(candidates) == {"NOX_c_x1", "NOX_c_x2", "NOX_c_x3", "NOX_c_x4"}
+        assert candidates["NOX_c_x1"].visits == 2
+        assert candidates["NOX_c_x1"].mean_return == pytest.approx(1.5)
+        assert candidates["NOX_c_x3"].best_return == 5.0
+        assert candidates["NOX_c_x4"].final_visits == 0
+
+    def test_scored_evaluation_csv(self, tmp_path):
+        # Outcomes written by eval_agents.py are harvested as exact, so ranking solves nothing
+        scored = score_constructs(pd.DataFrame({
+            'episode': [0, 1, 2],
+            'return': [1.0, 2.0, 0.5],
+            'construct': ["NOX_c_x1", "NOX_c_x3", None],
+        }), ConstructEvaluator(toy_model(), ENZYMES))
+        scored.to_csv(tmp_path / "evaluation.csv", index=False)
+
+        candidates = harvest_constructs([tmp_path])
+        assert set(candidates) == {"NOX_c_x1", "NOX_c_x3"}
+        assert candidates["NOX_c_x3"].outcome['status'] == 'optimal'
+
+        evaluator = ConstructEvaluator(toy_model(), ENZYMES)
+        ranked = rank_candidates(candidates, evaluator)
+        assert evaluator.solves == 0
+        assert [c.predicted_from for c in ranked] == ["cache", "cache"]
+        assert ranked[0].predicted == pytest.approx(scored.loc[1, 'fba_nadh_oxidation'])
+
+
+class TestRankAndVerify:
+    """Ranking needs no LP solves; verification solves only the top k."""
+
+    def test_pipeline(self, tmp_path):
+        evaluator = ConstructEvaluator(toy_model(), ENZYMES)
+        pd.DataFrame({
+            'return': [1.0, 1.0, 1.0],
+            'construct': ["NOX_c_x1", "NOX_c_x3", "MISSING_c_x1"],
+        }).to_csv(tmp_path / "evaluation.csv", index=False)
+        candidates = harvest_constructs([tmp_path / "evaluation.csv"])
+
+        ranked = rank_candidates(candidates, evaluator)
+        assert evaluator.solves == 0
+        assert [c.construct.key for c in ranked] == ["NOX_c_x3", "NOX_c_x1", "MISSING_c_x1"]
+        assert ranked[0].predicted == pytest.approx(3.0)
+        assert ranked[-1].predicted_from == "invalid"
+
+        reaction_ids = redox_reactions(evaluator.model)
+        assert "BIOMASS" in reaction_ids
+        assert not any(r.startswith("SINK_") for r in reaction_ids)
+
+        verified = verify_candidates(ranked[:1], evaluator, reaction_ids, processes=1)
+        assert evaluator.solves == 1
+        row = verified.iloc[0]
+        assert row['status'] == 'optimal'
+        assert row['relative_growth'] == pytest.approx(1.0)
+        assert row['fva_nadh_oxidation_min'] == pytest.approx(0.0, abs=1e-6)
+        assert row['fva_nadh_oxidation_max'] == pytest.approx(3.0)
+
+        paths = write_report(verified, tmp_path / "report", {
+            'sources': ["evaluation.csv"], 'harvested': 3, 'verified': 1, 'redox_reactions': len(reaction_ids),
+            'baseline_growth': evaluator.baseline_growth, 'min_relative_growth': 0.0,
+        })
+        assert "NOX_c_x3" in paths['markdown'].read_text()
+        assert len(pd.read_csv(paths['csv'])) == 1
@@ -0,0 +1,103 @@
+"""Tests for packed trajectory transport."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+
+from redox_balancer.agents.trajectory_buffer import TrajectoryBuffer, unpack_trajectory
+
+
+def fill_buffer(buffer, steps, rng):
+    """Write random steps into a buffer and return what was written."""
+    written = []
+    for t in range(steps):
+        step = {
+            "obs": rng.normal(size=buffer.obs_dim).astype(np.float32),
+            "action": rng.normal(size=buffer.action_dim).astype(np.float32),
+            "reward": float(rng.normal()),
+            "value": float(rng.normal()),
+            "log_prob": float(rng.normal()),
+            "done": t == steps - 1,
+            "info": {"growth_rate": 0.5 + t, "sink_flux": [1, 2], "ignored": "x"},
+        }
+        buffer.add(step["obs"], step["action"], step["reward"], step["value"],
+                   step["log_prob"], step["done"], step["info"])
+        written.append(step)
+    return written
+
+
+class TestTrajectoryBuffer:
+    """Round-trip behaviour of the packed trajectory format."""
+
+    def test_round_trip(self):
+        rng = np.random.default_rng(0)
+        buffer = TrajectoryBuffer(capacity=8, obs_dim=5, action_dim=3,
+                                  info_keys=("growth_rate", "sink_flux"))
+        written = fill_buffer(buffer, 6, rng)
+
+        packed = buffer.pack()
+        assert packed.dtype == np.uint8
+
+        packed.setflags(write=False)  # Object store views are read-only
+        traj = unpack_trajectory(packed, ("growth_rate", "sink_flux"))
+
+        assert traj.observations.shape == (1, 6, 5)
+        assert traj.actions.shape == (1, 6, 3)
+        np.testing.assert_allclose(traj.observations[0].numpy(),
+                                   np.stack([s["obs"] for s in written]))
+        np.testing.assert_allclose(traj.rewards[0].numpy(),
+                                   [s["reward"] for s in written], rtol=1e-6)
+        assert traj.dones[0, -1] == 1.0 and traj.dones[0, :-1].sum() == 0
+        np.testing.assert_allclose(traj.infos["growth_rate"][0].numpy(),
+                                   0.5 + np.arange(6))
+        # Non-scalar entries are reduced to NaN rather than shipped
+        assert torch.isnan(traj.infos["sink_flux"]).all()
+
+    def test_float16_observations_and_reuse(self):
+        rng = np.random.default_rng(1)
+        buffer = TrajectoryBuffer(capacity=4, obs_dim=10, action_dim=2, obs_dtype="float16")
+        fill_buffer(buffer, 4, rng)
+        full = buffer.pack()
+
+        buffer.reset()
+        written = fill_buffer(buffer, 2, rng)
+        short = buffer.pack()
+
+        assert short.nbytes < full.nbytes
+        traj = unpack_trajectory(short)
+        assert traj.observations.dtype == torch.float32
+        assert traj.infos == {}
+        assert traj.hidden_states is None
+        np.testing.assert_allclose(traj.observations[0].numpy(),
+                                   np.stack([s["obs"] for s in written]), atol=1e-2)
+
+    def test_segment_state(self):
+        buffer = TrajectoryBuffer(capacity=3, obs_dim=4, action_dim=2,
+                                  lstm_layers=2, hidden_dim=6)
+        h = torch.randn(2, 1, 6)
+        c = torch.randn(2, 1, 6)
+        buffer.reset(initial_hidden=(h, c))
+        fill_buffer(buffer, 3, np.random.default_rng(3))
+        buffer.set_bootstrap_value(1.25)
+
+        traj = unpack_trajectory(buffer.pack())
+        assert traj.bootstrap_value.shape == (1,)
+        assert traj.bootstrap_value.item() == pytest.approx(1.25)
+        torch.testing.assert_close(traj.hidden_states[0], h)
+        torch.testing.assert_close(traj.hidden_states[1], c)
+
+        # A fresh segment without recurrent state starts from zeros
+        buffer.reset()
+        fill_buffer(buffer, 1, np.random.default_rng(4))
+        traj = unpack_trajectory(buffer.pack())
+        assert traj.bootstrap_value.item() == 0.0
+        assert not traj.hidden_states[0].any()
+
+    def test_overflow_and_bad_buffer(self):
+        buffer = TrajectoryBuffer(capacity=1, obs_dim=2, action_dim=1)
+        fill_buffer(buffer, 1, np.random.default_rng(2))
+        with pytest.raises(IndexError):
+            buffer.add(np.zeros(2), np.zeros(1), 0.0, 0.0, 0.0, False)
+        with pytest.raises(ValueError):
+            unpack_trajectory(np.zeros(256, dtype=np.uint8))
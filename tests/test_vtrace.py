@@ -0,0 +1,59 @@
+"""Tests for the vectorized V-trace scan."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from redox_balancer.agents.impala_agent import vtrace_scan
+
+
+def reference_scan(deltas, discounts, cs):
+    """The original per-timestep reverse loop."""
+    vs_minus_v = torch.zeros_like(deltas)
+    acc = torch.zeros_like(deltas[:, 0])
+    for t in reversed(range(deltas.shape[1])):
+        acc = deltas[:, t] + discounts[:, t] * cs[:, t] * acc
+        vs_minus_v[:, t] = acc
+    return vs_minus_v
+
+
+def random_inputs(batch_size, time_steps, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    deltas = torch.randn(batch_size, time_steps, generator=generator, dtype=torch.float64)
+    dones = (torch.rand(batch_size, time_steps, generator=generator) < 0.05).double()
+    discounts = 0.99 * (1 - dones)
+    cs = torch.rand(batch_size, time_steps, generator=generator, dtype=torch.float64).clamp(max=1.0)
+    return deltas, discounts, cs
+
+
+class TestVtraceScan:
+    """vtrace_scan must match the reference loop."""
+
+    @pytest.mark.parametrize("batch_size,time_steps", [(1, 1), (1, 80), (16, 80), (64, 79)])
+    def test_matches_reference_loop(self, batch_size, time_steps):
+        deltas, discounts, cs = random_inputs(batch_size, time_steps)
+        torch.testing.assert_close(
+            vtrace_scan(deltas, discounts, cs),
+            reference_scan(deltas, discounts, cs),
+        )
+
+    def test_episode_end_cuts_the_trace(self):
+        deltas = torch.ones(1, 6, dtype=torch.float64)
+        discounts = torch.full((1, 6), 0.9, dtype=torch.float64)
+        discounts[0, 2] = 0.0
+        cs = torch.ones(1, 6, dtype=torch.float64)
+
+        result = vtrace_scan(deltas, discounts, cs)
+
+        # Steps up to the episode end only see rewards up to step 2
+        assert result[0, 2].item() == pytest.approx(1.0)
+        assert result[0, 0].item() == pytest.approx(1 + 0.9 + 0.81)
+
+    def test_float32_close_to_reference(self):
+        deltas, discounts, cs = (x.float() for x in random_inputs(32, 80, seed=1))
+        torch.testing.assert_close(
+            vtrace_scan(deltas, discounts, cs),
+            reference_scan(deltas, discounts, cs),
+            rtol=1e-4,
+            atol=1e-4,
+        )